@@ -0,0 +1,133 @@
+# benchmarks/bench_bridge_latency.py
+#
+# IPCBridge latency and idle cost.
+#
+#   idle      event-thread wakeups while nothing is sent (polling would
+#             wake 10x per second)
+#   paced     send-to-handled latency for messages sent every 2 ms
+#   isolated  latency of a fast topic while another topic's handler is slow,
+#             inline (workers=1) vs per-topic lanes (workers=4)
+#   ui        send-to-screen latency through the Tk main loop (needs a
+#             display; skipped otherwise)
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_bridge_latency
+
+import os
+import threading
+import time
+
+from ui.ipc_bridge import IPCBridge
+
+PACED = 500
+
+
+def idle_wakeups(seconds: float = 1.0) -> int:
+    bridge = IPCBridge()
+    time.sleep(seconds)
+    wakeups = bridge.latency_stats()["wakeups"]
+    bridge.close()
+    return wakeups
+
+
+def paced_latency() -> dict:
+    bridge = IPCBridge()
+    done = threading.Event()
+    seen = 0
+
+    def on_chunk(_):
+        nonlocal seen
+        seen += 1
+        if seen == PACED:
+            done.set()
+
+    bridge.subscribe("runtime.stdout", on_chunk)
+    for i in range(PACED):
+        bridge.send("runtime.stdout", {"line": i})
+        time.sleep(0.002)
+    done.wait(5)
+
+    stats = bridge.latency_stats()["handler"]
+    bridge.close()
+    return stats
+
+
+def isolated_latency(workers: int) -> float:
+    bridge = IPCBridge(workers=workers)
+    fast_latency = []
+
+    def slow(_):
+        time.sleep(0.02)
+
+    def fast(payload):
+        fast_latency.append(time.perf_counter() - payload["sent"])
+
+    bridge.subscribe("ml_response", slow)
+    bridge.subscribe("process.started", fast)
+
+    for _ in range(50):
+        bridge.send("ml_response", {})
+        bridge.send("process.started", {"sent": time.perf_counter()})
+        time.sleep(0.001)
+
+    deadline = time.time() + 5
+    while len(fast_latency) < 50 and time.time() < deadline:
+        time.sleep(0.01)
+    bridge.close()
+    return sum(fast_latency) / max(1, len(fast_latency))
+
+
+def ui_latency() -> dict | None:
+    if not os.environ.get("DISPLAY"):
+        return None
+    import tkinter as tk
+
+    root = tk.Tk()
+    root.withdraw()
+    bridge = IPCBridge()
+    bridge.attach_tk(root)
+    label = tk.Label(root)
+    seen = 0
+
+    def render(payload):
+        nonlocal seen
+        label.configure(text=payload["line"])
+        seen += 1
+        if seen == PACED:
+            root.quit()
+
+    bridge.subscribe("runtime.stdout", render, ui=True)
+
+    def producer():
+        for i in range(PACED):
+            bridge.send("runtime.stdout", {"line": str(i)})
+            time.sleep(0.002)
+
+    threading.Thread(target=producer, daemon=True).start()
+    root.mainloop()
+    root.destroy()
+
+    stats = bridge.latency_stats()["ui"]
+    bridge.close()
+    return stats
+
+
+def main() -> None:
+    print(f"idle wakeups in 1 s      : {idle_wakeups()}")
+
+    paced = paced_latency()
+    print(f"paced send->handled      : avg {paced['avg_ms']:.3f} ms, max {paced['max_ms']:.3f} ms")
+
+    inline = isolated_latency(workers=1)
+    lanes = isolated_latency(workers=4)
+    print(f"fast topic behind slow   : inline {inline * 1e3:.2f} ms, lanes {lanes * 1e3:.2f} ms")
+
+    ui = ui_latency()
+    if ui is None:
+        print("ui send->screen          : skipped (no display)")
+    else:
+        print(f"ui send->screen          : avg {ui['avg_ms']:.3f} ms, max {ui['max_ms']:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/bench_host_scheduling.py
+#
+# Foreground latency while a heavy build runs. A foreground process wakes
+# every 10 ms and does 1 ms of work (an interactive service); its wakeup
+# lateness is measured alone, next to CPU-bound "build" processes with no
+# policy, and with config/scheduler.yaml applied through
+# SchedulerPolicyEngine + HostScheduler (foreground as role "ui", builds
+# as "build_service").
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_host_scheduling
+
+import json
+import os
+import subprocess
+import sys
+
+from loguru import logger
+
+from orchestrator.host_scheduler import HostScheduler
+from orchestrator.policy_config import parse_scheduler, read_yaml
+from orchestrator.scheduler import SchedulerPolicyEngine
+
+WAKEUPS = 500
+BUILDERS = 4 * (os.cpu_count() or 1)
+
+FOREGROUND = f"""
+import json, time
+late = []
+for _ in range({WAKEUPS}):
+    due = time.perf_counter() + 0.010
+    time.sleep(0.010)
+    late.append(time.perf_counter() - due)
+    end = time.perf_counter() + 0.001
+    while time.perf_counter() < end:
+        pass
+late.sort()
+print(json.dumps([late[len(late) // 2], late[int(len(late) * 0.99)], late[-1]]))
+"""
+
+BUILD = "while True: pass"
+
+
+def _run(builders: int, scheduler=None) -> list:
+    build = [subprocess.Popen([sys.executable, "-c", BUILD]) for _ in range(builders)]
+    fg = subprocess.Popen([sys.executable, "-c", FOREGROUND], stdout=subprocess.PIPE)
+    try:
+        if scheduler is not None:
+            scheduler.assign_role_policy(1, "ui", os_pid=fg.pid)
+            for pid, child in enumerate(build, 2):
+                scheduler.assign_role_policy(pid, "build_service", os_pid=child.pid)
+        out, _ = fg.communicate()
+    finally:
+        for child in build:
+            child.kill()
+            child.wait()
+    return json.loads(out)
+
+
+def main() -> None:
+    logger.remove()
+    scheduler = SchedulerPolicyEngine(host=HostScheduler())
+    scheduler.replace_role_policies(*parse_scheduler(read_yaml("config/scheduler.yaml")))
+
+    host = scheduler.host
+    print(
+        f"{WAKEUPS} wakeups, {BUILDERS} builders, {len(os.sched_getaffinity(0))} CPUs, "
+        f"cgroups {'on' if host.cgroups else 'off'}"
+    )
+    print(f"{'':<18}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for label, builders, engine in (
+        ("idle", 0, None),
+        ("build, no policy", BUILDERS, None),
+        ("build, policy", BUILDERS, scheduler),
+    ):
+        p50, p99, worst = _run(builders, engine)
+        print(f"{label:<18}{p50 * 1000:9.2f}{p99 * 1000:9.2f}{worst * 1000:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
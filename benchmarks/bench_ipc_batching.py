@@ -0,0 +1,80 @@
+# benchmarks/bench_ipc_batching.py
+#
+# IPC bus throughput: per-message publish/delivery vs publish_many()
+# with a batch subscriber, for a log-line style stream of small payloads.
+# The per-message run is repeated with bus metrics disabled to show what
+# the always-on instrumentation costs. Each figure is the best of ROUNDS
+# interleaved runs, so one noisy run does not decide the comparison.
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_ipc_batching
+
+import asyncio
+import time
+
+from loguru import logger
+
+from orchestrator.ipc_bus import IPCBus
+
+MESSAGES = 200_000
+CHUNK = 256
+ROUNDS = 3
+
+
+async def _run(batched: bool, metrics: bool = True) -> float:
+    bus = IPCBus(metrics=metrics)
+    done = asyncio.Event()
+    received = 0
+
+    async def on_line(payload):
+        nonlocal received
+        received += 1
+        if received == MESSAGES:
+            done.set()
+
+    async def on_lines(payloads):
+        nonlocal received
+        received += len(payloads)
+        if received == MESSAGES:
+            done.set()
+
+    if batched:
+        bus.subscribe("process.output", on_lines, batch_size=CHUNK, batch_wait=0.005)
+    else:
+        bus.subscribe("process.output", on_line)
+
+    runner = asyncio.create_task(bus.run())
+    await asyncio.sleep(0)
+
+    lines = [{"pid": 1, "line": f"line {i}"} for i in range(MESSAGES)]
+    started = time.perf_counter()
+
+    if batched:
+        for i in range(0, MESSAGES, CHUNK):
+            await bus.publish_many("process.output", lines[i:i + CHUNK])
+    else:
+        for line in lines:
+            await bus.publish("process.output", line)
+
+    await done.wait()
+    elapsed = time.perf_counter() - started
+
+    bus.stop()
+    await runner
+    return MESSAGES / elapsed
+
+
+def main() -> None:
+    logger.remove()
+    bare = single = batched = 0.0
+    for _ in range(ROUNDS):
+        bare = max(bare, asyncio.run(_run(batched=False, metrics=False)))
+        single = max(single, asyncio.run(_run(batched=False)))
+        batched = max(batched, asyncio.run(_run(batched=True)))
+    print(f"per-message, no metrics : {bare:>12,.0f} msg/s")
+    print(f"per-message             : {single:>12,.0f} msg/s  ({1 - single / bare:.0%} metrics cost)")
+    print(f"batched                 : {batched:>12,.0f} msg/s  ({batched / single:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+# benchmarks/bench_ipc_codec.py
+#
+# Envelope codec vs json for the two common IPC shapes:
+#   - output chunks / build artifacts (raw bytes)
+#   - small structured events (dicts)
+#
+# json cannot carry bytes, so the json baseline latin-1 decodes chunks into
+# strings, which is the cheapest lossless option.
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_ipc_codec
+
+import json
+import os
+import time
+
+from orchestrator.ipc_envelope import decode, encode, stamp
+
+ROUNDS = 20_000
+
+
+def _time(fn, rounds: int = ROUNDS) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        fn()
+    return (time.perf_counter() - started) / rounds
+
+
+def _json_frame(channel: str, seq: int, ts: float, body) -> bytes:
+    return json.dumps(
+        {"channel": channel, "seq": seq, "ts": ts, "payload": body},
+        separators=(",", ":"),
+    ).encode()
+
+
+def bench_bytes(size: int) -> tuple[float, float]:
+    chunk = os.urandom(size)
+    env = stamp("process.output", 1, chunk)
+    assert bytes(decode(encode(env)).body) == chunk
+
+    def json_roundtrip():
+        frame = _json_frame("process.output", 1, env.timestamp, chunk.decode("latin-1"))
+        return json.loads(frame)["payload"].encode("latin-1")
+
+    rounds = max(200, ROUNDS * 1024 // max(size, 1024))
+    ours = _time(lambda: decode(encode(env)).body, rounds)
+    theirs = _time(json_roundtrip, rounds)
+    return ours, theirs
+
+
+def bench_dict() -> tuple[float, float]:
+    event = {"pid": 12, "name": "system-ui", "state": "running", "exit_code": None}
+    env = stamp("process.started", 1, event)
+    ours = _time(lambda: decode(encode(env)).body)
+    theirs = _time(
+        lambda: json.loads(_json_frame("process.started", 1, env.timestamp, event))
+    )
+    return ours, theirs
+
+
+def main() -> None:
+    print(f"{'payload':>14} {'envelope us':>12} {'json us':>10} {'speedup':>8}")
+    for size in (64, 4 * 1024, 64 * 1024, 1024 * 1024):
+        ours, theirs = bench_bytes(size)
+        print(f"{size:>8} bytes {ours * 1e6:>12.2f} {theirs * 1e6:>10.2f} {theirs / ours:>7.1f}x")
+
+    ours, theirs = bench_dict()
+    print(f"{'small dict':>14} {ours * 1e6:>12.2f} {theirs * 1e6:>10.2f} {theirs / ours:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+# benchmarks/bench_log_pipeline.py
+#
+# Caller-side cost of one log call on each path, separate stacks vs the
+# unified pipeline (orchestrator.log_bridge -> Logger -> background sink).
+#
+#   stdlib    logging.FileHandler, formatted and written per call
+#   loguru    loguru file sink, formatted and written per call
+#   *unified  same call routed into Logger, written by the sink thread
+#   filtered  a DEBUG call below an INFO threshold, f-string vs "{}" args
+#
+# "total" includes draining the sink on close, so deferred work is not
+# hidden.
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_log_pipeline
+
+import logging
+import os
+import tempfile
+import time
+
+from loguru import logger
+
+from orchestrator.log_bridge import bridge_loguru, bridge_stdlib
+from orchestrator.log_sink import RotatingFileSink
+from orchestrator.logger import Logger
+
+CALLS = 50_000
+
+
+def _central(directory: str, level: str = "DEBUG") -> Logger:
+    sink = RotatingFileSink(
+        os.path.join(directory, "system.log"),
+        max_bytes=1 << 30,
+        queue_limit=CALLS * 2,
+    )
+    return Logger(sink=sink, level=level)
+
+
+def _time(fn) -> float:
+    started = time.perf_counter()
+    for i in range(CALLS):
+        fn(i)
+    return (time.perf_counter() - started) / CALLS
+
+
+def _reset_stdlib() -> logging.Logger:
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+    return logging.getLogger("ui.app")
+
+
+def bench_stdlib(directory: str) -> tuple[float, float]:
+    log = _reset_stdlib()
+    handler = logging.FileHandler(os.path.join(directory, "superos_ui.log"))
+    handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+    logging.getLogger().addHandler(handler)
+    logging.getLogger().setLevel(logging.INFO)
+
+    per_call = _time(lambda i: log.info("window %d resized", i))
+    handler.close()
+    return per_call, per_call
+
+
+def bench_stdlib_unified(directory: str) -> tuple[float, float]:
+    log = _reset_stdlib()
+    central = _central(directory)
+    bridge_stdlib(central, "INFO")
+
+    started = time.perf_counter()
+    per_call = _time(lambda i: log.info("window %d resized", i))
+    central.close()
+    return per_call, (time.perf_counter() - started) / CALLS
+
+
+def bench_loguru(directory: str) -> tuple[float, float]:
+    logger.remove()
+    logger.add(os.path.join(directory, "loguru.log"), level="INFO")
+
+    per_call = _time(lambda i: logger.info("IPC publish {}", i))
+    logger.remove()
+    return per_call, per_call
+
+
+def bench_loguru_unified(directory: str) -> tuple[float, float]:
+    central = _central(directory)
+    bridge_loguru(central, "INFO")
+
+    started = time.perf_counter()
+    per_call = _time(lambda i: logger.info("IPC publish {}", i))
+    central.close()
+    logger.remove()
+    return per_call, (time.perf_counter() - started) / CALLS
+
+
+def bench_logger(directory: str) -> tuple[float, float]:
+    central = _central(directory)
+
+    started = time.perf_counter()
+    per_call = _time(lambda i: central.info("orchestrator", "tick", {"i": i}))
+    central.close()
+    return per_call, (time.perf_counter() - started) / CALLS
+
+
+def bench_filtered(directory: str) -> tuple[float, float]:
+    central = _central(directory, level="INFO")
+    bridge_loguru(central, "INFO")
+    channel = "process.output"
+
+    eager = _time(lambda i: logger.debug(f"IPC drop (no subscribers): {channel} {i}"))
+    lazy = _time(lambda i: logger.debug("IPC drop (no subscribers): {} {}", channel, i))
+    central.close()
+    logger.remove()
+    return eager, lazy
+
+
+def main() -> None:
+    print(f"{'path':<16} {'per call us':>12} {'total us':>10}")
+    for name, bench in (
+        ("stdlib", bench_stdlib),
+        ("stdlib unified", bench_stdlib_unified),
+        ("loguru", bench_loguru),
+        ("loguru unified", bench_loguru_unified),
+        ("Logger", bench_logger),
+    ):
+        with tempfile.TemporaryDirectory() as directory:
+            per_call, total = bench(directory)
+        print(f"{name:<16} {per_call * 1e6:>12.2f} {total * 1e6:>10.2f}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        eager, lazy = bench_filtered(directory)
+    print(f"filtered debug   f-string {eager * 1e6:.2f} us, lazy args {lazy * 1e6:.2f} us")
+
+
+if __name__ == "__main__":
+    main()
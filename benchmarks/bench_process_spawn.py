@@ -0,0 +1,100 @@
+# benchmarks/bench_process_spawn.py
+#
+# Spawn-to-first-output latency through ProcessManager: a cold start
+# (new interpreter, then imports) vs a handoff to a WarmPool worker that
+# has already booted and preloaded the service's dependencies. The time
+# runs from the spawn() call until the service's first line arrives on
+# process.stdout. The pool is refilled between warm rounds, so this is
+# the steady state with a worker ready.
+#
+# This module is also the service being launched: started by
+# ProcessManager (SUPEROS_PID is set), main() prints one line and exits.
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_process_spawn
+
+import asyncio
+import os
+import statistics
+import time
+
+from loguru import logger
+
+from orchestrator.ipc_bus import IPCBus
+from orchestrator.process_manager import ProcessManager
+from orchestrator.process_pool import WarmPool
+
+ROUNDS = 20
+
+ENTRYPOINT = "benchmarks.bench_process_spawn"
+PRELOAD = (ENTRYPOINT, "yaml", "psutil")
+
+
+async def _measure(manager: ProcessManager, bus: IPCBus, pool=None) -> list:
+    first_output = {}
+
+    async def on_stdout(message):
+        waiter = first_output.get(message["pid"])
+        if waiter is not None and not waiter.done():
+            waiter.set_result(time.perf_counter())
+
+    bus.subscribe("process.stdout", on_stdout)
+
+    samples = []
+    for _ in range(ROUNDS):
+        if pool is not None:
+            await pool.fill()
+
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        # pids are sequential; register before the child can print
+        waiter = first_output[len(manager.list_processes()) + 1] = loop.create_future()
+        pid = await manager.spawn("bench", ENTRYPOINT, set(), {})
+        samples.append(await waiter - started)
+        await manager.wait(pid)
+
+    bus.unsubscribe("process.stdout", on_stdout)
+    return samples
+
+
+def _report(label: str, samples: list) -> float:
+    samples = sorted(samples)
+    p50 = statistics.median(samples) * 1000
+    p90 = samples[int(len(samples) * 0.9) - 1] * 1000
+    print(f"{label:<6} p50 {p50:7.1f} ms   p90 {p90:7.1f} ms   min {samples[0] * 1000:7.1f} ms")
+    return p50
+
+
+async def _bench() -> None:
+    bus = IPCBus(shards=2)
+    runner = asyncio.create_task(bus.run())
+
+    cold = await _measure(ProcessManager(bus), bus)
+
+    pool = WarmPool(size=1, preload=PRELOAD)
+    warm_manager = ProcessManager(bus, pool=pool)
+    warm = await _measure(warm_manager, bus, pool)
+    await warm_manager.shutdown()
+
+    print(f"spawn -> first output, {ROUNDS} rounds")
+    cold_p50 = _report("cold", cold)
+    warm_p50 = _report("warm", warm)
+    print(f"speedup {cold_p50 / warm_p50:.1f}x   pool {pool.stats()}")
+
+    bus.stop()
+    await runner
+
+
+def main() -> None:
+    if os.environ.get("SUPEROS_PID"):
+        # Launched as the service under test
+        import psutil  # noqa: F401
+        import yaml  # noqa: F401
+        print("up")
+        return
+    logger.remove()
+    asyncio.run(_bench())
+
+
+if __name__ == "__main__":
+    main()
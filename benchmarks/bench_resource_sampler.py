@@ -0,0 +1,81 @@
+# benchmarks/bench_resource_sampler.py
+#
+# Cost of one ResourceSampler tick with hundreds of supervised processes,
+# for the /proc reader and the psutil fallback, as CPU time per tick and
+# the share of one core that is at the default sampling interval.
+#
+# The processes are real host processes (sleep), registered as running
+# Process records; spawning hundreds of interpreters through
+# ProcessManager would only measure memory pressure.
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_resource_sampler
+
+import subprocess
+import time
+
+from loguru import logger
+
+from orchestrator.ipc_bus import IPCBus
+from orchestrator.process_manager import Process, ProcessState
+from orchestrator.process_stats import DEFAULT_INTERVAL, ResourceSampler, _PsutilReader
+
+PROCESSES = 300
+TICKS = 50
+
+
+class Supervised:
+    """
+    The part of ProcessManager the sampler reads.
+    """
+
+    def __init__(self, children):
+        self.processes = {}
+        for pid, child in enumerate(children, 1):
+            proc = Process(pid, f"svc-{pid}")
+            proc.os_pid = child.pid
+            proc.state = ProcessState.RUNNING
+            self.processes[pid] = proc
+
+    def running(self):
+        return list(self.processes.values())
+
+    def get(self, pid):
+        return self.processes.get(pid)
+
+
+def _measure(sampler: ResourceSampler) -> float:
+    sampler.sample()  # opens descriptors
+    started = time.process_time()
+    for _ in range(TICKS):
+        aggregate = sampler.sample()
+    assert aggregate["total"]["count"] == PROCESSES
+    return (time.process_time() - started) / TICKS
+
+
+def main() -> None:
+    logger.remove()
+    children = [subprocess.Popen(["sleep", "600"]) for _ in range(PROCESSES)]
+    try:
+        manager = Supervised(children)
+        ipc = IPCBus(shards=1)
+
+        proc_sampler = ResourceSampler(manager, ipc)
+        psutil_sampler = ResourceSampler(manager, ipc)
+        psutil_sampler._reader = _PsutilReader()
+
+        print(f"{PROCESSES} processes, {TICKS} ticks, interval {DEFAULT_INTERVAL:.0f}s")
+        for label, sampler in (("/proc", proc_sampler), ("psutil", psutil_sampler)):
+            per_tick = _measure(sampler)
+            print(
+                f"{label:<7} {per_tick * 1000:6.2f} ms/tick   "
+                f"{per_tick / DEFAULT_INTERVAL * 100:5.2f}% of one core"
+            )
+    finally:
+        for child in children:
+            child.kill()
+            child.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# benchmarks/bench_shm_transport.py
+#
+# Cross-process transport benchmark: shared-memory ring (IPCClient) vs a
+# plain multiprocessing pipe.
+#
+# Throughput: the parent streams N payloads to a child that reads them all.
+# Latency: small-message ping-pong round trips.
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_shm_transport
+
+import multiprocessing as mp
+import os
+import time
+
+from orchestrator.ipc_client import IPCClient
+
+SIZES = [64, 4 * 1024, 256 * 1024, 1024 * 1024]
+TOTAL_BYTES = 256 * 1024 * 1024
+MAX_MESSAGES = 200_000
+PINGS = 20_000
+
+TO_CHILD = 1
+TO_PARENT = 2
+
+# Services run as separate interpreters, not forks of the orchestrator.
+_mp = mp.get_context("spawn")
+
+
+# -------------------------
+# Child processes
+# -------------------------
+
+def _shm_sink(namespace: str, count: int) -> None:
+    client = IPCClient(namespace)
+    for _ in range(count):
+        client.recv(TO_CHILD, max_len=1 << 30, timeout=None)
+    client.send(TO_PARENT, b"done")
+    client.close()
+
+
+def _pipe_sink(conn, count: int) -> None:
+    for _ in range(count):
+        conn.recv_bytes()
+    conn.send_bytes(b"done")
+
+
+def _shm_echo(namespace: str, count: int) -> None:
+    client = IPCClient(namespace)
+    for _ in range(count):
+        client.send(TO_PARENT, client.recv(TO_CHILD, timeout=None))
+    client.close()
+
+
+def _pipe_echo(conn, count: int) -> None:
+    for _ in range(count):
+        conn.send_bytes(conn.recv_bytes())
+
+
+# -------------------------
+# Measurements
+# -------------------------
+
+def _open_pair(tag: str) -> tuple[str, IPCClient]:
+    namespace = f"bench{os.getpid()}{tag}"
+    client = IPCClient(namespace)
+    client.create_channel(TO_CHILD, capacity=8 * 1024 * 1024)
+    client.create_channel(TO_PARENT, capacity=64 * 1024)
+    return namespace, client
+
+
+def shm_throughput(size: int) -> float:
+    count = min(MAX_MESSAGES, max(1, TOTAL_BYTES // size))
+    payload = os.urandom(size)
+    namespace, client = _open_pair(f"t{size}")
+
+    child = _mp.Process(target=_shm_sink, args=(namespace, count))
+    child.start()
+    started = time.perf_counter()
+    for _ in range(count):
+        client.send(TO_CHILD, payload)
+    client.recv(TO_PARENT, timeout=None)
+    elapsed = time.perf_counter() - started
+
+    child.join()
+    client.close()
+    return count * size / elapsed
+
+
+def pipe_throughput(size: int) -> float:
+    count = min(MAX_MESSAGES, max(1, TOTAL_BYTES // size))
+    payload = os.urandom(size)
+    parent, child_end = _mp.Pipe()
+
+    child = _mp.Process(target=_pipe_sink, args=(child_end, count))
+    child.start()
+    started = time.perf_counter()
+    for _ in range(count):
+        parent.send_bytes(payload)
+    parent.recv_bytes()
+    elapsed = time.perf_counter() - started
+
+    child.join()
+    return count * size / elapsed
+
+
+def shm_latency() -> float:
+    namespace, client = _open_pair("lat")
+    child = _mp.Process(target=_shm_echo, args=(namespace, PINGS))
+    child.start()
+
+    started = time.perf_counter()
+    for _ in range(PINGS):
+        client.send(TO_CHILD, b"ping")
+        client.recv(TO_PARENT, timeout=None)
+    elapsed = time.perf_counter() - started
+
+    child.join()
+    client.close()
+    return elapsed / PINGS
+
+
+def pipe_latency() -> float:
+    parent, child_end = _mp.Pipe()
+    child = _mp.Process(target=_pipe_echo, args=(child_end, PINGS))
+    child.start()
+
+    started = time.perf_counter()
+    for _ in range(PINGS):
+        parent.send_bytes(b"ping")
+        parent.recv_bytes()
+    elapsed = time.perf_counter() - started
+
+    child.join()
+    return elapsed / PINGS
+
+
+def main() -> None:
+    print(f"{'payload':>10} {'shm MB/s':>10} {'pipe MB/s':>10}")
+    for size in SIZES:
+        shm = shm_throughput(size) / 1e6
+        pipe = pipe_throughput(size) / 1e6
+        print(f"{size:>10} {shm:>10.0f} {pipe:>10.0f}")
+
+    print()
+    print(f"round trip (4 B): shm {shm_latency() * 1e6:.1f} us, "
+          f"pipe {pipe_latency() * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# benchmarks/bench_topic_routing.py
+#
+# Topic routing benchmark.
+#
+# Compares TopicTrie lookups (warm cache and cold walk) against a linear
+# scan over every subscription pattern, for growing subscription counts.
+#
+# Run from the repository root:
+#   python -m benchmarks.bench_topic_routing
+
+import random
+import time
+
+from orchestrator.topic_trie import TopicTrie
+
+SERVICES = ["process", "runtime", "build", "ml", "sql", "web", "ui"]
+EVENTS = ["started", "exited", "stdout", "stderr", "request", "result"]
+LOOKUPS = 20_000
+# Distinct live channels; real buses have far fewer channels than messages.
+CHANNELS = 1_000
+
+
+def _segment_match(pattern: list[str], parts: list[str]) -> bool:
+    if not pattern:
+        return not parts
+    head = pattern[0]
+    if head == "#":
+        return any(
+            _segment_match(pattern[1:], parts[i:])
+            for i in range(len(parts) + 1)
+        )
+    if not parts:
+        return False
+    if head == "*" or head == parts[0]:
+        return _segment_match(pattern[1:], parts[1:])
+    return False
+
+
+def _make_subscriptions(count: int, rng: random.Random) -> list[str]:
+    patterns = []
+    for i in range(count):
+        service = rng.choice(SERVICES)
+        roll = rng.random()
+        if roll < 0.05:
+            patterns.append(f"{service}.*")
+        elif roll < 0.08:
+            patterns.append(f"{service}.#")
+        else:
+            patterns.append(f"{service}.p{i}.{rng.choice(EVENTS)}")
+    return patterns
+
+
+def _topics(rng: random.Random, count: int) -> list[str]:
+    channels = [
+        f"{rng.choice(SERVICES)}.p{rng.randrange(count)}.{rng.choice(EVENTS)}"
+        for _ in range(CHANNELS)
+    ]
+    return [rng.choice(channels) for _ in range(LOOKUPS)]
+
+
+def bench(count: int) -> dict:
+    rng = random.Random(count)
+    patterns = _make_subscriptions(count, rng)
+    topics = _topics(rng, count)
+
+    trie = TopicTrie()
+    for i, pattern in enumerate(patterns):
+        trie.add(pattern, i)
+
+    # Cold: every lookup walks the trie
+    started = time.perf_counter()
+    for topic in topics:
+        trie._cache.clear()
+        trie.match(topic)
+    cold = time.perf_counter() - started
+    fanout = sum(len(trie.match(t)) for t in topics) / len(topics)
+
+    # Warm: routes resolved once, then served from the cache
+    for topic in topics:
+        trie.match(topic)
+    started = time.perf_counter()
+    for topic in topics:
+        trie.match(topic)
+    warm = time.perf_counter() - started
+
+    # Baseline: test every pattern for every message
+    split = [p.split(".") for p in patterns]
+    sample = topics[: max(200, LOOKUPS // max(1, count // 50))]
+    started = time.perf_counter()
+    for topic in sample:
+        parts = topic.split(".")
+        [i for i, p in enumerate(split) if _segment_match(p, parts)]
+    linear = (time.perf_counter() - started) * len(topics) / len(sample)
+
+    return {
+        "subs": count,
+        "fanout": fanout,
+        "warm_us": warm / len(topics) * 1e6,
+        "cold_us": cold / len(topics) * 1e6,
+        "linear_us": linear / len(topics) * 1e6,
+    }
+
+
+def main() -> None:
+    print(
+        f"{'subs':>7} {'fanout':>7} {'warm us/msg':>12} "
+        f"{'cold us/msg':>12} {'linear us/msg':>14}"
+    )
+    for count in (10, 100, 1_000, 5_000, 20_000):
+        r = bench(count)
+        print(
+            f"{r['subs']:>7} {r['fanout']:>7.1f} {r['warm_us']:>12.3f} "
+            f"{r['cold_us']:>12.3f} {r['linear_us']:>14.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,357 @@
+# orchestrator/binlog.py
+
+"""
+Structured Binary Log
+
+A compact on-disk format for Logger records that can be searched by time
+range, source and level without reading the whole file.
+
+Data file (little-endian):
+    magic "SOSLOG1\\n"
+    record*:
+        u32  record length (including this header)
+        f64  timestamp (epoch seconds)
+        u64  sequence number
+        u16  source length
+        u16  level length
+        u32  message length
+        ...  source, level, message (UTF-8), meta (JSON, may be empty)
+Source and level longer than 65535 bytes are truncated to fit (at a
+character boundary).
+
+Index file (<data>.idx): a sparse, time-ordered run of (f64 timestamp,
+u64 offset) pairs, one per index_every bytes of data. A search bisects
+the index for its start time, then walks records from there through an
+mmap, comparing source and level bytes before decoding anything else.
+Missing or stale index files only cost a scan from the start.
+
+Write through BinaryLogSink (a drop-in Logger sink); search with
+
+    python -m orchestrator.binlog logs/system.binlog --since 1h --meta pid=12
+"""
+
+import argparse
+import bisect
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from orchestrator.log_sink import (
+    DEFAULT_BACKUPS,
+    RotatingFileSink,
+    shift_backups,
+)
+from orchestrator.logger import format_timestamp
+
+MAGIC = b"SOSLOG1\n"
+
+RECORD = struct.Struct("<IdQHHI")
+INDEX_ENTRY = struct.Struct("<dQ")
+
+INDEX_SUFFIX = ".idx"
+
+DEFAULT_MAX_BYTES = 1 << 30
+DEFAULT_INDEX_EVERY = 64 << 10
+
+# Largest source / level a u16 length can describe.
+_MAX_SHORT_FIELD = 0xFFFF
+
+
+class BinaryLogError(ValueError):
+    """Raised for files that are not binary logs."""
+    pass
+
+
+def encode_record(record: Any) -> bytes:
+    source = _short_field(record.source)
+    level = _short_field(record.level)
+    message = record.message.encode("utf-8", "replace")
+    meta = (
+        json.dumps(record.meta, separators=(",", ":"), default=str).encode("utf-8")
+        if record.meta else b""
+    )
+    length = RECORD.size + len(source) + len(level) + len(message) + len(meta)
+    return b"".join((
+        RECORD.pack(
+            length,
+            record.timestamp,
+            record.seq,
+            len(source),
+            len(level),
+            len(message),
+        ),
+        source,
+        level,
+        message,
+        meta,
+    ))
+
+
+# -------------------------
+# Writer
+# -------------------------
+
+class BinaryLogSink(RotatingFileSink):
+    FILE_HEADER = MAGIC
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backups: int = DEFAULT_BACKUPS,
+        flush_interval: float = 0.5,
+        queue_limit: int = 100_000,
+        index_every: int = DEFAULT_INDEX_EVERY,
+    ):
+        if index_every < 1:
+            raise ValueError("binary log index_every must be positive")
+        self.index_path = path + INDEX_SUFFIX
+        self.index_every = index_every
+        super().__init__(path, max_bytes, backups, flush_interval, queue_limit)
+
+    def encode(self, record: Any) -> bytes:
+        return encode_record(record)
+
+    def close(self) -> None:
+        super().close()
+        self._index.close()
+
+    def _open(self) -> None:
+        super()._open()
+        self._index = open(self.index_path, "ab")
+        # Index the first record written after (re)opening.
+        self._next_index = 0
+
+    def _write(self, lines) -> None:
+        entries = []
+        offset = self._size
+        for line in lines:
+            if offset >= self._next_index:
+                _, ts, *_ = RECORD.unpack_from(line)
+                entries.append(INDEX_ENTRY.pack(ts, offset))
+                self._next_index = offset + self.index_every
+            offset += len(line)
+
+        super()._write(lines)
+        if entries:
+            self._index.write(b"".join(entries))
+            self._index.flush()
+
+    def _rotate(self) -> None:
+        self._index.close()
+        shift_backups(self.index_path, self.backups)
+        super()._rotate()
+
+
+def _short_field(text: str) -> bytes:
+    data = text.encode("utf-8", "replace")
+    if len(data) > _MAX_SHORT_FIELD:
+        data = data[:_MAX_SHORT_FIELD].decode("utf-8", "ignore").encode("utf-8")
+    return data
+
+
+# -------------------------
+# Reader
+# -------------------------
+
+class BinaryLogReader:
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        self._size = os.fstat(self._file.fileno()).st_size
+        self._view = None
+
+        if self._size:
+            self._view = mmap.mmap(self._file.fileno(), self._size, access=mmap.ACCESS_READ)
+        if self._size < len(MAGIC) or self._view[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise BinaryLogError(f"{path} is not a SuperOS binary log")
+
+        self._index_ts: List[float] = []
+        self._index_offsets: List[int] = []
+        self._load_index()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        if self._view is not None:
+            self._view.close()
+            self._view = None
+        self._file.close()
+
+    def search(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        source: Optional[str] = None,
+        level: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Records in [since, until] from source at level, oldest first.
+        Stops at the first record past until.
+        """
+        view, size = self._view, self._size
+        source_b = source.encode("utf-8") if source is not None else None
+        level_b = level.encode("utf-8") if level is not None else None
+
+        offset = self._start_offset(since)
+        while offset + RECORD.size <= size:
+            length, ts, seq, source_len, level_len, message_len = RECORD.unpack_from(view, offset)
+            end = offset + length
+            if length < RECORD.size or end > size:
+                return  # torn tail
+
+            if until is not None and ts > until:
+                return
+
+            if since is None or ts >= since:
+                pos = offset + RECORD.size
+                rec_source = view[pos:pos + source_len]
+                pos += source_len
+                rec_level = view[pos:pos + level_len]
+                pos += level_len
+
+                if (source_b is None or rec_source == source_b) and (
+                    level_b is None or rec_level == level_b
+                ):
+                    message = view[pos:pos + message_len].decode("utf-8")
+                    meta = view[pos + message_len:end]
+                    yield {
+                        "seq": seq,
+                        "timestamp": ts,
+                        "source": rec_source.decode("utf-8"),
+                        "level": rec_level.decode("utf-8"),
+                        "message": message,
+                        "meta": json.loads(meta) if meta else {},
+                    }
+
+            offset = end
+
+    def _start_offset(self, since: Optional[float]) -> int:
+        if since is None or not self._index_ts:
+            return len(MAGIC)
+        # Last indexed record strictly before since; records between it
+        # and the next entry are scanned and filtered.
+        i = bisect.bisect_left(self._index_ts, since) - 1
+        return self._index_offsets[i] if i >= 0 else len(MAGIC)
+
+    def _load_index(self) -> None:
+        try:
+            with open(self.path + INDEX_SUFFIX, "rb") as f:
+                data = f.read()
+        except FileNotFoundError:
+            return
+
+        usable = len(data) - len(data) % INDEX_ENTRY.size
+        for ts, offset in INDEX_ENTRY.iter_unpack(data[:usable]):
+            # Entries past the data (a stale or foreign index) are useless.
+            if offset >= self._size:
+                break
+            self._index_ts.append(ts)
+            self._index_offsets.append(offset)
+
+
+def log_files(path: str) -> List[str]:
+    """
+    path and its rotated backups, oldest first.
+    """
+    backups = []
+    pattern = re.compile(re.escape(os.path.basename(path)) + r"\.(\d+)$")
+    directory = os.path.dirname(path) or "."
+    for name in os.listdir(directory):
+        match = pattern.match(name)
+        if match:
+            backups.append((int(match.group(1)), os.path.join(directory, name)))
+
+    files = [name for _, name in sorted(backups, reverse=True)]
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+# -------------------------
+# CLI
+# -------------------------
+
+_RELATIVE = re.compile(r"^-?(\d+(?:\.\d+)?)([smhd])$")
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_time(value: str) -> float:
+    """
+    Epoch seconds, an ISO timestamp, or an age ("90s", "1h" ago).
+    """
+    match = _RELATIVE.match(value)
+    if match:
+        return time.time() - float(match.group(1)) * _UNITS[match.group(2)]
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+def _parse_meta(value: str) -> tuple[str, str]:
+    key, sep, expected = value.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError("--meta expects key=value")
+    return key, expected
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m orchestrator.binlog",
+        description="Search SuperOS binary logs.",
+    )
+    parser.add_argument("path", help="binary log; rotated backups are searched too")
+    parser.add_argument("--since", type=parse_time, help="epoch, ISO time or age (90s, 1h)")
+    parser.add_argument("--until", type=parse_time, help="epoch, ISO time or age (90s, 1h)")
+    parser.add_argument("--source")
+    parser.add_argument("--level")
+    parser.add_argument(
+        "--meta", type=_parse_meta, action="append", default=[],
+        help="key=value meta match (repeatable)",
+    )
+    parser.add_argument("--limit", type=int)
+    parser.add_argument("--json", action="store_true", help="one JSON object per line")
+    args = parser.parse_args(argv)
+
+    files = log_files(args.path)
+    if not files:
+        print(f"no such log: {args.path}", file=sys.stderr)
+        return 1
+
+    shown = 0
+    for path in files:
+        with BinaryLogReader(path) as reader:
+            for record in reader.search(args.since, args.until, args.source, args.level):
+                meta = record["meta"]
+                if any(str(meta.get(k)) != v for k, v in args.meta):
+                    continue
+
+                if args.json:
+                    print(json.dumps(record, default=str))
+                else:
+                    print(
+                        f"{format_timestamp(record['timestamp'])} "
+                        f"{record['level']:<5} {record['source']}: {record['message']}"
+                        + (f" {json.dumps(meta, default=str)}" if meta else "")
+                    )
+
+                shown += 1
+                if args.limit is not None and shown >= args.limit:
+                    return 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
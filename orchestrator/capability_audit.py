@@ -0,0 +1,280 @@
+# orchestrator/capability_audit.py
+
+"""
+Capability Audit Trail (User Space)
+
+Records every allow/deny decision CapabilityEnforcer makes as
+(timestamp, role, capability, verdict, pid).
+
+The decision path only builds one tuple and appends it to a fixed-size
+in-memory ring (a plain deque append, no locks). A filter() call is a
+single entry holding every requested capability and the granted set,
+under one timestamp; it is expanded into per-capability decisions when
+read. Counting and handing entries to the sink happen in batches:
+collect() takes the entries appended since its last run, and the sink's
+background thread runs it before every write. An entry that falls off
+the ring before it was collected is counted in `dropped`, so capacity
+should cover the decisions made in one sink flush_interval.
+
+Entries are persisted in the structured binary log format
+(orchestrator.binlog), with the role in the source field
+("capability:<role>") and the verdict in the level field (INFO = allow,
+WARN = deny). Searches therefore use the time index and compare role and
+verdict as raw bytes, and the binlog CLI works on audit files directly:
+
+    python -m orchestrator.binlog logs/capability_audit.binlog --since 1h \\
+        --source capability:ui --level WARN
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from orchestrator.binlog import BinaryLogReader, BinaryLogSink, encode_record, log_files
+
+SOURCE_PREFIX = "capability:"
+ALLOW = "INFO"
+DENY = "WARN"
+
+DEFAULT_CAPACITY = 100_000
+
+# (seq, timestamp, role, capability, verdict, pid)
+Entry = Tuple[int, float, str, str, bool, Optional[int]]
+
+
+class AuditEntry:
+    """
+    View of an entry tuple with the LogRecord fields binlog encodes.
+    Built on the writer thread, never on the decision path.
+    """
+
+    __slots__ = ("seq", "timestamp", "role", "capability", "verdict", "pid")
+
+    def __init__(self, entry: Entry):
+        self.seq, self.timestamp, self.role, self.capability, self.verdict, self.pid = entry
+
+    @property
+    def source(self) -> str:
+        return SOURCE_PREFIX + self.role
+
+    @property
+    def level(self) -> str:
+        return ALLOW if self.verdict else DENY
+
+    @property
+    def message(self) -> str:
+        return ("allow " if self.verdict else "deny ") + self.capability
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        return {"capability": self.capability, "pid": self.pid}
+
+    def serialize(self) -> Dict[str, Any]:
+        return {
+            "seq": self.seq,
+            "ts": self.timestamp,
+            "role": self.role,
+            "capability": self.capability,
+            "verdict": self.verdict,
+            "pid": self.pid,
+        }
+
+
+def _expand(entry: tuple) -> Iterator[Entry]:
+    # A filter() entry holds (requested tuple, granted set) in place of
+    # (capability, verdict)
+    requested = entry[3]
+    if type(requested) is not tuple:
+        yield entry
+        return
+    seq, ts, role, _, granted, pid = entry
+    for capability in requested:
+        yield (seq, ts, role, capability, capability in granted, pid)
+
+
+class AuditLogSink(BinaryLogSink):
+    """
+    Binary log sink fed with entry tuples.
+    """
+
+    # Set by CapabilityAudit: queues the decisions made since the last
+    # write, on the writer thread.
+    collect: Optional[Callable[[], Any]] = None
+
+    def encode(self, record: Entry) -> bytes:
+        return encode_record(AuditEntry(record))
+
+    def _write_queued(self) -> None:
+        if self.collect is not None:
+            self.collect()
+        super()._write_queued()
+
+
+class CapabilityAudit:
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        sink: Optional[AuditLogSink] = None,
+    ):
+        if capacity < 1:
+            raise ValueError("audit capacity must be positive")
+        self._ring: Deque[tuple] = deque(maxlen=capacity)
+        self._sink = sink
+        # next() on a count is atomic, so concurrent decisions never share
+        # a seq; they may still reach the ring slightly out of seq order.
+        self._seq = itertools.count(1)
+        self.dropped = 0
+
+        # Collector state: seq of the last entry collected (by ring
+        # position), the highest seq and number of entries collected, and
+        # the per-role counts
+        self._lock = threading.Lock()
+        self._last = 0
+        self._highest = 0
+        self._seen = 0
+        self._allowed: Dict[str, int] = {}
+        self._denied: Dict[str, int] = {}
+
+        if sink is not None:
+            sink.collect = self.collect
+
+    def record(self, role: str, capability: str, verdict: bool, pid: Optional[int] = None) -> None:
+        self._ring.append((next(self._seq), time.time(), role, capability, verdict, pid))
+
+    def record_filter(
+        self,
+        role: str,
+        requested: Iterable[str],
+        granted: FrozenSet[str],
+        pid: Optional[int] = None,
+    ) -> None:
+        """
+        One entry for a filter() call: every requested capability,
+        allowed if it is in granted. granted may be the role's whole
+        policy; only membership of requested names is read.
+        """
+        self._ring.append((next(self._seq), time.time(), role, tuple(requested), granted, pid))
+
+    def collect(self) -> int:
+        """
+        Count the entries appended since the last collect() and queue
+        them on the sink. Returns the number of decisions collected.
+        """
+        with self._lock:
+            # Copying the deque is one C call, atomic under the GIL
+            entries = list(self._ring)
+
+            # New entries follow the last one collected. Seqs are not
+            # sorted in the ring, so find it by position; if it has
+            # fallen off, everything retained is new.
+            last = self._last
+            start = len(entries)
+            while start and entries[start - 1][0] != last:
+                start -= 1
+            if start == len(entries):
+                return 0
+            self._last = entries[-1][0]
+
+            # Seqs issued but never collected fell off the ring. One still
+            # being appended counts until it arrives, then is taken back.
+            fresh = entries[start:]
+            self._highest = max(self._highest, max(entry[0] for entry in fresh))
+            self._seen += len(fresh)
+            self.dropped = max(0, self._highest - self._seen)
+
+            allowed, denied = self._allowed, self._denied
+            sink = self._sink
+            collected = 0
+            for entry in fresh:
+                for row in _expand(entry):
+                    counts = allowed if row[4] else denied
+                    counts[row[2]] = counts.get(row[2], 0) + 1
+                    if sink is not None:
+                        sink.emit(row)
+                    collected += 1
+            return collected
+
+    # -------------------------
+    # Queries
+    # -------------------------
+
+    def counters(self) -> Dict[str, Dict[str, int]]:
+        """
+        {role: {"allowed": n, "denied": n}} since start, leaving out
+        decisions counted in `dropped`.
+        """
+        self.collect()
+        return {
+            role: {
+                "allowed": self._allowed.get(role, 0),
+                "denied": self._denied.get(role, 0),
+            }
+            for role in set(self._allowed) | set(self._denied)
+        }
+
+    def recent(
+        self,
+        role: Optional[str] = None,
+        verdict: Optional[bool] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        Newest retained decisions first.
+        """
+        page = []
+        for entry in reversed(list(self._ring)):
+            if role is not None and entry[2] != role:
+                continue
+            for row in reversed(list(_expand(entry))):
+                if verdict is not None and row[4] != verdict:
+                    continue
+                page.append(AuditEntry(row).serialize())
+                if len(page) >= limit:
+                    return page
+        return page
+
+    def search(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        role: Optional[str] = None,
+        verdict: Optional[bool] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Persisted decisions (including rotated files), oldest first.
+        Needs a sink; entries still queued in it are not yet visible.
+        """
+        if self._sink is None:
+            return
+        source = SOURCE_PREFIX + role if role is not None else None
+        level = None if verdict is None else (ALLOW if verdict else DENY)
+
+        for path in log_files(self._sink.path):
+            with BinaryLogReader(path) as reader:
+                for record in reader.search(since, until, source, level):
+                    meta = record["meta"]
+                    yield {
+                        "seq": record["seq"],
+                        "ts": record["timestamp"],
+                        "role": record["source"][len(SOURCE_PREFIX):],
+                        "capability": meta.get("capability"),
+                        "verdict": record["level"] == ALLOW,
+                        "pid": meta.get("pid"),
+                    }
+
+    def close(self) -> None:
+        if self._sink is not None:
+            self._sink.close()
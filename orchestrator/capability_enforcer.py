@@ -6,10 +6,31 @@ It does NOT grant authority — the kernel does that.
 It only decides *what to request* and *what to deny*.
 
 If this layer is bypassed, the kernel will still enforce security.
+
+Capability names are interned to bit positions when first registered, so
+a role's policy is an integer mask; it is also kept as a frozenset of
+names. allows() is a bit test against the mask, and callers holding
+masks (mask_of) can intersect them with filter_mask(). check() and
+filter() take names, so they use the frozenset: one hash probe, or one
+intersection in C, where building a mask from names in Python would cost
+more than the decision. Hot paths that only need a yes or no should call
+allows(), which never raises.
+
+With an audit attached (orchestrator.capability_audit), every decision
+made by allows(), check() and filter() is recorded; a filter() call is
+one audit entry.
 """
 
 from dataclasses import dataclass
-from typing import Dict, Set
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Optional, Set
+
+from orchestrator.capability_audit import CapabilityAudit
+
+# Decoded masks kept by capabilities_of(); bounds growth from arbitrary
+# requests.
+_DECODED_CACHE_LIMIT = 1024
+
+_NOTHING: FrozenSet[str] = frozenset()
 
 
 @dataclass(frozen=True)
@@ -26,6 +47,19 @@ class CapabilityViolation(Exception):
     pass
 
 
+class _PolicyTable:
+    """
+    Compiled role policies. Replaced as a whole by replace_policies(), so
+    a check reads one consistent table.
+    """
+
+    __slots__ = ("masks", "allowed")
+
+    def __init__(self):
+        self.masks: Dict[str, int] = {}
+        self.allowed: Dict[str, FrozenSet[str]] = {}
+
+
 class CapabilityEnforcer:
     """
     User-space capability policy engine.
@@ -36,40 +70,131 @@ class CapabilityEnforcer:
     - Provide audit-friendly decision points
     """
 
-    def __init__(self):
-        self._policies: Dict[str, Set[str]] = {}
+    def __init__(self, audit: Optional[CapabilityAudit] = None):
+        self.audit = audit
+
+        # Bit positions only ever grow, so a mask stays valid across
+        # policy swaps.
+        self._bits: Dict[str, int] = {}
+        # name -> 1 << bit, so mask_of() needs no shifts
+        self._flags: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._decoded: Dict[int, FrozenSet[str]] = {}
+        self._table = _PolicyTable()
 
     def register_policy(self, role: str, capabilities: Set[str]) -> None:
         """
         Register allowed capabilities for a role.
         Example roles: runtime, ml_service, ui, build_service
         """
-        self._policies[role] = set(capabilities)
+        self._compile(self._table, role, capabilities)
+
+    def replace_policies(self, policies: Mapping[str, Iterable[str]]) -> None:
+        """
+        Swap in a complete set of role policies at once. Checks running
+        concurrently see either the old set or the new one, never a mix.
+        """
+        table = _PolicyTable()
+        for role, capabilities in policies.items():
+            self._compile(table, role, capabilities)
+        self._table = table
+
+    def roles(self) -> FrozenSet[str]:
+        return frozenset(self._table.masks)
+
+    def _compile(self, table: _PolicyTable, role: str, capabilities: Iterable[str]) -> None:
+        mask = 0
+        for capability in capabilities:
+            bit = self._bits.get(capability)
+            if bit is None:
+                bit = self._bits[capability] = len(self._names)
+                self._flags[capability] = 1 << bit
+                self._names.append(capability)
+            mask |= 1 << bit
+
+        table.masks[role] = mask
+        table.allowed[role] = self.capabilities_of(mask)
+
+    def allows(self, role: str, capability: str, pid: Optional[int] = None) -> bool:
+        """
+        Whether role may request capability. Unknown roles are denied.
+        """
+        verdict = self._table.masks.get(role, 0) & self._flags.get(capability, 0) != 0
 
-    def check(self, role: str, capability: str) -> None:
+        if self.audit is not None:
+            self.audit.record(role, capability, verdict, pid)
+        return verdict
+
+    def check(self, role: str, capability: str, pid: Optional[int] = None) -> None:
         """
         Check whether a role is allowed to request a capability.
         Raises CapabilityViolation if denied.
         """
-        allowed = self._policies.get(role)
+        allowed = self._table.allowed.get(role)
+        if allowed is not None and capability in allowed:
+            if self.audit is not None:
+                self.audit.record(role, capability, True, pid)
+            return
+
+        if self.audit is not None:
+            self.audit.record(role, capability, False, pid)
 
         if allowed is None:
             raise CapabilityViolation(
                 f"no capability policy defined for role '{role}'"
             )
 
-        if capability not in allowed:
-            raise CapabilityViolation(
-                f"capability '{capability}' denied for role '{role}'"
-            )
+        raise CapabilityViolation(
+            f"capability '{capability}' denied for role '{role}'"
+        )
 
-    def filter(self, role: str, requested: Set[str]) -> Set[str]:
+    def filter(self, role: str, requested: Set[str], pid: Optional[int] = None) -> FrozenSet[str]:
         """
         Filter a requested capability set down to allowed ones.
         Denied capabilities are silently dropped.
         """
-        allowed = self._policies.get(role, set())
-        return requested.intersection(allowed)
+        policy = self._table.allowed.get(role, _NOTHING)
+        allowed = policy.intersection(requested)
+        if self.audit is not None:
+            # The policy gives every requested name the same verdict as
+            # allowed does, and is one shared set rather than a new one
+            # kept alive per ring entry (and walked by the GC).
+            self.audit.record_filter(role, requested, policy, pid)
+        return allowed
+
+    def filter_mask(self, role: str, requested: int) -> int:
+        """
+        filter() for callers holding masks: the allowed subset of
+        requested, as a mask. Not audited.
+        """
+        return self._table.masks.get(role, 0) & requested
+
+    def mask_of(self, capabilities: Iterable[str]) -> int:
+        """
+        Bitmask for a set of capability names. Names no policy mentions
+        have no bit and are left out.
+        """
+        flags = self._flags
+        mask = 0
+        for capability in capabilities:
+            mask |= flags.get(capability, 0)
+        return mask
+
+    def capabilities_of(self, mask: int) -> FrozenSet[str]:
+        """
+        Capability names for a bitmask.
+        """
+        names = self._decoded.get(mask)
+        if names is None:
+            if len(self._decoded) >= _DECODED_CACHE_LIMIT:
+                self._decoded.clear()
+            names = self._decoded[mask] = frozenset(
+                name for bit, name in enumerate(self._names) if mask >> bit & 1
+            )
+        return names
+
+    def policy(self, role: str) -> FrozenSet[str]:
+        return self._table.allowed.get(role, frozenset())
 
 
 # ---- Default policy bootstrap (example) ----
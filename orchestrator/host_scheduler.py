@@ -0,0 +1,361 @@
+# orchestrator/host_scheduler.py
+
+"""
+Host Scheduling Mechanism (User Space)
+
+Maps SchedulingPolicy onto what the host kernel offers, so policies
+assigned through SchedulerPolicyEngine actually change how processes
+are scheduled:
+
+    nice        -priority, clamped to -20..19; foreground processes never
+                run below nice 0. Raising priority above the current
+                level needs CAP_SYS_NICE; without it the current nice is
+                kept.
+    affinity    background processes with negative priority are kept off
+                the first reserve_cpus CPUs, so foreground work always
+                has a CPU to run on (only with more CPUs than reserved).
+    cgroup v2   when a cgroup2 hierarchy with the cpu controller is
+                writable, each process gets a leaf under
+                <own cgroup>/superos with
+                    cpu.weight  100 * 2^(priority / 5)    (1..10000)
+                    cpu.max     background, negative priority only:
+                                (1 + priority / 20) of all CPUs, over a
+                                period of time_slice_ms
+                Otherwise cgroups are skipped and nice/affinity apply.
+                cgroup v2 only lets a group without processes of its own
+                enable controllers for its children, so the orchestrator
+                first moves itself into the <own cgroup>/orchestrator
+                leaf.
+
+The same per-process cgroup carries resource limits: memory.max (with
+swap disabled) and pids.max, when the memory / pids controllers are
+delegated. limit_group() creates and configures the group before the
+process exists, so it can enter it before running any code (preexec(),
+or enter() for a worker that has not started its service yet); adopt()
+then binds the group to the process's pid. See
+orchestrator.process_limits.
+
+Every mechanism is best effort: a process that has already exited, or a
+host that refuses a setting, never fails the policy assignment.
+"""
+
+import os
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from loguru import logger
+
+CGROUP_DIR = "superos"
+
+# Leaf the orchestrator moves into, next to CGROUP_DIR.
+ORCHESTRATOR_DIR = "orchestrator"
+
+# Controllers used when delegated; any subset works.
+CONTROLLERS = ("cpu", "memory", "pids")
+
+DEFAULT_WEIGHT = 100
+WEIGHT_RANGE = (1, 10_000)
+NICE_RANGE = (-20, 19)
+
+# cpu.max period bounds (microseconds)
+PERIOD_RANGE = (1_000, 1_000_000)
+
+# Smallest CPU share cpu.max throttles a background process to.
+MIN_SHARE = 0.05
+
+
+def nice_for(policy) -> int:
+    nice = max(NICE_RANGE[0], min(NICE_RANGE[1], -policy.priority))
+    if policy.foreground:
+        nice = min(nice, 0)
+    return nice
+
+
+def weight_for(policy) -> int:
+    weight = round(DEFAULT_WEIGHT * 2 ** (policy.priority / 5))
+    if policy.foreground:
+        weight = max(weight, DEFAULT_WEIGHT)
+    return max(WEIGHT_RANGE[0], min(WEIGHT_RANGE[1], weight))
+
+
+def cpu_max_for(policy, cpus: int) -> str:
+    period = max(PERIOD_RANGE[0], min(PERIOD_RANGE[1], policy.time_slice_ms * 1000))
+    if policy.foreground or policy.priority >= 0:
+        return f"max {period}"
+    share = max(MIN_SHARE, 1.0 + policy.priority / 20)
+    return f"{max(1000, round(period * cpus * share))} {period}"
+
+
+class HostScheduler:
+    def __init__(self, cgroup_root: Optional[str] = None, reserve_cpus: int = 1):
+        """
+        cgroup_root: directory to create per-process cgroups in; found
+        from this process's own cgroup when None.
+        """
+        self.reserve_cpus = reserve_cpus
+        self._cpus = _allowed_cpus()
+        self._controllers: frozenset = frozenset()
+        self._cgroup_root = self._setup_cgroups(cgroup_root)
+        # os_pid -> group created before the process existed
+        self._groups: Dict[int, str] = {}
+
+    @property
+    def cgroups(self) -> bool:
+        return self._cgroup_root is not None
+
+    @property
+    def limit_controllers(self) -> frozenset:
+        """
+        Limits ("memory", "pids") enforced by cgroup on this host.
+        """
+        return self._controllers & {"memory", "pids"}
+
+    def apply(self, os_pid: int, policy) -> Dict[str, Any]:
+        """
+        Apply policy to a host process. Returns the settings that took
+        effect.
+        """
+        applied: Dict[str, Any] = {}
+
+        nice = self._set_nice(os_pid, nice_for(policy))
+        if nice is not None:
+            applied["nice"] = nice
+
+        cpus = self._cpus_for(policy)
+        try:
+            os.sched_setaffinity(os_pid, cpus)
+            applied["cpus"] = sorted(cpus)
+        except (AttributeError, OSError):
+            pass
+
+        if "cpu" in self._controllers:
+            applied.update(self._set_cgroup(os_pid, policy))
+        return applied
+
+    def limit_group(self, name: str, limits) -> Tuple[Optional[str], frozenset]:
+        """
+        Create cgroup name with limits.memory_bytes / max_pids, for a
+        process about to start. Returns the group and the limits that
+        took effect, or (None, frozenset()) when none did.
+        """
+        wanted = {}
+        if limits.memory_bytes is not None and "memory" in self._controllers:
+            wanted["memory"] = [("memory.max", str(limits.memory_bytes)), ("memory.swap.max", "0")]
+        if limits.max_pids is not None and "pids" in self._controllers:
+            wanted["pids"] = [("pids.max", str(limits.max_pids))]
+        if not wanted:
+            return None, frozenset()
+
+        group = os.path.join(self._cgroup_root, name)
+        try:
+            os.makedirs(group, exist_ok=True)
+            for files in wanted.values():
+                for filename, value in files:
+                    path = os.path.join(group, filename)
+                    # memory.swap.max is absent without swap accounting
+                    if filename == "memory.swap.max" and not os.path.exists(path):
+                        continue
+                    _write(path, value)
+        except OSError as e:
+            logger.debug(f"cgroup limits failed for {name}: {e}")
+            self.remove_group(group)
+            return None, frozenset()
+        return group, frozenset(wanted)
+
+    @staticmethod
+    def preexec(group: str) -> Callable[[], None]:
+        """
+        preexec_fn that moves the forked child into group before exec.
+        Raises in the child, failing the spawn, if the move fails.
+        """
+        procs = os.path.join(group, "cgroup.procs").encode()
+
+        def enter() -> None:
+            fd = os.open(procs, os.O_WRONLY)
+            try:
+                os.write(fd, b"0")
+            finally:
+                os.close(fd)
+
+        return enter
+
+    def enter(self, group: str, os_pid: int) -> bool:
+        """
+        Move a running process into group.
+        """
+        try:
+            _write(os.path.join(group, "cgroup.procs"), str(os_pid))
+            return True
+        except OSError as e:
+            logger.debug(f"cgroup move failed for os_pid={os_pid}: {e}")
+            return False
+
+    def adopt(self, os_pid: int, group: str) -> None:
+        """
+        Bind a group from limit_group() to its process: policies, events
+        and release() for os_pid use it.
+        """
+        self._groups[os_pid] = group
+
+    def remove_group(self, group: str) -> None:
+        try:
+            os.rmdir(group)
+        except OSError:
+            pass
+
+    def limit_events(self, os_pid: int) -> Dict[str, int]:
+        """
+        Limit hits recorded by the process's cgroup: oom_kill and
+        pids_max counters. Read before release().
+        """
+        if self._cgroup_root is None:
+            return {}
+        group = self._group(os_pid)
+        events = {}
+        for filename, key, name in (
+            ("memory.events", "oom_kill", "oom_kill"),
+            ("pids.events", "max", "pids_max"),
+        ):
+            try:
+                for line in _read(os.path.join(group, filename)).splitlines():
+                    field, _, value = line.partition(" ")
+                    if field == key:
+                        events[name] = int(value)
+            except (OSError, ValueError):
+                continue
+        return events
+
+    def release(self, os_pid: int) -> None:
+        """
+        Remove the process's cgroup once it has exited.
+        """
+        if self._cgroup_root is None:
+            return
+        self.remove_group(self._group(os_pid))
+        self._groups.pop(os_pid, None)
+
+    def _group(self, os_pid: int) -> str:
+        group = self._groups.get(os_pid)
+        if group is None:
+            group = os.path.join(self._cgroup_root, str(os_pid))
+        return group
+
+    # -------------------------
+    # Mechanisms
+    # -------------------------
+
+    def _set_nice(self, os_pid: int, nice: int) -> Optional[int]:
+        try:
+            os.setpriority(os.PRIO_PROCESS, os_pid, nice)
+            return nice
+        except PermissionError:
+            # Unprivileged: nice can only go up. Keep what it has.
+            try:
+                return os.getpriority(os.PRIO_PROCESS, os_pid)
+            except OSError:
+                return None
+        except OSError:
+            return None
+
+    def _cpus_for(self, policy) -> Set[int]:
+        cpus = self._cpus
+        if policy.foreground or policy.priority >= 0 or len(cpus) <= self.reserve_cpus:
+            return cpus
+        return set(sorted(cpus)[self.reserve_cpus:])
+
+    def _set_cgroup(self, os_pid: int, policy) -> Dict[str, Any]:
+        group = self._group(os_pid)
+        weight = weight_for(policy)
+        cpu_max = cpu_max_for(policy, len(self._cpus))
+        try:
+            os.makedirs(group, exist_ok=True)
+            _write(os.path.join(group, "cpu.weight"), str(weight))
+            _write(os.path.join(group, "cpu.max"), cpu_max)
+            _write(os.path.join(group, "cgroup.procs"), str(os_pid))
+        except OSError as e:
+            logger.debug(f"cgroup setup failed for os_pid={os_pid}: {e}")
+            return {}
+        return {"cpu.weight": weight, "cpu.max": cpu_max}
+
+    def _setup_cgroups(self, root: Optional[str]) -> Optional[str]:
+        own = _own_cgroup()
+        if root is None:
+            if own is None:
+                logger.info("cgroup v2 not available; scheduling via nice/affinity only")
+                return None
+            root = os.path.join(own, CGROUP_DIR)
+            parent = own
+        else:
+            parent = os.path.dirname(root.rstrip("/"))
+
+        try:
+            available = _read(os.path.join(parent, "cgroup.controllers")).split()
+            controllers = [name for name in CONTROLLERS if name in available]
+            if not controllers:
+                raise OSError("no cpu/memory/pids controller delegated")
+            if own is not None and os.path.samefile(own, parent):
+                # No internal processes: parent must be empty before it
+                # can hand controllers down (EBUSY otherwise)
+                leaf = os.path.join(parent, ORCHESTRATOR_DIR)
+                os.makedirs(leaf, exist_ok=True)
+                _write(os.path.join(leaf, "cgroup.procs"), str(os.getpid()))
+            os.makedirs(root, exist_ok=True)
+            _enable(parent, controllers)
+            _enable(root, controllers)
+        except OSError as e:
+            logger.info(f"cgroup v2 not writable ({e}); scheduling via nice/affinity only")
+            return None
+        self._controllers = frozenset(controllers)
+        return root
+
+
+def _allowed_cpus() -> Set[int]:
+    try:
+        return set(os.sched_getaffinity(0))
+    except AttributeError:
+        return set(range(os.cpu_count() or 1))
+
+
+def _cgroup2_mount() -> Optional[str]:
+    try:
+        with open("/proc/self/mountinfo", "r") as f:
+            for line in f:
+                # ... mount_point ... - fstype source options
+                fields = line.split()
+                sep = fields.index("-")
+                if fields[sep + 1] == "cgroup2":
+                    return fields[4]
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def _own_cgroup() -> Optional[str]:
+    mount = _cgroup2_mount()
+    if mount is None:
+        return None
+    try:
+        with open("/proc/self/cgroup", "r") as f:
+            for line in f:
+                if line.startswith("0::"):
+                    return os.path.join(mount, line[3:].strip().lstrip("/"))
+    except OSError:
+        pass
+    return None
+
+
+def _enable(group: str, controllers) -> None:
+    path = os.path.join(group, "cgroup.subtree_control")
+    enabled = _read(path).split()
+    missing = [name for name in controllers if name not in enabled]
+    if missing:
+        _write(path, " ".join("+" + name for name in missing))
+
+
+def _read(path: str) -> str:
+    with open(path, "r") as f:
+        return f.read()
+
+
+def _write(path: str, value: str) -> None:
+    with open(path, "w") as f:
+        f.write(value)
@@ -5,37 +5,676 @@
 # Central asynchronous publish/subscribe message bus.
 # This is the ONLY communication spine between UI, services, and kernel.
 # No direct calls. No shared state. No shortcuts.
+#
+# Dispatch is sharded: every channel is pinned to one of N worker tasks.
+# Messages on the same channel are delivered in publish order; different
+# channels on different shards are delivered concurrently, so one slow
+# handler cannot hold up unrelated traffic.
+#
+# Each channel owns a mailbox. Mailboxes may be bounded; when one is full
+# the channel's overflow policy decides whether the publisher waits or a
+# message is discarded, so a chatty producer cannot grow memory unbounded.
+# Blocked publishers are admitted in arrival order, and a message takes its
+# sequence number (and journal slot) only when it is admitted.
+#
+# Subscriptions may use hierarchical patterns ("process.*", "runtime.#");
+# see orchestrator.topic_trie for matching rules.
+#
+# High-volume producers can publish_many() in one call, and subscribers can
+# opt into batch delivery: the handler then receives a list of payloads per
+# wakeup, bounded by batch_size and flushed after at most batch_wait seconds.
+#
+# request() layers request/reply on top of publish: each call carries a
+# correlation id and a deadline, and many calls can be in flight at once.
+# Replies resolve the waiting call directly instead of going through a
+# mailbox, so a handler may await a request of its own: the reply never
+# queues behind it. The request itself is still delivered by the target
+# channel's shard; a handler requesting a channel on its own shard would
+# wait on itself, so that request fails at once with IPCRequestError.
+# Message conventions live in orchestrator.ipc_rpc.
+#
+# Queued messages are orchestrator.ipc_envelope.Envelope objects stamped
+# with a per-channel sequence number and publish time, so frames arriving
+# from other processes (publish_frame) travel the same path as local ones.
+# A frame's channel id must be known here (interned locally, or named by
+# an earlier frame); unknown ids are rejected.
+#
+# Built-in metrics (orchestrator.ipc_metrics) track per-channel rate, queue
+# wait and handler latency, and the slowest handlers. snapshot() returns
+# them; a request on the "bus.stats" channel is answered with the same data.
+# Rates count every message; handler latency is sampled on one call in
+# HANDLER_SAMPLE_EVERY per subscription (the first call always), since
+# timing every call costs more than a cheap handler itself.
+#
+# Selected channels can be journaled to disk (orchestrator.ipc_journal).
+# Everything published on a journaled channel is kept, subscribers or not,
+# and resume() replays it from a sequence number before going live, so a
+# reconnecting consumer catches up without asking every service again.
+# A payload the journal cannot encode (not JSON-serializable, such as a
+# set) is still delivered, but is logged and left out of the journal.
 
 import asyncio
-from collections import defaultdict
-from typing import Any, Awaitable, Callable, Dict, List
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 from loguru import logger
 
+from orchestrator.ipc_envelope import (
+    Envelope,
+    EnvelopeError,
+    channel_id,
+    decode,
+    known_channel,
+)
+from orchestrator.ipc_journal import (
+    DEFAULT_RETAIN_SEGMENTS,
+    DEFAULT_SEGMENT_BYTES,
+    ChannelJournal,
+)
+from orchestrator.ipc_metrics import (
+    HANDLER_SAMPLE_EVERY,
+    BusMetrics,
+    HandlerMetrics,
+    dump_snapshot,
+)
+from orchestrator.ipc_rpc import (
+    CORRELATION_ID,
+    REPLY_CHANNEL,
+    IPCRequestError,
+    make_reply,
+    make_request,
+)
+from orchestrator.topic_trie import TopicTrie
+
 MessageHandler = Callable[[Any], Awaitable[None]]
 
+# Handlers subscribed with one of these run on a pool instead of the loop.
+# They must be plain (non-async) callables; "process" handlers must also
+# be picklable (module-level functions).
+EXECUTOR_THREAD = "thread"
+EXECUTOR_PROCESS = "process"
+
+# Overflow policies for bounded channels.
+POLICY_BLOCK = "block"              # publisher waits for space
+POLICY_DROP_OLDEST = "drop_oldest"  # evict the oldest queued message
+POLICY_DROP_NEWEST = "drop_newest"  # discard the message being published
+POLICY_COALESCE = "coalesce"        # overwrite the newest queued message
+
+OVERFLOW_POLICIES = (
+    POLICY_BLOCK,
+    POLICY_DROP_OLDEST,
+    POLICY_DROP_NEWEST,
+    POLICY_COALESCE,
+)
+
+# Stats requests are answered here; plain messages trigger a broadcast
+# of the snapshot on STATS_SNAPSHOT_CHANNEL.
+STATS_CHANNEL = "bus.stats"
+STATS_SNAPSHOT_CHANNEL = "bus.stats.snapshot"
+
+# Messages a worker takes from one mailbox before yielding to the next.
+_DRAIN_LIMIT = 64
+
+_STOP = object()
+
+
+class _Subscription:
+    __slots__ = (
+        "handler", "executor", "batch_size", "batch_wait", "metrics", "countdown", "after",
+    )
+
+    def __init__(
+        self,
+        handler: Callable,
+        executor: Optional[str],
+        batch_size: Optional[int] = None,
+        batch_wait: float = 0.0,
+    ):
+        self.handler = handler
+        self.executor = executor
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.metrics: Optional[HandlerMetrics] = None
+        # Calls until the next timed one; 0 (never reached again) when
+        # metrics are off
+        self.countdown = 0
+
+        # Set by resume(): messages up to this seq were already replayed.
+        self.after = 0
+
+
+class _Shard:
+    """
+    One dispatch worker and its ready queue of mailboxes.
+    Tracks enough timing to spot head-of-line blocking.
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+        self.ready: asyncio.Queue = asyncio.Queue()
+        # The worker task, while the bus runs
+        self.task: Optional[asyncio.Task] = None
+        self.pending = 0
+        self.processed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.handler_total = 0.0
+        self.handler_max = 0.0
+
+    def record(self, chunk: List[Envelope], started: float, finished: float) -> None:
+        n = len(chunk)
+        handled = finished - started
+        oldest = started - chunk[0].timestamp
+
+        self.processed += n
+        self.wait_total += started * n - sum(env.timestamp for env in chunk)
+        self.handler_total += handled
+        if oldest > self.wait_max:
+            self.wait_max = oldest
+        if handled / n > self.handler_max:
+            self.handler_max = handled / n
+
+    def stats(self) -> Dict[str, Any]:
+        n = self.processed or 1
+        return {
+            "shard": self.index,
+            "depth": self.pending,
+            "processed": self.processed,
+            "avg_wait_ms": self.wait_total / n * 1000.0,
+            "max_wait_ms": self.wait_max * 1000.0,
+            "avg_handler_ms": self.handler_total / n * 1000.0,
+            "max_handler_ms": self.handler_max * 1000.0,
+        }
+
+
+class _Mailbox:
+    """
+    Pending messages for one channel.
+    A mailbox sits on its shard's ready queue at most once.
+    """
+
+    __slots__ = (
+        "channel",
+        "channel_id",
+        "seq",
+        "shard",
+        "messages",
+        "capacity",
+        "policy",
+        "scheduled",
+        "waiters",
+        "dropped",
+        "blocked",
+        "coalesced",
+        "batches",
+        "timers",
+        "due",
+        "metrics",
+        "journal",
+    )
+
+    def __init__(
+        self,
+        channel: str,
+        shard: _Shard,
+        capacity: Optional[int],
+        policy: str,
+    ):
+        self.channel = channel
+        self.channel_id = channel_id(channel)
+        self.seq = 0
+        self.shard = shard
+        self.messages: deque[Envelope] = deque()
+        self.capacity = capacity
+        self.policy = policy
+        self.scheduled = False
+        # Blocked publishers in arrival order; only the head is ever woken
+        self.waiters: deque[asyncio.Future] = deque()
+        self.dropped = 0
+        self.blocked = 0
+        self.coalesced = 0
+
+        # Batch subscribers: partial batches, their flush timers, and
+        # subscriptions whose batch_wait has expired.
+        self.batches: Dict[_Subscription, List[Any]] = {}
+        self.timers: Dict[_Subscription, asyncio.TimerHandle] = {}
+        self.due: set[_Subscription] = set()
+
+        self.metrics = None
+        self.journal: Optional[ChannelJournal] = None
+
+    def full(self) -> bool:
+        return self.capacity is not None and len(self.messages) >= self.capacity
+
+    def wake(self):
+        """
+        Let the longest-waiting blocked publisher re-check for space.
+        """
+        if self.waiters and not self.waiters[0].done():
+            self.waiters[0].set_result(None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": len(self.messages),
+            "capacity": self.capacity,
+            "policy": self.policy,
+            "dropped": self.dropped,
+            "blocked": self.blocked,
+            "coalesced": self.coalesced,
+        }
+
 
 class IPCBus:
-    def __init__(self):
-        self._subscribers: Dict[str, List[MessageHandler]] = defaultdict(list)
-        self._queue: asyncio.Queue[tuple[str, Any]] = asyncio.Queue()
+    def __init__(
+        self,
+        shards: int = 1,
+        thread_workers: Optional[int] = None,
+        process_workers: Optional[int] = None,
+        default_capacity: Optional[int] = None,
+        default_policy: str = POLICY_BLOCK,
+        metrics: bool = True,
+        journal_sync_interval: float = 1.0,
+    ):
+        if shards < 1:
+            raise ValueError("IPC bus needs at least one shard")
+        _check_limit(default_capacity, default_policy)
+
+        self._subscribers = TopicTrie()
+        self._shards: List[_Shard] = [_Shard(i) for i in range(shards)]
+        self._mailboxes: Dict[str, _Mailbox] = {}
+        self._limits: Dict[str, tuple[Optional[int], str]] = {}
+        self._default_limit = (default_capacity, default_policy)
         self._running: bool = False
 
+        self._thread_workers = thread_workers
+        self._process_workers = process_workers
+        self._executors: Dict[str, Executor] = {}
+
+        self.metrics = BusMetrics(enabled=metrics)
+
+        self._journals: Dict[str, ChannelJournal] = {}
+        self._journal_sync_interval = journal_sync_interval
+
+        self._pending: Dict[str, asyncio.Future] = {}
+        self.subscribe(STATS_CHANNEL, self._on_stats)
+
     # -------------------------
     # Subscription API
     # -------------------------
 
-    def subscribe(self, channel: str, handler: MessageHandler):
-        logger.debug(f"IPC subscribe: {channel} -> {handler.__name__}")
-        self._subscribers[channel].append(handler)
+    def subscribe(
+        self,
+        channel: str,
+        handler: MessageHandler,
+        executor: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        batch_wait: float = 0.0,
+    ):
+        """
+        Subscribe handler to a channel or pattern.
+
+        With batch_size set, handler receives a list of up to batch_size
+        payloads. A partial batch is delivered once batch_wait seconds pass
+        (immediately if batch_wait is 0).
+        """
+        self._subscribers.add(
+            channel,
+            self._subscription(channel, handler, executor, batch_size, batch_wait),
+        )
+
+    async def resume(
+        self,
+        channel: str,
+        handler: MessageHandler,
+        from_seq: int,
+        executor: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        batch_wait: float = 0.0,
+    ) -> int:
+        """
+        Replay a journaled channel from from_seq, then subscribe.
+
+        handler sees every message from from_seq on exactly once and in
+        order, replayed and live alike. Returns the last replayed
+        sequence number; last_seq() before disconnecting tells a consumer
+        where to resume next time.
+        """
+        journal = self._journals.get(channel)
+        if journal is None:
+            raise ValueError(f"IPC channel '{channel}' is not journaled")
+        if from_seq < journal.first_seq:
+            logger.warning(
+                f"IPC resume: '{channel}' journal starts at {journal.first_seq}, "
+                f"messages from {from_seq} are gone"
+            )
+
+        sub = self._subscription(channel, handler, executor, batch_size, batch_wait)
+        mailbox = self._mailbox(channel)
+
+        # Publishers keep going while handlers run, so read until caught up.
+        # Nothing awaits between the last check and subscribing.
+        next_seq = from_seq
+        while next_seq <= mailbox.seq:
+            upto = mailbox.seq
+            batch = []
+            for env in journal.read(next_seq, upto):
+                if sub.batch_size is None:
+                    await self._invoke(sub, mailbox, env.body)
+                    continue
+                batch.append(env.body)
+                if len(batch) == sub.batch_size:
+                    await self._invoke(sub, mailbox, batch)
+                    batch = []
+            if batch:
+                await self._invoke(sub, mailbox, batch)
+            next_seq = upto + 1
+
+        # Messages still queued were replayed from the journal already.
+        sub.after = mailbox.seq
+        self._subscribers.add(channel, sub)
+        return sub.after
+
+    def _subscription(
+        self,
+        channel: str,
+        handler: MessageHandler,
+        executor: Optional[str],
+        batch_size: Optional[int],
+        batch_wait: float,
+    ) -> _Subscription:
+        if executor not in (None, EXECUTOR_THREAD, EXECUTOR_PROCESS):
+            raise ValueError(f"unknown IPC executor '{executor}'")
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("IPC batch size must be positive")
+
+        logger.debug("IPC subscribe: {} -> {}", channel, handler.__name__)
+        sub = _Subscription(handler, executor, batch_size, batch_wait)
+        sub.metrics = self.metrics.handler(
+            getattr(handler, "__qualname__", repr(handler)), channel
+        )
+        if self.metrics.enabled:
+            sub.countdown = 1
+        return sub
+
+    def unsubscribe(self, channel: str, handler: MessageHandler) -> bool:
+        for sub in self._subscribers.registered(channel):
+            if sub.handler is handler:
+                return self._subscribers.remove(channel, sub)
+        return False
 
     # -------------------------
     # Publish API
     # -------------------------
 
     async def publish(self, channel: str, payload: Any):
+        if channel == REPLY_CHANNEL:
+            # Never queued: the handler awaiting this reply may be the one
+            # occupying the shard that would deliver it.
+            self._resolve_reply(payload)
+            return
+
+        if not self._running:
+            logger.warning("IPC publish while bus not running")
+
+        mailbox = self._mailbox(channel)
+        await self._admit(
+            mailbox, Envelope(mailbox.channel_id, 0, time.time(), payload)
+        )
+
+    async def publish_frame(self, frame):
+        """
+        Publish an encoded envelope received from another process.
+        Raises EnvelopeError for a malformed frame or a channel id that
+        no frame has named yet.
+        """
+        env = decode(frame)
+        channel = known_channel(env.channel_id)
+        if channel is None:
+            raise EnvelopeError(f"unknown IPC channel id {env.channel_id}")
+        if not self._running:
+            logger.warning("IPC publish while bus not running")
+
+        await self._admit(self._mailbox(channel), env, renumber=False)
+
+    async def _admit(self, mailbox: _Mailbox, env: Envelope, renumber: bool = True):
+        if mailbox.policy != POLICY_BLOCK or not (mailbox.waiters or mailbox.full()):
+            self._enqueue(mailbox, env, renumber)
+            return
+
+        # Queue behind publishers already waiting, even if there is room
+        # now, so a later publish cannot overtake an earlier one.
+        mailbox.blocked += 1
+        loop = asyncio.get_running_loop()
+        waiter = loop.create_future()
+        mailbox.waiters.append(waiter)
+        try:
+            while True:
+                await waiter
+                if not mailbox.full() or mailbox.policy != POLICY_BLOCK:
+                    break
+                # Still full: stay at the head and wait for the next drain.
+                waiter = loop.create_future()
+                mailbox.waiters[0] = waiter
+            self._enqueue(mailbox, env, renumber)
+        finally:
+            mailbox.waiters.remove(waiter)
+            if not mailbox.full() or mailbox.policy != POLICY_BLOCK:
+                mailbox.wake()
+
+    def _enqueue(self, mailbox: _Mailbox, env: Envelope, renumber: bool):
+        # Frames from other processes keep their sender's seq unless the
+        # channel is journaled: journal offsets must be dense and local.
+        if renumber or mailbox.journal is not None:
+            mailbox.seq += 1
+            env.seq = mailbox.seq
+        if mailbox.journal is not None:
+            _journal(mailbox, env)
+
+        messages = mailbox.messages
+        if mailbox.full():
+            policy = mailbox.policy
+
+            if policy == POLICY_DROP_OLDEST:
+                messages.popleft()
+                mailbox.shard.pending -= 1
+                mailbox.dropped += 1
+
+            elif policy == POLICY_DROP_NEWEST:
+                mailbox.dropped += 1
+                return
+
+            elif policy == POLICY_COALESCE:
+                newest = messages[-1]
+                newest.body = env.body
+                newest.seq = env.seq
+                mailbox.coalesced += 1
+                return
+
+        messages.append(env)
+        mailbox.shard.pending += 1
+        _schedule(mailbox)
+
+    async def publish_many(self, channel: str, payloads: List[Any]):
+        """
+        Publish several payloads to one channel in a single enqueue.
+        Falls back to per-message admission when a bounded mailbox
+        cannot take the whole batch.
+        """
+        if not payloads:
+            return
+
+        mailbox = self._mailbox(channel)
+        capacity = mailbox.capacity
+
+        if capacity is not None and (
+            mailbox.waiters or len(mailbox.messages) + len(payloads) > capacity
+        ):
+            for payload in payloads:
+                await self.publish(channel, payload)
+            return
+
         if not self._running:
             logger.warning("IPC publish while bus not running")
-        await self._queue.put((channel, payload))
+
+        now = time.time()
+        cid = mailbox.channel_id
+        first = mailbox.seq + 1
+        envelopes = [
+            Envelope(cid, seq, now, payload)
+            for seq, payload in enumerate(payloads, first)
+        ]
+        if mailbox.journal is not None:
+            for env in envelopes:
+                _journal(mailbox, env)
+        mailbox.messages.extend(envelopes)
+        mailbox.seq += len(payloads)
+        mailbox.shard.pending += len(payloads)
+        _schedule(mailbox)
+
+    # -------------------------
+    # Request / Reply
+    # -------------------------
+
+    async def request(
+        self,
+        channel: str,
+        payload: Dict[str, Any],
+        timeout: Optional[float] = 5.0,
+    ) -> Any:
+        """
+        Publish a request and wait for its reply.
+
+        Raises asyncio.TimeoutError past the deadline and IPCRequestError
+        if the responder replied with an error, or at once when called
+        from a handler running on the shard that would deliver the
+        request. Cancelling the caller abandons the call; a late reply is
+        discarded.
+        """
+        shard = self._mailbox(channel).shard
+        if shard.task is not None and shard.task is asyncio.current_task():
+            raise IPCRequestError(
+                f"request on '{channel}' from a handler on its own shard "
+                f"({shard.index}) would never be delivered"
+            )
+
+        correlation_id, message = make_request(payload, timeout)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[correlation_id] = future
+
+        try:
+            await self.publish(channel, message)
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._pending.pop(correlation_id, None)
+
+    async def reply(
+        self,
+        request: Dict[str, Any],
+        result: Any = None,
+        error: Optional[str] = None,
+    ):
+        """
+        Answer a request received by a handler. No-op for plain messages.
+        """
+        routed = make_reply(request, result, error)
+        if routed is not None:
+            await self.publish(*routed)
+
+    def _resolve_reply(self, reply: Dict[str, Any]):
+        future = self._pending.get(reply.get(CORRELATION_ID))
+        if future is None or future.done():
+            logger.debug("IPC reply for unknown or finished request")
+            return
+
+        if "error" in reply:
+            future.set_exception(IPCRequestError(reply["error"]))
+        else:
+            future.set_result(reply.get("result"))
+
+    # -------------------------
+    # Backpressure
+    # -------------------------
+
+    def set_channel_limit(
+        self,
+        channel: str,
+        capacity: Optional[int],
+        policy: str = POLICY_BLOCK,
+    ):
+        """
+        Bound a channel's mailbox. capacity=None makes it unbounded again.
+        """
+        _check_limit(capacity, policy)
+        self._limits[channel] = (capacity, policy)
+
+        mailbox = self._mailboxes.get(channel)
+        if mailbox is not None:
+            mailbox.capacity = capacity
+            mailbox.policy = policy
+            mailbox.wake()
+
+    # -------------------------
+    # Journal
+    # -------------------------
+
+    def set_channel_journal(
+        self,
+        channel: str,
+        directory: str,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        retain_segments: Optional[int] = DEFAULT_RETAIN_SEGMENTS,
+    ) -> ChannelJournal:
+        """
+        Journal an exact channel name to directory (one directory per
+        channel). Sequence numbers continue from an existing journal.
+        """
+        if channel in self._journals:
+            raise ValueError(f"IPC channel '{channel}' is already journaled")
+
+        journal = ChannelJournal(directory, segment_bytes, retain_segments)
+        self._journals[channel] = journal
+
+        mailbox = self._mailbox(channel)
+        mailbox.journal = journal
+        mailbox.seq = max(mailbox.seq, journal.last_seq)
+        return journal
+
+    def last_seq(self, channel: str) -> int:
+        mailbox = self._mailboxes.get(channel)
+        return mailbox.seq if mailbox is not None else 0
+
+    async def _sync_journals(self):
+        while True:
+            await asyncio.sleep(self._journal_sync_interval)
+            journals = list(self._journals.values())
+            for journal in journals:
+                journal.flush()
+            if journals:
+                await asyncio.to_thread(_sync_all, journals)
+
+    def _close_journals(self):
+        for journal in self._journals.values():
+            try:
+                journal.close()
+            except OSError as e:
+                logger.error(f"IPC journal close failed: {e}")
+
+    def _mailbox(self, channel: str) -> _Mailbox:
+        mailbox = self._mailboxes.get(channel)
+        if mailbox is None:
+            capacity, policy = self._limits.get(channel, self._default_limit)
+            # Channels take shards round-robin as they first appear, so the
+            # first len(shards) channels never share a worker.
+            mailbox = _Mailbox(
+                channel,
+                self._shards[len(self._mailboxes) % len(self._shards)],
+                capacity,
+                policy,
+            )
+            mailbox.metrics = self.metrics.channel(channel)
+            self._mailboxes[channel] = mailbox
+        return mailbox
 
     # -------------------------
     # Event Loop
@@ -43,23 +682,200 @@ class IPCBus:
 
     async def run(self):
         self._running = True
-        logger.info("IPC bus online")
+        logger.info(f"IPC bus online ({len(self._shards)} shard(s))")
+
+        workers = []
+        for shard in self._shards:
+            shard.task = asyncio.create_task(self._worker(shard))
+            workers.append(shard.task)
+        syncer = asyncio.create_task(self._sync_journals())
 
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            syncer.cancel()
+            for shard in self._shards:
+                shard.task.cancel()
+                shard.task = None
+            for mailbox in self._mailboxes.values():
+                for timer in mailbox.timers.values():
+                    timer.cancel()
+                mailbox.timers.clear()
+            self._shutdown_executors()
+            self._close_journals()
+
+    async def _worker(self, shard: _Shard):
         while self._running:
-            channel, payload = await self._queue.get()
-            handlers = self._subscribers.get(channel, [])
-
-            if not handlers:
-                logger.debug(f"IPC drop (no subscribers): {channel}")
-                continue
-
-            for handler in handlers:
-                try:
-                    await handler(payload)
-                except Exception as e:
-                    logger.exception(
-                        f"IPC handler error on channel '{channel}': {e}"
+            mailbox = await shard.ready.get()
+            if mailbox is _STOP:
+                break
+
+            messages = mailbox.messages
+            count = min(len(messages), _DRAIN_LIMIT)
+
+            if count:
+                chunk = [messages.popleft() for _ in range(count)]
+                shard.pending -= count
+                mailbox.wake()
+
+                started = time.time()
+                if self.metrics.enabled:
+                    # One wait sample per chunk: its oldest message, which
+                    # waited longest.
+                    mailbox.metrics.wait.record(started - chunk[0].timestamp)
+                    mailbox.metrics.record_delivery(count, started)
+
+                await self._deliver(mailbox, chunk)
+                shard.record(chunk, started, time.time())
+
+            if mailbox.due:
+                await self._flush_due(mailbox)
+
+            if messages or mailbox.due:
+                shard.ready.put_nowait(mailbox)
+            else:
+                mailbox.scheduled = False
+
+    async def _deliver(self, mailbox: _Mailbox, chunk: List[Envelope]):
+        channel = mailbox.channel
+        subscriptions = self._subscribers.match(channel)
+
+        if not subscriptions:
+            logger.debug("IPC drop (no subscribers): {}", channel)
+            return
+
+        single = [sub for sub in subscriptions if sub.batch_size is None]
+        batched = [sub for sub in subscriptions if sub.batch_size is not None]
+
+        if single:
+            for env in chunk:
+                for sub in single:
+                    if env.seq > sub.after:
+                        await self._invoke(sub, mailbox, env.body)
+
+        if batched:
+            payloads = [env.body for env in chunk]
+            for sub in batched:
+                if sub.after >= chunk[0].seq:
+                    await self._buffer(
+                        mailbox, sub, [env.body for env in chunk if env.seq > sub.after]
                     )
+                else:
+                    await self._buffer(mailbox, sub, payloads)
+
+    async def _buffer(self, mailbox: _Mailbox, sub: _Subscription, payloads: List[Any]):
+        buffer = mailbox.batches.setdefault(sub, [])
+        buffer.extend(payloads)
+
+        size = sub.batch_size
+        while len(buffer) >= size:
+            batch = buffer[:size]
+            del buffer[:size]
+            await self._invoke(sub, mailbox, batch)
+
+        if not buffer:
+            timer = mailbox.timers.pop(sub, None)
+            if timer is not None:
+                timer.cancel()
+        elif sub.batch_wait <= 0:
+            batch = buffer[:]
+            buffer.clear()
+            await self._invoke(sub, mailbox, batch)
+        elif sub not in mailbox.timers:
+            mailbox.timers[sub] = asyncio.get_running_loop().call_later(
+                sub.batch_wait, _batch_due, mailbox, sub
+            )
+
+    async def _flush_due(self, mailbox: _Mailbox):
+        due = mailbox.due
+        mailbox.due = set()
+
+        for sub in due:
+            buffer = mailbox.batches.get(sub)
+            if buffer:
+                batch = buffer[:]
+                buffer.clear()
+                await self._invoke(sub, mailbox, batch)
+
+    async def _invoke(self, sub: _Subscription, mailbox: _Mailbox, arg: Any):
+        sub.countdown -= 1
+        timed = not sub.countdown
+        if timed:
+            sub.countdown = HANDLER_SAMPLE_EVERY
+            started = time.perf_counter()
+        try:
+            if sub.executor is None:
+                await sub.handler(arg)
+            else:
+                await asyncio.get_running_loop().run_in_executor(
+                    self._executor(sub.executor), sub.handler, arg
+                )
+        except Exception as e:
+            logger.exception(
+                f"IPC handler error on channel '{mailbox.channel}': {e}"
+            )
+
+        if timed:
+            elapsed = time.perf_counter() - started
+            mailbox.metrics.handler.record(elapsed)
+            sub.metrics.latency.record(elapsed)
+
+    def _executor(self, kind: str) -> Executor:
+        pool = self._executors.get(kind)
+        if pool is None:
+            if kind == EXECUTOR_PROCESS:
+                pool = ProcessPoolExecutor(max_workers=self._process_workers)
+            else:
+                pool = ThreadPoolExecutor(
+                    max_workers=self._thread_workers,
+                    thread_name_prefix="ipc-handler",
+                )
+            self._executors[kind] = pool
+        return pool
+
+    def _shutdown_executors(self):
+        for pool in self._executors.values():
+            pool.shutdown(wait=False, cancel_futures=True)
+        self._executors.clear()
+
+    # -------------------------
+    # Introspection
+    # -------------------------
+
+    def shard_stats(self) -> List[Dict[str, Any]]:
+        """
+        Per-shard queue depth and latency, for spotting head-of-line blocking.
+        """
+        return [shard.stats() for shard in self._shards]
+
+    def channel_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-channel depth, limit and drop / block / coalesce counters.
+        """
+        return {
+            channel: mailbox.stats()
+            for channel, mailbox in self._mailboxes.items()
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Full bus profile: per-channel queue state and metrics, per-shard
+        latency and the slowest handlers.
+        """
+        snapshot = self.metrics.snapshot()
+        for channel, stats in self.channel_stats().items():
+            snapshot["channels"].setdefault(channel, {}).update(stats)
+        snapshot["shards"] = self.shard_stats()
+        return snapshot
+
+    def dump_stats(self, path: str) -> None:
+        dump_snapshot(self.snapshot(), path)
+
+    async def _on_stats(self, message: Any):
+        if isinstance(message, dict) and CORRELATION_ID in message:
+            await self.reply(message, self.snapshot())
+        else:
+            await self.publish(STATS_SNAPSHOT_CHANNEL, self.snapshot())
 
     # -------------------------
     # Shutdown
@@ -68,3 +884,43 @@ class IPCBus:
     def stop(self):
         logger.info("IPC bus shutting down")
         self._running = False
+        for shard in self._shards:
+            shard.ready.put_nowait(_STOP)
+
+
+def _schedule(mailbox: _Mailbox) -> None:
+    if not mailbox.scheduled:
+        mailbox.scheduled = True
+        mailbox.shard.ready.put_nowait(mailbox)
+
+
+def _journal(mailbox: _Mailbox, env: Envelope) -> None:
+    # Encoding fails before the journal changes, so a bad payload only
+    # leaves a gap in its seqs; delivery goes ahead either way.
+    try:
+        mailbox.journal.append(env)
+    except (TypeError, ValueError) as e:
+        logger.error(
+            f"IPC journal: '{mailbox.channel}' seq {env.seq} not journaled: {e}"
+        )
+
+
+def _sync_all(journals: List[ChannelJournal]) -> None:
+    for journal in journals:
+        try:
+            journal.sync()
+        except OSError as e:
+            logger.error(f"IPC journal sync failed: {e}")
+
+
+def _batch_due(mailbox: _Mailbox, sub: _Subscription) -> None:
+    mailbox.timers.pop(sub, None)
+    mailbox.due.add(sub)
+    _schedule(mailbox)
+
+
+def _check_limit(capacity: Optional[int], policy: str) -> None:
+    if capacity is not None and capacity < 1:
+        raise ValueError("IPC channel capacity must be positive")
+    if policy not in OVERFLOW_POLICIES:
+        raise ValueError(f"unknown IPC overflow policy '{policy}'")
@@ -5,33 +5,122 @@ Kernel IPC Client
 
 Provides a safe, structured interface to kernel IPC.
 This module never bypasses capability checks.
+
+Until the kernel transport is wired in, channels are carried by local
+shared-memory rings (orchestrator.shm_ring): one ring per channel id, one
+writer and one reader per ring. Large payloads cross process boundaries
+with a single copy in and a single copy out.
+
+send_envelope() / recv_envelope() carry orchestrator.ipc_envelope frames,
+the format IPCBus and IPCBridge use; a raw body is written straight from
+the caller's buffer next to its header. The first envelope sent on each
+channel carries the channel name, so the reader can route its id.
 """
 
-from typing import Any
+from typing import Dict, Optional, Set
+
+from orchestrator.ipc_envelope import Envelope, decode, encode_parts
+from orchestrator.shm_ring import ShmRing
+
+# Default ring size for channels opened by this client.
+DEFAULT_CHANNEL_CAPACITY = 4 * 1024 * 1024
 
 
 class IPCClient:
-    def __init__(self):
-        # Initialize IPC transport (stub)
-        pass
+    def __init__(self, namespace: str = "superos"):
+        self._namespace = namespace
+        self._rings: Dict[int, ShmRing] = {}
+        # Channels whose name has been sent
+        self._named: Set[int] = set()
+
+    # -------------------------
+    # Channel setup
+    # -------------------------
+
+    def create_channel(self, channel_id: int, capacity: int = DEFAULT_CHANNEL_CAPACITY) -> None:
+        """
+        Create the backing region for a channel. The creator owns it and
+        unlinks it on close().
+        """
+        if channel_id in self._rings:
+            raise ValueError(f"IPC channel {channel_id} already open")
+        self._rings[channel_id] = ShmRing(
+            self._region_name(channel_id), capacity, create=True
+        )
+
+    def _ring(self, channel_id: int) -> ShmRing:
+        ring = self._rings.get(channel_id)
+        if ring is None:
+            ring = ShmRing(self._region_name(channel_id))
+            self._rings[channel_id] = ring
+        return ring
+
+    def _region_name(self, channel_id: int) -> str:
+        return f"{self._namespace}_ipc_{channel_id}"
 
-    def send(self, channel_id: int, payload: bytes) -> None:
+    # -------------------------
+    # Messaging
+    # -------------------------
+
+    def send(self, channel_id: int, payload: bytes, timeout: Optional[float] = None) -> None:
         """
         Send a message to a kernel-managed IPC channel.
+        Blocks while the channel is full (up to timeout seconds).
         """
         # kernel_ipc.send(channel_id, payload)
-        return
+        self._ring(channel_id).send(payload, timeout)
 
-    def recv(self, channel_id: int, max_len: int = 4096) -> bytes:
+    def recv(self, channel_id: int, max_len: int = 4096, timeout: Optional[float] = 0.0) -> bytes:
         """
         Receive a message from a kernel-managed IPC channel.
+        Returns b"" when no message is waiting (timeout=0).
+        A message longer than max_len is discarded and rejected (EMSGSIZE),
+        so the next recv() gets the message after it.
         """
         # return kernel_ipc.recv(channel_id, max_len)
-        return b""
+        ring = self._ring(channel_id)
+        if not ring.wait_readable(timeout):
+            return b""
+
+        length = ring.next_len()
+        if length > max_len:
+            ring.skip()
+            raise ValueError(
+                f"EMSGSIZE: {length} byte message exceeds max_len {max_len}"
+            )
+        return ring.recv()
+
+    def send_envelope(self, env: Envelope, timeout: Optional[float] = None) -> None:
+        """
+        Send an envelope on the channel named by its channel id.
+        """
+        cid = env.channel_id
+        named = cid in self._named
+        self._ring(cid).send_parts(encode_parts(env, with_name=not named), timeout)
+        if not named:
+            self._named.add(cid)
+
+    def recv_envelope(self, channel_id: int, timeout: Optional[float] = 0.0) -> Optional[Envelope]:
+        """
+        Receive the next envelope, or None when none is waiting (timeout=0).
+        """
+        frame = self._ring(channel_id).recv(timeout)
+        if frame is None:
+            return None
+        return decode(frame)
 
     def subscribe(self, channel_id: int) -> None:
         """
         Subscribe to IPC events (async / streaming).
         """
         # kernel_ipc.subscribe(channel_id)
-        return
+        self._ring(channel_id)
+
+    # -------------------------
+    # Teardown
+    # -------------------------
+
+    def close(self) -> None:
+        for ring in self._rings.values():
+            ring.close()
+        self._rings.clear()
@@ -0,0 +1,163 @@
+# orchestrator/ipc_envelope.py
+
+"""
+IPC Message Envelope
+
+The one message format shared by IPCBus, IPCBridge and IPCClient.
+
+Wire layout (little-endian, 28-byte header):
+    u8   version
+    u8   body kind (BODY_RAW / BODY_JSON)
+    u16  channel name length (0 = not included)
+    u32  channel id
+    u64  sequence number
+    f64  timestamp (wall clock, seconds)
+    u32  body length
+    ...  channel name (UTF-8), when included
+    ...  body
+
+Channel ids are a hash of the name, so a process can only map ids it has
+interned itself. A sender includes the name in the first frame it sends
+on a channel (encode_parts(with_name=True)); decode() checks it against
+the id and remembers it, and known_channel() tells receivers whether an
+id can be routed.
+
+Raw bodies (output chunks, build artifacts) are never re-encoded: decode()
+returns them as a memoryview over the frame, and encode_parts() hands the
+caller's buffer through untouched so a transport can write header and body
+without joining them first. Structured bodies (dicts) are JSON.
+"""
+
+import json
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+VERSION = 1
+
+BODY_RAW = 0
+BODY_JSON = 1
+
+HEADER = struct.Struct("<BBHIQdI")
+HEADER_SIZE = HEADER.size
+
+
+class EnvelopeError(ValueError):
+    """Raised for truncated or unsupported frames."""
+    pass
+
+
+@dataclass(slots=True)
+class Envelope:
+    channel_id: int
+    seq: int
+    timestamp: float
+    body: Any
+
+    @property
+    def channel(self) -> str:
+        return channel_name(self.channel_id)
+
+
+# -------------------------
+# Channel ids
+# -------------------------
+
+_ids: Dict[str, int] = {}
+_names: Dict[int, str] = {}
+
+
+def channel_id(name: str) -> int:
+    """
+    Stable 32-bit id for a channel name (same in every process).
+    """
+    cid = _ids.get(name)
+    if cid is None:
+        cid = zlib.crc32(name.encode())
+        known = _names.get(cid)
+        if known is not None and known != name:
+            raise EnvelopeError(f"channel id collision: '{name}' vs '{known}'")
+        _ids[name] = cid
+        _names[cid] = name
+    return cid
+
+
+def channel_name(cid: int) -> str:
+    """
+    Name for an id seen in this process, else its numeric form.
+    """
+    return _names.get(cid, str(cid))
+
+
+def known_channel(cid: int) -> Optional[str]:
+    """
+    Name for an id seen in this process, else None.
+    """
+    return _names.get(cid)
+
+
+def stamp(channel: str, seq: int, body: Any) -> Envelope:
+    return Envelope(channel_id(channel), seq, time.time(), body)
+
+
+# -------------------------
+# Codec
+# -------------------------
+
+def encode_parts(env: Envelope, with_name: bool = False) -> tuple[bytes, Any]:
+    """
+    Encode to (header, body). Raw bodies are returned as-is (no copy).
+    with_name appends the channel name to the header.
+    """
+    body = env.body
+    if isinstance(body, (bytes, bytearray, memoryview)):
+        kind = BODY_RAW
+        length = memoryview(body).nbytes
+    else:
+        kind = BODY_JSON
+        body = json.dumps(body, separators=(",", ":")).encode()
+        length = len(body)
+
+    name = _names[env.channel_id].encode() if with_name else b""
+    header = HEADER.pack(
+        VERSION, kind, len(name), env.channel_id, env.seq, env.timestamp, length
+    )
+    return header + name if name else header, body
+
+
+def encode(env: Envelope, with_name: bool = False) -> bytes:
+    return b"".join(encode_parts(env, with_name))
+
+
+def decode(frame) -> Envelope:
+    """
+    Decode a frame. Raw bodies are a memoryview into frame (no copy) and
+    stay valid only as long as frame does.
+    """
+    view = memoryview(frame)
+    if view.nbytes < HEADER_SIZE:
+        raise EnvelopeError("truncated envelope header")
+
+    version, kind, name_len, cid, seq, ts, length = HEADER.unpack_from(view)
+    if version != VERSION:
+        raise EnvelopeError(f"unsupported envelope version {version}")
+
+    start = HEADER_SIZE + name_len
+    end = start + length
+    if view.nbytes < end:
+        raise EnvelopeError("truncated envelope body")
+
+    if name_len and cid not in _names:
+        name = view[HEADER_SIZE:start].tobytes().decode("utf-8", "replace")
+        if channel_id(name) != cid:
+            raise EnvelopeError(f"channel name '{name}' does not match id {cid}")
+
+    body = view[start:end]
+    if kind == BODY_JSON:
+        body = json.loads(body.tobytes())
+    elif kind != BODY_RAW:
+        raise EnvelopeError(f"unknown envelope body kind {kind}")
+
+    return Envelope(cid, seq, ts, body)
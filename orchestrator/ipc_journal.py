@@ -0,0 +1,241 @@
+# orchestrator/ipc_journal.py
+#
+# IPC Journal
+#
+# Append-only, segmented log of one channel's envelopes, so a subscriber
+# that was away (a UI reconnecting, a service restarting) can resume from
+# the last sequence number it saw instead of re-querying every service.
+#
+# A journal directory holds segment files named after the first sequence
+# number they contain ("00000000000000000001.seg"). A segment is a run of
+# encoded envelopes (orchestrator.ipc_envelope); the envelope header
+# carries the body length, so frames need no extra framing and a torn
+# tail left by a crash is detected and cut off on open.
+#
+# append() only buffers. flush() writes the buffer in one call and sync()
+# fsyncs it; IPCBus flushes as it goes and syncs on a schedule, so a crash
+# loses at most one sync interval. Reads mmap the segments and step over
+# frames by header, decoding only the ones asked for.
+
+import bisect
+import mmap
+import os
+import threading
+from typing import Iterator, List, Optional
+
+from loguru import logger
+
+from orchestrator.ipc_envelope import (
+    HEADER,
+    HEADER_SIZE,
+    VERSION,
+    Envelope,
+    decode,
+    encode_parts,
+)
+
+SEGMENT_SUFFIX = ".seg"
+
+DEFAULT_SEGMENT_BYTES = 64 << 20
+DEFAULT_RETAIN_SEGMENTS = 8
+
+# Buffered bytes that force a write without waiting for flush().
+_FLUSH_BYTES = 256 << 10
+
+
+class ChannelJournal:
+    def __init__(
+        self,
+        directory: str,
+        segment_bytes: int = DEFAULT_SEGMENT_BYTES,
+        retain_segments: Optional[int] = DEFAULT_RETAIN_SEGMENTS,
+    ):
+        if segment_bytes <= HEADER_SIZE:
+            raise ValueError("IPC journal segments must hold at least one frame")
+        if retain_segments is not None and retain_segments < 1:
+            raise ValueError("IPC journal must retain at least one segment")
+
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.segment_bytes = segment_bytes
+        self.retain_segments = retain_segments
+        self.last_seq = 0
+
+        self._segments: List[int] = sorted(
+            int(name[:-len(SEGMENT_SUFFIX)])
+            for name in os.listdir(directory)
+            if name.endswith(SEGMENT_SUFFIX)
+        )
+        self._file = None
+        self._size = 0
+        self._buffer: List = []
+        self._buffered = 0
+        self._dirty = False
+
+        # Held while the active file is fsynced or swapped, since sync()
+        # runs off the event loop.
+        self._lock = threading.Lock()
+
+        self._recover()
+
+    @property
+    def first_seq(self) -> int:
+        return self._segments[0] if self._segments else self.last_seq + 1
+
+    # -------------------------
+    # Writing
+    # -------------------------
+
+    def append(self, env: Envelope) -> None:
+        header, body = encode_parts(env)
+        size = HEADER_SIZE + memoryview(body).nbytes
+
+        if self._file is None or (
+            self._size and self._size + size > self.segment_bytes
+        ):
+            self._rotate(env.seq)
+
+        self._buffer.append(header)
+        self._buffer.append(body)
+        self._size += size
+        self._buffered += size
+        self.last_seq = env.seq
+
+        if self._buffered >= _FLUSH_BYTES:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Write buffered frames to the active segment (no fsync).
+        """
+        if not self._buffer:
+            return
+        self._file.writelines(self._buffer)
+        self._file.flush()
+        self._buffer.clear()
+        self._buffered = 0
+        self._dirty = True
+
+    def sync(self) -> None:
+        """
+        fsync what flush() has written. Safe to call from another thread.
+        """
+        with self._lock:
+            if self._file is not None and self._dirty:
+                self._dirty = False
+                os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                os.fsync(self._file.fileno())
+                self._file.close()
+                self._file = None
+
+    def _rotate(self, first_seq: int) -> None:
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                os.fsync(self._file.fileno())
+                self._file.close()
+            self._file = open(self._path(first_seq), "ab")
+            self._dirty = False
+
+        self._segments.append(first_seq)
+        self._size = 0
+
+        if self.retain_segments is not None:
+            while len(self._segments) > self.retain_segments:
+                os.remove(self._path(self._segments.pop(0)))
+
+    def _recover(self) -> None:
+        if not self._segments:
+            return
+
+        first = self._segments[-1]
+        path = self._path(first)
+        end, last = _scan_segment(path)
+
+        if end < os.path.getsize(path):
+            logger.warning(f"IPC journal: truncating torn tail of {path}")
+            os.truncate(path, end)
+
+        self.last_seq = last if last is not None else first - 1
+        self._file = open(path, "ab")
+        self._size = end
+
+    # -------------------------
+    # Reading
+    # -------------------------
+
+    def read(self, from_seq: int = 0, to_seq: Optional[int] = None) -> Iterator[Envelope]:
+        """
+        Envelopes with from_seq <= seq <= to_seq, in order. Frames
+        appended after a segment is opened for reading are not seen;
+        read again from the next sequence number to catch up.
+        """
+        self.flush()
+
+        start = max(0, bisect.bisect_right(self._segments, from_seq) - 1)
+        for first in self._segments[start:]:
+            if to_seq is not None and first > to_seq:
+                return
+            yield from self._read_segment(first, from_seq, to_seq)
+
+    def _read_segment(
+        self,
+        first: int,
+        from_seq: int,
+        to_seq: Optional[int],
+    ) -> Iterator[Envelope]:
+        try:
+            f = open(self._path(first), "rb")
+        except FileNotFoundError:  # removed by retention while reading
+            return
+
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            if not size:
+                return
+            with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as view:
+                for start, seq, end in _frames(view, size):
+                    if seq < from_seq:
+                        continue
+                    if to_seq is not None and seq > to_seq:
+                        return
+                    # Slicing copies, so raw bodies outlive the mapping.
+                    yield decode(view[start:end])
+
+    def _path(self, first_seq: int) -> str:
+        return os.path.join(self.directory, f"{first_seq:020d}{SEGMENT_SUFFIX}")
+
+
+def _frames(buf, size: int) -> Iterator[tuple[int, int, int]]:
+    """
+    (start, seq, end) of each complete frame, stopping at the first
+    truncated or invalid one.
+    """
+    offset = 0
+    while offset + HEADER_SIZE <= size:
+        version, _, name_len, _, seq, _, length = HEADER.unpack_from(buf, offset)
+        end = offset + HEADER_SIZE + name_len + length
+        if version != VERSION or end > size:
+            return
+        yield offset, seq, end
+        offset = end
+
+
+def _scan_segment(path: str) -> tuple[int, Optional[int]]:
+    """
+    End offset of the last complete frame and its sequence number.
+    """
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return 0, None
+        with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as view:
+            end, last = 0, None
+            for _, seq, end in _frames(view, size):
+                last = seq
+            return end, last
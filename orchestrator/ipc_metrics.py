@@ -0,0 +1,163 @@
+# orchestrator/ipc_metrics.py
+#
+# IPC Metrics
+#
+# Always-on instrumentation for IPCBus: per-channel message rate, queue
+# wait and handler latency histograms, plus a table of the slowest
+# handlers. Recording is a handful of integer operations per delivered
+# chunk, plus a timed handler call once every HANDLER_SAMPLE_EVERY calls,
+# so it can stay enabled in production. Handler histograms therefore
+# count samples, not calls; ChannelMetrics.messages counts every message.
+#
+# Histograms use power-of-two microsecond buckets: bucket i holds samples
+# in [2^(i-1), 2^i) us. Percentiles are reported as the bucket's upper
+# bound, which is accurate to within 2x and never under-reports.
+
+import json
+import time
+from typing import Any, Dict, List
+
+_BUCKETS = 32  # up to ~35 minutes
+
+# Window over which a channel's message rate is measured.
+_RATE_WINDOW = 1.0
+
+# Slowest handlers reported by snapshot().
+_TOP_HANDLERS = 10
+
+# One handler call in this many is timed.
+HANDLER_SAMPLE_EVERY = 16
+
+
+class LatencyHistogram:
+    __slots__ = ("buckets", "count", "total", "max")
+
+    def __init__(self):
+        self.buckets = [0] * _BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        us = int(seconds * 1_000_000)
+        index = us.bit_length() if us > 0 else 0
+        self.buckets[index if index < _BUCKETS else _BUCKETS - 1] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, q: float) -> float:
+        """
+        Upper bound (seconds) of the bucket holding the q-th percentile.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, n in enumerate(self.buckets):
+            seen += n
+            if seen >= rank:
+                return min((1 << index) / 1_000_000, self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "avg_ms": self.total / (self.count or 1) * 1000.0,
+            "p50_ms": self.percentile(0.50) * 1000.0,
+            "p99_ms": self.percentile(0.99) * 1000.0,
+            "max_ms": self.max * 1000.0,
+        }
+
+
+class ChannelMetrics:
+    __slots__ = ("messages", "wait", "handler", "_window_start", "_window_count", "_rate")
+
+    def __init__(self):
+        self.messages = 0
+        self.wait = LatencyHistogram()
+        self.handler = LatencyHistogram()
+        self._window_start = time.time()
+        self._window_count = 0
+        self._rate = 0.0
+
+    def record_delivery(self, count: int, now: float) -> None:
+        self.messages += count
+        self._window_count += count
+        elapsed = now - self._window_start
+        if elapsed >= _RATE_WINDOW:
+            self._rate = self._window_count / elapsed
+            self._window_start = now
+            self._window_count = 0
+
+    def rate(self) -> float:
+        # Use the open window when no full window has closed yet, or when
+        # the channel went quiet and nothing has rolled the window since.
+        elapsed = time.time() - self._window_start
+        if elapsed >= _RATE_WINDOW or not self._rate:
+            return self._window_count / elapsed if elapsed > 0 else 0.0
+        return self._rate
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "messages": self.messages,
+            "rate_per_s": self.rate(),
+            "queue_wait": self.wait.snapshot(),
+            "handler": self.handler.snapshot(),
+        }
+
+
+class HandlerMetrics:
+    __slots__ = ("name", "channel", "latency")
+
+    def __init__(self, name: str, channel: str):
+        self.name = name
+        self.channel = channel
+        self.latency = LatencyHistogram()
+
+
+class BusMetrics:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._channels: Dict[str, ChannelMetrics] = {}
+        self._handlers: Dict[tuple[str, str], HandlerMetrics] = {}
+
+    def channel(self, name: str) -> ChannelMetrics:
+        metrics = self._channels.get(name)
+        if metrics is None:
+            metrics = self._channels[name] = ChannelMetrics()
+        return metrics
+
+    def handler(self, name: str, channel: str) -> HandlerMetrics:
+        key = (name, channel)
+        metrics = self._handlers.get(key)
+        if metrics is None:
+            metrics = self._handlers[key] = HandlerMetrics(name, channel)
+        return metrics
+
+    def slowest_handlers(self, limit: int = _TOP_HANDLERS) -> List[Dict[str, Any]]:
+        ranked = sorted(
+            (h for h in self._handlers.values() if h.latency.count),
+            key=lambda h: h.latency.percentile(0.99),
+            reverse=True,
+        )
+        return [
+            {"handler": h.name, "channel": h.channel, **h.latency.snapshot()}
+            for h in ranked[:limit]
+        ]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "channels": {
+                name: metrics.snapshot()
+                for name, metrics in self._channels.items()
+            },
+            "slowest_handlers": self.slowest_handlers(),
+            "handler_sample_every": HANDLER_SAMPLE_EVERY,
+        }
+
+
+def dump_snapshot(snapshot: Dict[str, Any], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"ts": time.time(), **snapshot}, f, indent=2, default=str)
@@ -0,0 +1,73 @@
+# orchestrator/ipc_rpc.py
+#
+# IPC Request / Reply
+#
+# Message conventions shared by IPCBus.request() and IPCBridge.request().
+#
+# A request is an ordinary dict payload published on the service's channel,
+# tagged with:
+#   correlation_id  unique id echoed back in the reply
+#   reply_to        channel the reply must be published on
+#   deadline        wall-clock time after which the caller stops waiting
+#
+# A reply is published on reply_to as:
+#   {"correlation_id": ..., "result": ...}  or
+#   {"correlation_id": ..., "error": "..."}
+#
+# Responders build replies with make_reply(); they may skip work for a
+# request whose deadline has already passed (see expired()).
+
+import time
+import uuid
+from typing import Any, Dict, Optional
+
+CORRELATION_ID = "correlation_id"
+REPLY_TO = "reply_to"
+DEADLINE = "deadline"
+
+# Default reply channel; every bus / bridge routes it to its pending calls.
+REPLY_CHANNEL = "ipc.reply"
+
+
+class IPCRequestError(Exception):
+    """Raised by request() when the responder replied with an error."""
+    pass
+
+
+def make_request(
+    payload: Dict[str, Any],
+    timeout: Optional[float],
+    reply_to: str = REPLY_CHANNEL,
+) -> tuple[str, Dict[str, Any]]:
+    correlation_id = uuid.uuid4().hex
+    message = dict(payload)
+    message[CORRELATION_ID] = correlation_id
+    message[REPLY_TO] = reply_to
+    message[DEADLINE] = None if timeout is None else time.time() + timeout
+    return correlation_id, message
+
+
+def make_reply(
+    request: Dict[str, Any],
+    result: Any = None,
+    error: Optional[str] = None,
+) -> tuple[str, Dict[str, Any]] | None:
+    """
+    Build (channel, reply) for a request, or None if the sender did not
+    ask for a reply.
+    """
+    correlation_id = request.get(CORRELATION_ID)
+    if correlation_id is None:
+        return None
+
+    reply: Dict[str, Any] = {CORRELATION_ID: correlation_id}
+    if error is not None:
+        reply["error"] = error
+    else:
+        reply["result"] = result
+    return request.get(REPLY_TO, REPLY_CHANNEL), reply
+
+
+def expired(request: Dict[str, Any]) -> bool:
+    deadline = request.get(DEADLINE)
+    return deadline is not None and time.time() > deadline
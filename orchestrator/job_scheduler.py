@@ -0,0 +1,451 @@
+# orchestrator/job_scheduler.py
+
+"""
+Job Scheduler (User Space)
+
+Admission control for runtime and build work (compilers, cargo, dotnet,
+test runs), so a burst of requests queues instead of oversubscribing the
+host.
+
+    global cap      at most max_jobs jobs run at once (default: CPUs);
+                    exempt_roles (default: RUNTIME_ROLE) are not counted,
+                    so long-running programs cannot starve builds
+    per-role caps   role_limits[role] bounds that role's running jobs;
+                    a capped role does not block other roles behind it
+    priority        jobs queue by their role's SchedulingPolicy.priority
+                    (higher first, strictly)
+    fair share      within a priority, the next job comes from the
+                    project with the fewest running jobs, ties going to
+                    the one served least recently, so one project's
+                    burst cannot monopolize the slots
+
+Every job reports its queue wait and run time: per job on "job.finished"
+(and recent()), and per role as histograms in stats(). Commands started
+through run_command() also get their role's host scheduling policy
+(see orchestrator.host_scheduler).
+
+The runtime services (services.runtimes) start compilers through
+run_command() as BUILD_ROLE, which collects their output, and programs
+through run_program() as RUNTIME_ROLE: a program inherits stdin and its
+output is published line by line on "job.stdout" / "job.stderr" as it
+arrives, {project, name, os_pid, line}.
+"""
+
+import asyncio
+import itertools
+import os
+import subprocess
+import time
+from collections import deque
+from typing import (
+    Any, Awaitable, Callable, Deque, Dict, Iterable, List, Mapping, Optional, Sequence,
+)
+
+from loguru import logger
+
+from orchestrator.ipc_bus import IPCBus
+from orchestrator.ipc_metrics import LatencyHistogram
+from orchestrator.process_manager import read_lines
+from orchestrator.scheduler import SchedulerPolicyEngine
+
+DEFAULT_HISTORY = 1000
+
+# Seconds to keep reading a program's pipes after it has exited.
+_DRAIN_TIMEOUT = 1.0
+
+# Roles of runtime service work (config/scheduler.yaml)
+BUILD_ROLE = "build_service"
+RUNTIME_ROLE = "runtime"
+
+
+class Job:
+    __slots__ = (
+        "job_id", "name", "project", "role", "priority",
+        "submitted", "started", "finished", "ok", "error",
+        "work", "future", "task",
+    )
+
+    def __init__(self, job_id: int, name: str, project: str, role: str, priority: int, work):
+        self.job_id = job_id
+        self.name = name
+        self.project = project
+        self.role = role
+        self.priority = priority
+        self.submitted = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.ok: Optional[bool] = None
+        self.error: Optional[str] = None
+        self.work = work
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        self.task: Optional[asyncio.Task] = None
+
+    def report(self) -> Dict[str, Any]:
+        started = self.started if self.started is not None else self.finished
+        return {
+            "job_id": self.job_id,
+            "name": self.name,
+            "project": self.project,
+            "role": self.role,
+            "priority": self.priority,
+            "wait_s": started - self.submitted,
+            "run_s": self.finished - started,
+            "ok": self.ok,
+            "error": self.error,
+        }
+
+
+class _RoleStats:
+    __slots__ = ("running", "queued", "completed", "wait", "run")
+
+    def __init__(self):
+        self.running = 0
+        self.queued = 0
+        self.completed = 0
+        self.wait = LatencyHistogram()
+        self.run = LatencyHistogram()
+
+
+class JobScheduler:
+    def __init__(
+        self,
+        policies: SchedulerPolicyEngine,
+        max_jobs: Optional[int] = None,
+        role_limits: Optional[Mapping[str, int]] = None,
+        ipc: Optional[IPCBus] = None,
+        history: int = DEFAULT_HISTORY,
+        exempt_roles: Iterable[str] = (RUNTIME_ROLE,),
+    ):
+        self.policies = policies
+        self.ipc = ipc
+        # Roles outside the global cap; only their role_limits bound them
+        self.exempt_roles = frozenset(exempt_roles)
+
+        self._ids = itertools.count(1)
+        # priority -> project -> queued jobs
+        self._queues: Dict[int, Dict[str, Deque[Job]]] = {}
+        # Running jobs that count against max_jobs
+        self._running = 0
+        self._project_running: Dict[str, int] = {}
+        self._project_served: Dict[str, int] = {}
+        self._dispatches = itertools.count(1)
+        self._roles: Dict[str, _RoleStats] = {}
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=history)
+
+        self.max_jobs = 1
+        self.role_limits: Dict[str, int] = {}
+        self.set_limits(max_jobs or os.cpu_count() or 1, role_limits or {})
+
+    def set_limits(
+        self,
+        max_jobs: Optional[int] = None,
+        role_limits: Optional[Mapping[str, int]] = None,
+    ) -> None:
+        """
+        Change caps; queued jobs start as soon as the new caps allow.
+        """
+        if max_jobs is not None:
+            if max_jobs < 1:
+                raise ValueError("max_jobs must be positive")
+            self.max_jobs = max_jobs
+        if role_limits is not None:
+            if any(limit < 1 for limit in role_limits.values()):
+                raise ValueError("role limits must be positive")
+            self.role_limits = dict(role_limits)
+        self._dispatch()
+
+    # -------------------------
+    # Submission
+    # -------------------------
+
+    def submit(
+        self,
+        project: str,
+        role: str,
+        work: Callable[[], Awaitable[Any]],
+        name: str = "job",
+        priority: Optional[int] = None,
+    ) -> asyncio.Future:
+        """
+        Queue work (a coroutine function) and return a future for its
+        result. Cancelling the future dequeues or cancels the job.
+        """
+        if priority is None:
+            priority = self.policies.policy_for_role(role).priority
+        job = Job(next(self._ids), name, project, role, priority, work)
+
+        self._queues.setdefault(priority, {}).setdefault(project, deque()).append(job)
+        self._role(role).queued += 1
+        job.future.add_done_callback(lambda _, job=job: self._on_future_done(job))
+
+        self._dispatch()
+        return job.future
+
+    async def run(
+        self,
+        project: str,
+        role: str,
+        work: Callable[[], Awaitable[Any]],
+        name: str = "job",
+        priority: Optional[int] = None,
+    ) -> Any:
+        return await self.submit(project, role, work, name, priority)
+
+    async def run_command(
+        self,
+        project: str,
+        role: str,
+        argv: Sequence[str],
+        cwd: Optional[str] = None,
+        name: Optional[str] = None,
+        check: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Run a command as a job. Returns returncode, stdout and stderr;
+        with check, a non-zero exit raises subprocess.CalledProcessError.
+        """
+
+        async def work():
+            child = await self._exec(role, argv, cwd, asyncio.subprocess.DEVNULL)
+            try:
+                stdout, stderr = await child.communicate()
+            finally:
+                await self._reap(child)
+            result = {
+                "returncode": child.returncode,
+                "stdout": stdout.decode("utf-8", "replace"),
+                "stderr": stderr.decode("utf-8", "replace"),
+            }
+            if check and child.returncode != 0:
+                raise subprocess.CalledProcessError(
+                    child.returncode, list(argv), result["stdout"], result["stderr"]
+                )
+            return result
+
+        return await self.run(project, role, work, name or os.path.basename(argv[0]))
+
+    async def run_program(
+        self,
+        project: str,
+        argv: Sequence[str],
+        cwd: Optional[str] = None,
+        name: Optional[str] = None,
+        role: str = RUNTIME_ROLE,
+    ) -> Dict[str, Any]:
+        """
+        Run a long-lived program (an app, a game) as a job. stdin is
+        inherited and output is streamed to "job.stdout" / "job.stderr"
+        instead of buffered. Returns the returncode once it exits.
+        """
+        name = name or os.path.basename(argv[0])
+
+        async def work():
+            child = await self._exec(role, argv, cwd, None)
+            pumps = [
+                asyncio.create_task(self._pump(child.stdout, "job.stdout", project, name, child.pid)),
+                asyncio.create_task(self._pump(child.stderr, "job.stderr", project, name, child.pid)),
+            ]
+            try:
+                returncode = await child.wait()
+                # A grandchild still holding the pipes must not hold the job
+                await asyncio.wait(pumps, timeout=_DRAIN_TIMEOUT)
+            finally:
+                for pump in pumps:
+                    pump.cancel()
+                await self._reap(child)
+            return {"returncode": returncode}
+
+        return await self.run(project, role, work, name)
+
+    async def _exec(self, role: str, argv: Sequence[str], cwd: Optional[str], stdin):
+        child = await asyncio.create_subprocess_exec(
+            *argv,
+            cwd=cwd,
+            stdin=stdin,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        if self.policies.host is not None:
+            self.policies.host.apply(child.pid, self.policies.policy_for_role(role))
+        return child
+
+    async def _reap(self, child: asyncio.subprocess.Process) -> None:
+        # Kill a child whose job was cancelled, and drop its host policy.
+        try:
+            if child.returncode is None:
+                child.kill()
+                await child.wait()
+        finally:
+            if self.policies.host is not None:
+                self.policies.host.release(child.pid)
+
+    async def _pump(
+        self,
+        stream: asyncio.StreamReader,
+        channel: str,
+        project: str,
+        name: str,
+        os_pid: int,
+    ) -> None:
+        async for lines in read_lines(stream):
+            if self.ipc is not None:
+                await self.ipc.publish_many(channel, [
+                    {"project": project, "name": name, "os_pid": os_pid, "line": line}
+                    for line in lines
+                ])
+
+    # -------------------------
+    # Dispatch
+    # -------------------------
+
+    def _dispatch(self) -> None:
+        while True:
+            job = self._next()
+            if job is None:
+                return
+            self._start(job)
+
+    def _next(self) -> Optional[Job]:
+        """
+        Pop the next runnable job: highest priority, then the project
+        with the fewest running jobs, then the least recently served.
+        Jobs whose role is at its cap, or that count against a full
+        global cap, are skipped, not waited on.
+        """
+        role_limits = self.role_limits
+        exempt = self.exempt_roles
+        full = self._running >= self.max_jobs
+        for priority in sorted(self._queues, reverse=True):
+            projects = self._queues[priority]
+            best = None
+            best_key = None
+            for project, queue in projects.items():
+                for job in queue:
+                    if full and job.role not in exempt:
+                        continue
+                    limit = role_limits.get(job.role)
+                    if limit is None or self._role(job.role).running < limit:
+                        key = (
+                            self._project_running.get(project, 0),
+                            self._project_served.get(project, 0),
+                        )
+                        if best_key is None or key < best_key:
+                            best, best_key = job, key
+                        break
+
+            if best is not None:
+                queue = projects[best.project]
+                queue.remove(best)
+                if not queue:
+                    del projects[best.project]
+                    if not projects:
+                        del self._queues[priority]
+                return best
+        return None
+
+    def _start(self, job: Job) -> None:
+        job.started = time.time()
+        if job.role not in self.exempt_roles:
+            self._running += 1
+        self._project_running[job.project] = self._project_running.get(job.project, 0) + 1
+        self._project_served[job.project] = next(self._dispatches)
+
+        stats = self._role(job.role)
+        stats.queued -= 1
+        stats.running += 1
+        stats.wait.record(job.started - job.submitted)
+
+        job.task = asyncio.create_task(self._execute(job))
+
+    async def _execute(self, job: Job) -> None:
+        try:
+            result = await job.work()
+        except asyncio.CancelledError:
+            job.ok, job.error = False, "cancelled"
+        except Exception as e:
+            job.ok, job.error = False, f"{type(e).__name__}: {e}"
+            if not job.future.done():
+                job.future.set_exception(e)
+        else:
+            job.ok = True
+            if not job.future.done():
+                job.future.set_result(result)
+        finally:
+            await self._finish(job)
+
+    async def _finish(self, job: Job) -> None:
+        job.finished = time.time()
+        if job.role not in self.exempt_roles:
+            self._running -= 1
+        remaining = self._project_running[job.project] - 1
+        if remaining:
+            self._project_running[job.project] = remaining
+        else:
+            del self._project_running[job.project]
+
+        stats = self._role(job.role)
+        stats.running -= 1
+        stats.completed += 1
+        stats.run.record(job.finished - job.started)
+
+        self._dispatch()
+
+        report = job.report()
+        self._recent.append(report)
+        if not job.ok:
+            logger.warning(f"job {job.job_id} ({job.name}, {job.project}) failed: {job.error}")
+        if self.ipc is not None:
+            await self.ipc.publish("job.finished", report)
+
+    def _on_future_done(self, job: Job) -> None:
+        if not job.future.cancelled():
+            return
+        if job.task is not None:
+            job.task.cancel()
+            return
+
+        # Still queued: drop it
+        projects = self._queues.get(job.priority, {})
+        queue = projects.get(job.project)
+        if queue is not None and job in queue:
+            queue.remove(job)
+            if not queue:
+                del projects[job.project]
+                if not projects:
+                    self._queues.pop(job.priority, None)
+            self._role(job.role).queued -= 1
+
+    def _role(self, role: str) -> _RoleStats:
+        stats = self._roles.get(role)
+        if stats is None:
+            stats = self._roles[role] = _RoleStats()
+        return stats
+
+    # -------------------------
+    # Introspection
+    # -------------------------
+
+    def recent(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Reports of the most recently finished jobs, newest first.
+        """
+        return list(itertools.islice(reversed(self._recent), limit))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "max_jobs": self.max_jobs,
+            "running": self._running,
+            "queued": sum(stats.queued for stats in self._roles.values()),
+            "projects_running": dict(self._project_running),
+            "roles": {
+                role: {
+                    "limit": self.role_limits.get(role),
+                    "running": stats.running,
+                    "queued": stats.queued,
+                    "completed": stats.completed,
+                    "wait": stats.wait.snapshot(),
+                    "run": stats.run.snapshot(),
+                }
+                for role, stats in self._roles.items()
+            },
+        }
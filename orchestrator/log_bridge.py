@@ -0,0 +1,120 @@
+# orchestrator/log_bridge.py
+
+"""
+One Logging Pipeline
+
+Orchestrator modules log through loguru, the UI and third-party libraries
+through stdlib logging, and the central Logger records everything else.
+unify_logging() points the first two at the central Logger, so every
+event becomes one LogRecord and is written by the Logger's single
+background sink instead of being formatted and written by each stack.
+
+Level filtering happens before formatting on every path: loguru and
+stdlib check their configured level before building a message (loguru
+only formats "{}" arguments for enabled levels), and Logger.log() drops
+records below its own threshold before creating anything.
+"""
+
+import logging
+from typing import Any, Dict
+
+from loguru import logger as loguru_logger
+
+from orchestrator.logger import Logger
+
+# Loguru and stdlib level names -> Logger levels.
+_LEVEL_NAMES: Dict[str, str] = {
+    "TRACE": "DEBUG",
+    "DEBUG": "DEBUG",
+    "INFO": "INFO",
+    "SUCCESS": "INFO",
+    "WARNING": "WARN",
+    "WARN": "WARN",
+    "ERROR": "ERROR",
+    "CRITICAL": "CRITICAL",
+}
+
+# Logger levels -> stdlib numeric levels (loguru accepts the names).
+_STDLIB_LEVELS: Dict[str, int] = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARN": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL,
+}
+
+
+class CentralLogHandler(logging.Handler):
+    """
+    stdlib logging handler that forwards to the central Logger.
+    """
+
+    def __init__(self, central: Logger, level: int = logging.NOTSET):
+        super().__init__(level)
+        self.central = central
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            message = record.getMessage()
+            if record.exc_info:
+                message += "\n" + logging.Formatter().formatException(record.exc_info)
+            self.central.log(
+                record.name,
+                _LEVEL_NAMES.get(record.levelname, record.levelname),
+                message,
+            )
+        except Exception:
+            self.handleError(record)
+
+
+def bridge_loguru(central: Logger, level: str = "INFO") -> int:
+    """
+    Replace loguru's handlers with one that forwards to central.
+    Returns the loguru handler id.
+    """
+
+    def forward(message: Any) -> None:
+        record = message.record
+        central.log(
+            record["name"] or "loguru",
+            _LEVEL_NAMES.get(record["level"].name, record["level"].name),
+            # Includes the traceback for logger.exception().
+            str(message).rstrip("\n"),
+        )
+
+    loguru_logger.remove()
+    return loguru_logger.add(
+        forward,
+        level=_loguru_level(level),
+        format="{message}",
+        backtrace=False,
+        diagnose=False,
+    )
+
+
+def bridge_stdlib(central: Logger, level: str = "INFO") -> CentralLogHandler:
+    """
+    Replace the stdlib root logger's handlers with one that forwards
+    to central.
+    """
+    handler = CentralLogHandler(central)
+    root = logging.getLogger()
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+        existing.close()
+    root.addHandler(handler)
+    root.setLevel(_STDLIB_LEVELS[level])
+    return handler
+
+
+def unify_logging(central: Logger, level: str = "INFO") -> None:
+    """
+    Route loguru and stdlib logging into central at level and above.
+    """
+    central.set_level(level)
+    bridge_loguru(central, level)
+    bridge_stdlib(central, level)
+
+
+def _loguru_level(level: str) -> str:
+    return "WARNING" if level == "WARN" else level
@@ -0,0 +1,189 @@
+# orchestrator/log_limits.py
+
+"""
+Log Rate Limiting
+
+Keeps log volume bounded during event storms (runtime output piped into
+logs, per-message debug lines under load) without hiding that they
+happened.
+
+Limits apply per source and/or per message template, where a template is
+the message with digit runs collapsed ("pid 12 exited" and "pid 40
+exited" are the same template). Each limit is either a token bucket
+(rate per second, burst) or 1-in-N sampling.
+
+Suppressed messages are counted per source and template. The Logger asks
+for summaries once summary_interval has passed since the first
+suppression (on its next record, or from its summary timer) and records
+one "suppressed N similar messages" line for each.
+
+A limiter is shared by every thread that logs; its own lock guards the
+limiters and the suppression counts.
+"""
+
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+_DIGITS = re.compile(r"\d+")
+
+# Distinct templates tracked before state is reset, so unbounded message
+# variety cannot grow memory.
+_MAX_KEYS = 4096
+
+# Records at or above this severity (orchestrator.logger.LEVELS, ERROR)
+# are never limited.
+DEFAULT_EXEMPT_SEVERITY = 40
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "stamp")
+
+    def __init__(self, rate: float, burst: float, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.stamp = now
+
+    def allow(self, now: float) -> bool:
+        tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+        if tokens >= 1.0:
+            self.tokens = tokens - 1.0
+            return True
+        self.tokens = tokens
+        return False
+
+
+class EveryN:
+    __slots__ = ("n", "seen")
+
+    def __init__(self, n: int):
+        self.n = n
+        self.seen = 0
+
+    def allow(self, now: float) -> bool:
+        seen = self.seen
+        self.seen = seen + 1
+        return seen % self.n == 0
+
+
+class _Policy:
+    __slots__ = ("rate", "burst", "every")
+
+    def __init__(self, rate: Optional[float], burst: Optional[float], every: Optional[int]):
+        if (rate is None) == (every is None):
+            raise ValueError("log limit needs exactly one of rate or every")
+        if rate is not None and rate <= 0:
+            raise ValueError("log limit rate must be positive")
+        if every is not None and every < 1:
+            raise ValueError("log limit every must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else rate
+        self.every = every
+
+    def make(self, now: float):
+        if self.every is not None:
+            return EveryN(self.every)
+        return TokenBucket(self.rate, max(1.0, self.burst), now)
+
+
+class LogLimiter:
+    def __init__(
+        self,
+        summary_interval: float = 10.0,
+        exempt_severity: int = DEFAULT_EXEMPT_SEVERITY,
+    ):
+        self.summary_interval = summary_interval
+        self.exempt_severity = exempt_severity
+
+        # Time at which pending summaries are due; inf while none are.
+        self.next_summary = float("inf")
+
+        self._source_policies: Dict[str, _Policy] = {}
+        self._sources: Dict[str, object] = {}
+        self._template_policy: Optional[_Policy] = None
+        self._templates: Dict[Tuple[str, str], object] = {}
+        self._suppressed: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def limit_source(
+        self,
+        source: str,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        every: Optional[int] = None,
+    ) -> None:
+        """
+        Limit all messages from source: rate/burst token bucket, or keep
+        one in every N.
+        """
+        policy = _Policy(rate, burst, every)
+        with self._lock:
+            self._source_policies[source] = policy
+            self._sources.pop(source, None)
+
+    def limit_templates(
+        self,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        every: Optional[int] = None,
+    ) -> None:
+        """
+        Limit each distinct (source, template) pair independently.
+        """
+        policy = _Policy(rate, burst, every)
+        with self._lock:
+            self._template_policy = policy
+            self._templates.clear()
+
+    def admit(self, source: str, severity: int, message: str, now: float) -> bool:
+        if severity >= self.exempt_severity:
+            return True
+
+        with self._lock:
+            limiter = self._sources.get(source)
+            if limiter is None:
+                policy = self._source_policies.get(source)
+                if policy is not None:
+                    limiter = self._sources[source] = policy.make(now)
+            if limiter is not None and not limiter.allow(now):
+                self._suppress(source, _template(message), now)
+                return False
+
+            if self._template_policy is not None:
+                key = (source, _template(message))
+                limiter = self._templates.get(key)
+                if limiter is None:
+                    if len(self._templates) >= _MAX_KEYS:
+                        self._templates.clear()
+                    limiter = self._templates[key] = self._template_policy.make(now)
+                if not limiter.allow(now):
+                    self._suppress(*key, now)
+                    return False
+
+        return True
+
+    def drain(self) -> List[Tuple[str, str, int]]:
+        """
+        (source, template, count) for everything suppressed since the
+        last drain.
+        """
+        with self._lock:
+            pending = [(source, template, n) for (source, template), n in self._suppressed.items()]
+            self._suppressed.clear()
+            self.next_summary = float("inf")
+        return pending
+
+    def _suppress(self, source: str, template: str, now: float) -> None:
+        # Called with _lock held
+        key = (source, template)
+        if key not in self._suppressed and len(self._suppressed) >= _MAX_KEYS:
+            key = (source, "*")
+        self._suppressed[key] = self._suppressed.get(key, 0) + 1
+        if self.next_summary == float("inf"):
+            self.next_summary = now + self.summary_interval
+
+
+def _template(message: str) -> str:
+    return _DIGITS.sub("#", message)
@@ -0,0 +1,168 @@
+# orchestrator/log_sink.py
+
+"""
+Rotating File Sink for the Log Aggregator
+
+Records are handed over with emit(), which only appends to an in-memory
+queue. A background thread wakes every flush_interval seconds, formats
+everything queued as JSON lines and writes it in one call, rotating the
+file once it passes max_bytes (system.jsonl -> system.jsonl.1 -> ...).
+
+Subclasses change the on-disk format by overriding encode() and, for
+per-file setup such as headers, _open().
+
+Callers never block on disk. If the writer falls behind by more than
+queue_limit records, the oldest queued records are discarded and counted
+in `dropped`. A record that cannot be encoded is logged, skipped and
+counted there too; no error stops the writer thread.
+"""
+
+import json
+import os
+import threading
+from collections import deque
+from typing import Any, Deque
+
+from loguru import logger
+
+DEFAULT_MAX_BYTES = 10 << 20
+DEFAULT_BACKUPS = 5
+
+
+class RotatingFileSink:
+    # Written at the start of every file, for self-describing formats.
+    FILE_HEADER = b""
+
+    def __init__(
+        self,
+        path: str,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backups: int = DEFAULT_BACKUPS,
+        flush_interval: float = 0.5,
+        queue_limit: int = 100_000,
+    ):
+        if max_bytes < 1:
+            raise ValueError("log sink max_bytes must be positive")
+        if backups < 0:
+            raise ValueError("log sink backups must not be negative")
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.written = 0
+
+        self._queue: Deque[Any] = deque(maxlen=queue_limit)
+        self._open()
+
+        self._closed = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="log-sink", daemon=True
+        )
+        self._thread.start()
+
+    # -------------------------
+    # Caller side
+    # -------------------------
+
+    def emit(self, record: Any) -> None:
+        """
+        Queue a record (anything with serialize()). Never blocks.
+        """
+        queue = self._queue
+        if len(queue) == queue.maxlen:
+            self.dropped += 1
+        queue.append(record)
+
+    def close(self) -> None:
+        """
+        Write out everything queued and stop the writer.
+        """
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._thread.join()
+        self._file.close()
+
+    # -------------------------
+    # Writer thread
+    # -------------------------
+
+    def encode(self, record: Any) -> bytes:
+        return (json.dumps(record.serialize(), default=str) + "\n").encode("utf-8")
+
+    def _open(self) -> None:
+        self._file = open(self.path, "ab")
+        self._size = self._file.tell()
+        if not self._size and self.FILE_HEADER:
+            self._file.write(self.FILE_HEADER)
+            # Readers reject a file without its header
+            self._file.flush()
+            self._size = len(self.FILE_HEADER)
+
+    def _run(self) -> None:
+        while not self._closed.wait(self.flush_interval):
+            self._drain()
+        self._drain()
+
+    def _drain(self) -> None:
+        try:
+            self._write_queued()
+        except Exception as e:
+            logger.error(f"log sink write to {self.path} failed: {e}")
+
+    def _write_queued(self) -> None:
+        queue = self._queue
+        chunk = []
+        chunk_size = 0
+        while queue:
+            record = queue.popleft()
+            try:
+                line = self.encode(record)
+            except Exception as e:
+                self.dropped += 1
+                logger.error(f"log sink dropped a record it could not encode: {e}")
+                continue
+            if self._size + chunk_size + len(line) > self.max_bytes:
+                self._write(chunk)
+                chunk, chunk_size = [], 0
+                if self._size > len(self.FILE_HEADER):
+                    self._rotate()
+            chunk.append(line)
+            chunk_size += len(line)
+        self._write(chunk)
+
+    def _write(self, lines) -> None:
+        if not lines:
+            return
+        data = b"".join(lines)
+        self._file.write(data)
+        self._file.flush()
+        self._size += len(data)
+        self.written += len(lines)
+
+    def _rotate(self) -> None:
+        self._file.close()
+        shift_backups(self.path, self.backups)
+        self._open()
+
+
+def shift_backups(path: str, backups: int) -> None:
+    """
+    path -> path.1 -> ... -> path.<backups>; the oldest falls off.
+    """
+    if not os.path.exists(path):
+        return
+    if not backups:
+        os.remove(path)
+        return
+    for i in range(backups - 1, 0, -1):
+        older = f"{path}.{i}"
+        if os.path.exists(older):
+            os.replace(older, f"{path}.{i + 1}")
+    os.replace(path, f"{path}.1")
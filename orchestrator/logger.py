@@ -10,44 +10,160 @@ Collects and normalizes logs from:
 
 This module does NOT generate authority.
 It only observes and records.
+
+Recent records are kept in a fixed-size in-memory ring for the UI; with a
+sink attached (see orchestrator.log_sink) every record is also persisted
+by a background writer. Records carry a raw float timestamp and are only
+formatted when serialized, so logging costs a record and two appends.
+
+Every record gets a sequence number. The ring is indexed by source and
+level, and by time through binary search (records arrive in time order),
+so query() serializes only the page it returns. Records come in from
+several threads (log_bridge, executors); one lock keeps sequence
+numbers, timestamps, ring, indexes and sink order in step.
+
+Records below the logger's level are dropped before anything is built;
+orchestrator.log_bridge routes loguru and stdlib logging through here.
+An optional orchestrator.log_limits.LogLimiter rate-limits noisy sources
+and templates and records what it suppressed. Summaries of suppressed
+messages are written when due by the next record or, if the source went
+quiet, by a timer thread; close() writes whatever is still pending.
 """
 
-from datetime import datetime
-from typing import Any, Dict, List
+import bisect
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Dict, List, Optional
+
+from orchestrator.log_limits import LogLimiter
+from orchestrator.log_sink import RotatingFileSink
+
+DEFAULT_CAPACITY = 10_000
+
+# Severity order; unknown levels rank as INFO.
+LEVELS: Dict[str, int] = {
+    "DEBUG": 10,
+    "INFO": 20,
+    "WARN": 30,
+    "ERROR": 40,
+    "CRITICAL": 50,
+}
 
 
 class LogRecord:
-    def __init__(self, source: str, level: str, message: str, meta: Dict[str, Any] | None = None):
-        self.timestamp = datetime.utcnow().isoformat()
-        self.source = source
-        self.level = level
+    # Sources and levels repeat endlessly; intern them so every record
+    # shares one string object per value.
+    __slots__ = ("seq", "timestamp", "source", "level", "message", "meta")
+
+    def __init__(
+        self,
+        source: str,
+        level: str,
+        message: str,
+        meta: Dict[str, Any] | None = None,
+        seq: int = 0,
+    ):
+        self.seq = seq
+        self.timestamp = time.time()
+        self.source = sys.intern(source)
+        self.level = sys.intern(level)
         self.message = message
-        self.meta = meta or {}
+        self.meta = meta or None
 
     def serialize(self) -> Dict[str, Any]:
         return {
-            "ts": self.timestamp,
+            "seq": self.seq,
+            "ts": format_timestamp(self.timestamp),
             "source": self.source,
             "level": self.level,
             "message": self.message,
-            "meta": self.meta,
+            "meta": self.meta or {},
         }
 
 
+def format_timestamp(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat()
+
+
 class Logger:
     """
-    Centralized, append-only logger.
+    Centralized logger: bounded, indexed in-memory ring plus optional sink.
     """
 
-    def __init__(self):
-        self._records: List[LogRecord] = []
+    def __init__(
+        self,
+        capacity: int = DEFAULT_CAPACITY,
+        sink: Optional[RotatingFileSink] = None,
+        level: str = "DEBUG",
+        limiter: Optional[LogLimiter] = None,
+    ):
+        if capacity < 1:
+            raise ValueError("logger capacity must be positive")
+        self.set_level(level)
+        self._capacity = capacity
+        self._ring: List[Optional[LogRecord]] = [None] * capacity
+        self._next = 0
+        self._by_source: Dict[str, List[int]] = {}
+        self._by_level: Dict[str, List[int]] = {}
+        self._sink = sink
+        self._limiter = limiter
+        self._lock = threading.Lock()
+
+        self._closed = threading.Event()
+        self._summarizer: Optional[threading.Thread] = None
+        if limiter is not None:
+            self._summarizer = threading.Thread(
+                target=self._summary_loop, name="log-summaries", daemon=True
+            )
+            self._summarizer.start()
+
+    def set_level(self, level: str) -> None:
+        """
+        Drop records below level before they are created.
+        """
+        if level not in LEVELS:
+            raise ValueError(f"unknown log level '{level}'")
+        self._threshold = LEVELS[level]
+
+    def enabled(self, level: str) -> bool:
+        """
+        Whether a record at level would be kept; guard costly messages.
+        """
+        return LEVELS.get(level, 20) >= self._threshold
 
     def log(self, source: str, level: str, message: str, meta: Dict[str, Any] | None = None) -> None:
-        record = LogRecord(source, level, message, meta)
-        self._records.append(record)
+        severity = LEVELS.get(level, 20)
+        if severity < self._threshold:
+            return
+
+        limiter = self._limiter
+        if limiter is not None:
+            now = time.time()
+            if now >= limiter.next_summary:
+                self._summarize()
+            if not limiter.admit(source, severity, message, now):
+                return
+
+        self._append(source, level, message, meta)
+
+    def _append(self, source: str, level: str, message: str, meta: Dict[str, Any] | None) -> None:
+        with self._lock:
+            seq = self._next
+            self._next = seq + 1
+            record = LogRecord(source, level, message, meta, seq)
+            self._ring[seq % self._capacity] = record
+
+            _index(self._by_source, record.source, seq, self._capacity)
+            _index(self._by_level, record.level, seq, self._capacity)
 
-        # Stub: forward to file / stdout / external sink
-        # print(record.serialize())
+            if self._sink is not None:
+                self._sink.emit(record)
+
+    def debug(self, source: str, message: str, meta: Dict[str, Any] | None = None) -> None:
+        self.log(source, "DEBUG", message, meta)
 
     def info(self, source: str, message: str, meta: Dict[str, Any] | None = None) -> None:
         self.log(source, "INFO", message, meta)
@@ -58,8 +174,124 @@ class Logger:
     def error(self, source: str, message: str, meta: Dict[str, Any] | None = None) -> None:
         self.log(source, "ERROR", message, meta)
 
+    # -------------------------
+    # Queries
+    # -------------------------
+
+    def query(
+        self,
+        source: Optional[str] = None,
+        level: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        after: Optional[int] = None,
+        limit: Optional[int] = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        Retained records matching every given filter, oldest first.
+
+        since/until bound the timestamp (inclusive, epoch seconds). Page
+        through results by passing the last returned "seq" as after.
+        """
+        lo = max(0, self._next - self._capacity)
+        hi = self._next
+        if after is not None:
+            lo = max(lo, after + 1)
+        if since is not None:
+            lo = self._seek(since, lo, hi, inclusive=True)
+        if until is not None:
+            hi = self._seek(until, lo, hi, inclusive=False)
+
+        checks = []
+        indexes = []
+        for value, index, attr in (
+            (source, self._by_source, "source"),
+            (level, self._by_level, "level"),
+        ):
+            if value is None:
+                continue
+            seqs = index.get(value)
+            if seqs is None:
+                return []
+            indexes.append(seqs)
+            checks.append((attr, value))
+
+        if indexes:
+            # Walk the shortest index, check the other filter per record.
+            seqs = min(indexes, key=len)
+            candidates = islice(seqs, bisect.bisect_left(seqs, lo), None)
+        else:
+            candidates = range(lo, hi)
+
+        page = []
+        for seq in candidates:
+            if seq >= hi or (limit is not None and len(page) >= limit):
+                break
+            record = self._ring[seq % self._capacity]
+            if all(getattr(record, attr) == value for attr, value in checks):
+                page.append(record.serialize())
+        return page
+
     def dump(self) -> List[Dict[str, Any]]:
         """
-        Dump all logs (for debugging / UI).
+        Dump all retained logs (for debugging). Prefer query() for the UI.
         """
-        return [r.serialize() for r in self._records]
+        return self.query(limit=None)
+
+    def _seek(self, ts: float, lo: int, hi: int, inclusive: bool) -> int:
+        """
+        First seq in [lo, hi) whose timestamp is >= ts (> ts if not
+        inclusive), or hi.
+        """
+        ring, capacity = self._ring, self._capacity
+        while lo < hi:
+            mid = (lo + hi) // 2
+            stamp = ring[mid % capacity].timestamp
+            if stamp < ts or (not inclusive and stamp == ts):
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _summarize(self) -> None:
+        for source, template, count in self._limiter.drain():
+            self._append(
+                source,
+                "WARN",
+                f"suppressed {count} similar messages: {template}",
+                {"suppressed": count, "template": template},
+            )
+
+    def _summary_loop(self) -> None:
+        limiter = self._limiter
+        while True:
+            wait = min(limiter.summary_interval, limiter.next_summary - time.time())
+            if self._closed.wait(max(0.0, wait)):
+                return
+            if time.time() >= limiter.next_summary:
+                self._summarize()
+
+    def close(self) -> None:
+        """
+        Record pending suppression summaries, then flush and stop the
+        sink, if any.
+        """
+        self._closed.set()
+        if self._summarizer is not None:
+            self._summarizer.join()
+        if self._limiter is not None:
+            self._summarize()
+        if self._sink is not None:
+            self._sink.close()
+
+
+def _index(index: Dict[str, List[int]], key: str, seq: int, capacity: int) -> None:
+    seqs = index.get(key)
+    if seqs is None:
+        index[key] = [seq]
+        return
+    seqs.append(seq)
+    # Entries older than the ring are dead; trim them once they could
+    # make up half the list.
+    if len(seqs) > 2 * capacity:
+        del seqs[:bisect.bisect_left(seqs, seq - capacity + 1)]
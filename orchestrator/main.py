@@ -10,15 +10,23 @@ If this process dies, the kernel must remain intact.
 """
 
 import asyncio
-import importlib
 from loguru import logger
 
+from orchestrator.capability_audit import AuditLogSink, CapabilityAudit
 from orchestrator.capability_enforcer import default_enforcer
+from orchestrator.policy_config import PolicyWatcher
 from orchestrator.process_control import ProcessControl
+from orchestrator.process_limits import ResourceLimits
 from orchestrator.scheduler import SchedulerPolicyEngine
+from orchestrator.host_scheduler import HostScheduler
 from orchestrator.logger import Logger
-from orchestrator.process_manager import ProcessManager
-from orchestrator.ipc_bus import IPCBus
+from orchestrator.log_bridge import unify_logging
+from orchestrator.log_limits import LogLimiter
+from orchestrator.log_sink import RotatingFileSink
+from orchestrator.process_manager import ProcessManager, ProcessState
+from orchestrator.process_pool import WarmPool
+from orchestrator.process_stats import ResourceSampler
+from orchestrator.ipc_bus import POLICY_COALESCE, POLICY_DROP_OLDEST, IPCBus
 
 
 async def main() -> None:
@@ -26,28 +34,56 @@ async def main() -> None:
     # Boot logging first
     # -------------------------
 
-    sys_logger = Logger()
+    log_limiter = LogLimiter()
+    log_limiter.limit_templates(rate=20, burst=100)
+
+    # JSON lines, kept apart from the plain-text logs/system.log
+    sys_logger = Logger(sink=RotatingFileSink("logs/system.jsonl"), limiter=log_limiter)
+    unify_logging(sys_logger, level="INFO")
     sys_logger.info("orchestrator", "orchestrator starting")
 
     # -------------------------
     # Core IPC spine
     # -------------------------
 
-    ipc = IPCBus()
+    ipc = IPCBus(shards=4)
+
+    # High-volume streams must not grow without bound or stall their
+    # publishers behind a slow subscriber: output keeps the newest lines,
+    # resource samples only the latest aggregate.
+    ipc.set_channel_limit("process.stdout", 10_000, POLICY_DROP_OLDEST)
+    ipc.set_channel_limit("process.stderr", 10_000, POLICY_DROP_OLDEST)
+    ipc.set_channel_limit("process.resources", 1, POLICY_COALESCE)
 
     # -------------------------
     # Policy & control layers
     # -------------------------
 
     enforcer = default_enforcer()
-    scheduler = SchedulerPolicyEngine()
+    enforcer.audit = CapabilityAudit(
+        sink=AuditLogSink("logs/capability_audit.binlog")
+    )
+    host_scheduler = HostScheduler()
+    scheduler = SchedulerPolicyEngine(host=host_scheduler)
+
+    policies = PolicyWatcher(enforcer, scheduler)
+    policies.load_all()
+    asyncio.create_task(policies.watch())
     proc_control = ProcessControl(enforcer)
 
     # -------------------------
     # Process lifecycle manager
     # -------------------------
 
-    process_manager = ProcessManager(ipc)
+    # Pre-started interpreters with the IPC client and config stack
+    # already imported; services are handed to one instead of booting.
+    warm_pool = WarmPool(size=2, preload=("loguru", "yaml", "ui.ipc_bridge"))
+    asyncio.create_task(warm_pool.fill())
+
+    process_manager = ProcessManager(ipc, pool=warm_pool, host=host_scheduler)
+
+    resource_sampler = ResourceSampler(process_manager, ipc)
+    asyncio.create_task(resource_sampler.run())
 
     sys_logger.info("orchestrator", "core managers online")
 
@@ -85,15 +121,67 @@ async def main() -> None:
     #         module.main()
 
     async def handle_process_spawn(payload):
-        module = importlib.import_module(payload["entrypoint"])
-
-        # UI process must block
-        if payload["name"] == "system-ui":
-            module.main()
-        else:
-            asyncio.create_task(asyncio.to_thread(module.main))
+        metadata = payload.get("metadata", {})
+        role = metadata.get("role", "user")
+        requested_caps = set(payload.get("capabilities", []))
+        try:
+            limits = ResourceLimits.from_spec(metadata.get("limits"))
+        except ValueError as e:
+            logger.error(f"spawn rejected, bad limits for {payload['entrypoint']}: {e}")
+            return
+
+        # Policy check; raises CapabilityViolation
+        allowed_caps = proc_control.spawn_process(
+            role=role,
+            entrypoint=payload["entrypoint"].encode(),
+            requested_caps=requested_caps,
+            limits=limits,
+        )
+
+        # Each entrypoint runs in its own interpreter; auto_restart
+        # services are supervised by the process manager
+        try:
+            pid = await process_manager.spawn(
+                name=payload.get("name", payload["entrypoint"]),
+                entrypoint=payload["entrypoint"],
+                capabilities=allowed_caps,
+                metadata=metadata,
+                limits=limits,
+            )
+        except ValueError as e:
+            logger.error(f"spawn rejected for {payload['entrypoint']}: {e}")
+            return
+
+        apply_scheduling(pid)
+
+    def apply_scheduling(pid):
+        # Apply the role's scheduling policy to the host process. Skip a
+        # child that has already exited: its end event may have run
+        # remove_policy() already, and a policy (and cgroup) assigned
+        # after that would never be removed.
+        proc = process_manager.get(pid)
+        if (
+            proc is not None
+            and proc.os_pid is not None
+            and proc.state is ProcessState.RUNNING
+        ):
+            scheduler.assign_role_policy(
+                pid,
+                proc.metadata.get("role", "user"),
+                foreground=proc.metadata.get("foreground"),
+                os_pid=proc.os_pid,
+            )
+
+    async def handle_process_restarted(payload):
+        apply_scheduling(payload["pid"])
+
+    async def handle_process_end(payload):
+        scheduler.remove_policy(payload["pid"])
 
     ipc.subscribe("process.spawn", handle_process_spawn)
+    ipc.subscribe("process.exited", handle_process_end)
+    ipc.subscribe("process.terminated", handle_process_end)
+    ipc.subscribe("process.restarted", handle_process_restarted)
 
     # -------------------------
     # BOOT EVENT (important)
@@ -0,0 +1,293 @@
+# orchestrator/policy_config.py
+
+"""
+Policy Configuration (User Space)
+
+Loads capability and scheduling policy from config/*.yaml into the
+compiled structures the orchestrator checks against, and reloads them
+when the files change, without a restart. A scheduler.yaml reload is
+applied to running processes too (see
+SchedulerPolicyEngine.replace_role_policies).
+
+The ML policy (ml_policy.yaml) is enforced by the ML service, which
+loads it with load_ml_policy() (see services.ml.policy); the same
+validation applies there.
+
+Every file is parsed and validated completely before anything is
+swapped, and each swap is a single assignment (see
+CapabilityEnforcer.replace_policies and
+SchedulerPolicyEngine.replace_role_policies), so in-flight checks see
+either the old policy or the new one. A file that fails to parse or
+validate is reported and the previous policy stays in force; an empty
+file leaves the built-in defaults.
+
+Files are watched by polling their stat signature, which costs one
+stat() per file per interval and needs no extra dependency.
+"""
+
+import asyncio
+import os
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Optional
+
+import yaml
+from loguru import logger
+
+from orchestrator.capability_enforcer import CapabilityEnforcer
+from orchestrator.scheduler import DEFAULT_POLICY, SchedulerPolicyEngine, SchedulingPolicy
+
+PERMISSIONS_FILE = "permissions.yaml"
+SCHEDULER_FILE = "scheduler.yaml"
+ML_POLICY_FILE = "ml_policy.yaml"
+
+_CAPABILITY_NAME = re.compile(r"^[A-Z][A-Z0-9_]*$")
+
+PRIORITY_RANGE = (-20, 20)
+
+# ML services analyze and suggest; they never act (see README).
+_FORBIDDEN_ML_ACTIONS = frozenset({
+    "execute",
+    "spawn",
+    "write_file",
+    "escalate",
+})
+
+
+class PolicyConfigError(ValueError):
+    """Raised when a policy file is malformed or fails validation."""
+    pass
+
+
+@dataclass(frozen=True)
+class MLPolicy:
+    allowed_actions: FrozenSet[str] = frozenset()
+    max_requests_per_minute: int = 0
+    max_context_bytes: int = 0
+
+    def permits(self, action: str) -> bool:
+        return action in self.allowed_actions
+
+
+# -------------------------
+# Parsing + validation
+# -------------------------
+
+def parse_permissions(doc: Dict[str, Any]) -> Dict[str, FrozenSet[str]]:
+    """
+    roles: {role: [CAPABILITY, ...]}
+    """
+    _check_keys(doc, {"roles"}, PERMISSIONS_FILE)
+    roles = doc.get("roles") or {}
+    if not isinstance(roles, dict):
+        raise PolicyConfigError(f"{PERMISSIONS_FILE}: 'roles' must be a mapping")
+
+    policies = {}
+    for role, capabilities in roles.items():
+        if not isinstance(capabilities, list):
+            raise PolicyConfigError(f"{PERMISSIONS_FILE}: role '{role}' needs a list")
+        for capability in capabilities:
+            if not isinstance(capability, str) or not _CAPABILITY_NAME.match(capability):
+                raise PolicyConfigError(
+                    f"{PERMISSIONS_FILE}: bad capability {capability!r} for role '{role}'"
+                )
+        policies[str(role)] = frozenset(capabilities)
+    return policies
+
+
+def parse_scheduler(doc: Dict[str, Any]) -> tuple[Dict[str, SchedulingPolicy], SchedulingPolicy]:
+    """
+    default: {priority, time_slice_ms, foreground}
+    roles: {role: {priority, time_slice_ms, foreground}}
+    """
+    _check_keys(doc, {"default", "roles"}, SCHEDULER_FILE)
+    default = _scheduling_policy("default", doc.get("default"), DEFAULT_POLICY)
+
+    roles = doc.get("roles") or {}
+    if not isinstance(roles, dict):
+        raise PolicyConfigError(f"{SCHEDULER_FILE}: 'roles' must be a mapping")
+
+    return {
+        str(role): _scheduling_policy(role, spec, default)
+        for role, spec in roles.items()
+    }, default
+
+
+def parse_ml_policy(doc: Dict[str, Any]) -> MLPolicy:
+    """
+    allowed_actions: [action, ...]
+    max_requests_per_minute: int
+    max_context_bytes: int
+    """
+    _check_keys(
+        doc,
+        {"allowed_actions", "max_requests_per_minute", "max_context_bytes"},
+        ML_POLICY_FILE,
+    )
+    actions = doc.get("allowed_actions") or []
+    if not isinstance(actions, list) or not all(isinstance(a, str) for a in actions):
+        raise PolicyConfigError(f"{ML_POLICY_FILE}: 'allowed_actions' must be a list of names")
+
+    forbidden = _FORBIDDEN_ML_ACTIONS.intersection(actions)
+    if forbidden:
+        raise PolicyConfigError(
+            f"{ML_POLICY_FILE}: ML services may not {', '.join(sorted(forbidden))}"
+        )
+
+    return MLPolicy(
+        allowed_actions=frozenset(actions),
+        max_requests_per_minute=_non_negative_int(doc, "max_requests_per_minute", ML_POLICY_FILE),
+        max_context_bytes=_non_negative_int(doc, "max_context_bytes", ML_POLICY_FILE),
+    )
+
+
+def load_ml_policy(path: str) -> MLPolicy:
+    """
+    ML policy from path; the empty policy (no actions) for a missing or
+    empty file. Raises PolicyConfigError when it fails validation.
+    """
+    if not os.path.exists(path):
+        logger.warning(f"policy file missing, ML services may not act: {path}")
+        return MLPolicy()
+    doc = read_yaml(path)
+    return parse_ml_policy(doc) if doc is not None else MLPolicy()
+
+
+def _scheduling_policy(role: Any, spec: Any, base: SchedulingPolicy) -> SchedulingPolicy:
+    if spec is None:
+        return base
+    if not isinstance(spec, dict):
+        raise PolicyConfigError(f"{SCHEDULER_FILE}: '{role}' must be a mapping")
+    _check_keys(spec, {"priority", "time_slice_ms", "foreground"}, f"{SCHEDULER_FILE} '{role}'")
+
+    priority = spec.get("priority", base.priority)
+    time_slice_ms = spec.get("time_slice_ms", base.time_slice_ms)
+    foreground = spec.get("foreground", base.foreground)
+
+    low, high = PRIORITY_RANGE
+    if not _is_int(priority) or not low <= priority <= high:
+        raise PolicyConfigError(f"{SCHEDULER_FILE}: '{role}' priority must be in {low}..{high}")
+    if not _is_int(time_slice_ms) or time_slice_ms < 1:
+        raise PolicyConfigError(f"{SCHEDULER_FILE}: '{role}' time_slice_ms must be positive")
+    if not isinstance(foreground, bool):
+        raise PolicyConfigError(f"{SCHEDULER_FILE}: '{role}' foreground must be true/false")
+
+    return SchedulingPolicy(priority, time_slice_ms, foreground)
+
+
+def _non_negative_int(doc: Dict[str, Any], key: str, where: str) -> int:
+    value = doc.get(key, 0)
+    if not _is_int(value) or value < 0:
+        raise PolicyConfigError(f"{where}: '{key}' must be a non-negative integer")
+    return value
+
+
+def _is_int(value: Any) -> bool:
+    # YAML booleans are ints to Python; reject "priority: yes".
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _check_keys(doc: Dict[str, Any], allowed: set, where: str) -> None:
+    unknown = set(doc) - allowed
+    if unknown:
+        raise PolicyConfigError(f"{where}: unknown keys {sorted(unknown)}")
+
+
+def read_yaml(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Parsed document, or None for an empty file.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            doc = yaml.safe_load(f)
+        except yaml.YAMLError as e:
+            raise PolicyConfigError(f"{os.path.basename(path)}: {e}") from e
+    if doc is None:
+        return None
+    if not isinstance(doc, dict):
+        raise PolicyConfigError(f"{os.path.basename(path)}: top level must be a mapping")
+    return doc
+
+
+# -------------------------
+# Loading + watching
+# -------------------------
+
+class PolicyWatcher:
+    def __init__(
+        self,
+        enforcer: CapabilityEnforcer,
+        scheduler: SchedulerPolicyEngine,
+        config_dir: str = "config",
+        interval: float = 1.0,
+    ):
+        self.enforcer = enforcer
+        self.scheduler = scheduler
+        self.config_dir = config_dir
+        self.interval = interval
+
+        self._appliers: Dict[str, Callable[[Dict[str, Any]], None]] = {
+            PERMISSIONS_FILE: self._apply_permissions,
+            SCHEDULER_FILE: self._apply_scheduler,
+        }
+        self._signatures: Dict[str, Optional[tuple]] = {}
+
+    def load_all(self) -> None:
+        """
+        Load every policy file. Raises PolicyConfigError on the first
+        invalid one, so a bad config stops boot instead of running with
+        defaults.
+        """
+        for name in self._appliers:
+            self._signatures[name] = self._signature(name)
+            self._load(name)
+
+    def reload_changed(self) -> list[str]:
+        """
+        Reload files whose stat signature changed. Invalid files are
+        logged and the policy they would replace stays active.
+        """
+        reloaded = []
+        for name in self._appliers:
+            signature = self._signature(name)
+            if signature == self._signatures.get(name):
+                continue
+            self._signatures[name] = signature
+
+            try:
+                self._load(name)
+            except (OSError, PolicyConfigError) as e:
+                logger.error(f"policy reload rejected, keeping previous: {e}")
+                continue
+            logger.info(f"policy reloaded: {name}")
+            reloaded.append(name)
+        return reloaded
+
+    async def watch(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            self.reload_changed()
+
+    def _load(self, name: str) -> None:
+        path = os.path.join(self.config_dir, name)
+        if not os.path.exists(path):
+            logger.warning(f"policy file missing, using built-in defaults: {path}")
+            return
+        doc = read_yaml(path)
+        if doc is None:
+            logger.info(f"policy file empty, using built-in defaults: {path}")
+            return
+        self._appliers[name](doc)
+
+    def _apply_permissions(self, doc: Dict[str, Any]) -> None:
+        self.enforcer.replace_policies(parse_permissions(doc))
+
+    def _apply_scheduler(self, doc: Dict[str, Any]) -> None:
+        self.scheduler.replace_role_policies(*parse_scheduler(doc))
+
+    def _signature(self, name: str) -> Optional[tuple]:
+        try:
+            st = os.stat(os.path.join(self.config_dir, name))
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
@@ -7,8 +7,9 @@ This module manages process lifecycles from user space.
 It never executes code directly and never grants authority.
 """
 
-from typing import List, Set
+from typing import List, Optional, Set
 from orchestrator.capability_enforcer import CapabilityEnforcer, CapabilityViolation
+from orchestrator.process_limits import ResourceLimits
 
 
 class ProcessControl:
@@ -20,9 +21,11 @@ class ProcessControl:
         role: str,
         entrypoint: bytes,
         requested_caps: Set[str],
-    ) -> None:
+        limits: Optional[ResourceLimits] = None,
+    ) -> Set[str]:
         """
-        Request the kernel to spawn a process.
+        Request the kernel to spawn a process, optionally under memory /
+        CPU / pid limits. Returns the capabilities it may hold.
         """
         allowed_caps = self.enforcer.filter(role, requested_caps)
 
@@ -30,14 +33,14 @@ class ProcessControl:
             raise CapabilityViolation("no allowed capabilities for process")
 
         # IPC / syscall bridge stub
-        # kernel_syscall.spawn(entrypoint, allowed_caps)
-        return
+        # kernel_syscall.spawn(entrypoint, allowed_caps, limits)
+        return allowed_caps
 
     def kill_process(self, role: str, pid: int) -> None:
         """
         Request termination of a process.
         """
-        self.enforcer.check(role, "PROC_KILL")
+        self.enforcer.check(role, "PROC_KILL", pid)
 
         # kernel_syscall.kill(pid)
         return
@@ -0,0 +1,186 @@
+# orchestrator/process_limits.py
+
+"""
+Per-Process Resource Limits
+
+Memory, CPU time and process-count limits for spawned services, and the
+child-side entry that enforces them.
+
+ProcessManager passes limits to the child in SUPEROS_LIMITS; before the
+entrypoint is imported, run_entrypoint() applies them with setrlimit:
+
+    memory_bytes  RLIMIT_AS; allocation past it raises MemoryError
+    cpu_seconds   RLIMIT_CPU; SIGXCPU at the limit, SIGKILL a second later
+    max_pids      RLIMIT_NPROC; fork/spawn fails with EAGAIN once the
+                  user (uid) has that many processes in total, across
+                  every service and the orchestrator itself. It is not a
+                  limit on the processes of this spawn.
+
+When the host has a writable cgroup v2 tree with the memory / pids
+controllers (orchestrator.host_scheduler), those two limits are
+enforced there instead (memory.max, pids.max, set on a cgroup the child
+enters before exec) and left out of the rlimits. Only pids.max limits
+the processes of one spawn; without the pids controller max_pids is the
+per-user RLIMIT_NPROC above. cgroups have no CPU-time budget, so
+cpu_seconds is always an rlimit.
+
+A limit hit ends the process with a recognizable status (launcher exit
+code, SIGXCPU, or a cgroup event counter), which exit_reason() turns into
+one of the REASON_*_LIMIT values reported on process.terminated.
+
+This module is imported by every child, so it must stay import-light.
+"""
+
+import errno
+import importlib
+import os
+import signal
+import sys
+import traceback
+from dataclasses import dataclass
+from typing import Any, Dict, Mapping, Optional
+
+LIMITS_ENV = "SUPEROS_LIMITS"
+
+REASON_MEMORY_LIMIT = "memory_limit"
+REASON_CPU_LIMIT = "cpu_limit"
+REASON_PIDS_LIMIT = "pids_limit"
+
+# Launcher exit codes for limit hits that surface as exceptions.
+EXIT_MEMORY_LIMIT = 251
+EXIT_PIDS_LIMIT = 252
+
+# Seconds between RLIMIT_CPU's soft (SIGXCPU) and hard (SIGKILL) limit.
+_CPU_GRACE = 1
+
+
+@dataclass(frozen=True)
+class ResourceLimits:
+    memory_bytes: Optional[int] = None
+    cpu_seconds: Optional[int] = None
+    max_pids: Optional[int] = None
+
+    @classmethod
+    def from_spec(cls, spec: Optional[Mapping[str, Any]]) -> Optional["ResourceLimits"]:
+        """
+        {"memory_mb": int, "cpu_seconds": int, "pids": int}, all optional.
+        None or an empty spec means no limits.
+        """
+        if not spec:
+            return None
+        unknown = set(spec) - {"memory_mb", "cpu_seconds", "pids"}
+        if unknown:
+            raise ValueError(f"unknown limits {sorted(unknown)}")
+
+        values = {}
+        for key in ("memory_mb", "cpu_seconds", "pids"):
+            value = spec.get(key)
+            if value is None:
+                continue
+            if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+                raise ValueError(f"limit '{key}' must be a positive integer")
+            values[key] = value
+
+        memory = values.get("memory_mb")
+        return cls(
+            memory_bytes=memory << 20 if memory is not None else None,
+            cpu_seconds=values.get("cpu_seconds"),
+            max_pids=values.get("pids"),
+        )
+
+    def serialize(self) -> Dict[str, Optional[int]]:
+        return {
+            "memory_bytes": self.memory_bytes,
+            "cpu_seconds": self.cpu_seconds,
+            "max_pids": self.max_pids,
+        }
+
+    def env(self, skip: frozenset = frozenset()) -> Dict[str, str]:
+        """
+        SUPEROS_LIMITS for the child, without the limits in skip
+        ("memory", "pids") that a cgroup enforces instead.
+        """
+        parts = []
+        if self.memory_bytes is not None and "memory" not in skip:
+            parts.append(f"memory={self.memory_bytes}")
+        if self.cpu_seconds is not None:
+            parts.append(f"cpu={self.cpu_seconds}")
+        if self.max_pids is not None and "pids" not in skip:
+            parts.append(f"pids={self.max_pids}")
+        return {LIMITS_ENV: ",".join(parts)} if parts else {}
+
+
+def exit_reason(
+    returncode: int,
+    limits: Optional[ResourceLimits],
+    events: Optional[Mapping[str, int]] = None,
+) -> Optional[str]:
+    """
+    The limit that ended a process, or None. events are the cgroup's
+    counters (HostScheduler.limit_events).
+    """
+    if limits is None:
+        return None
+    events = events or {}
+    if events.get("oom_kill") or returncode == EXIT_MEMORY_LIMIT:
+        return REASON_MEMORY_LIMIT
+    if returncode == -signal.SIGXCPU and limits.cpu_seconds is not None:
+        return REASON_CPU_LIMIT
+    if events.get("pids_max") or returncode == EXIT_PIDS_LIMIT:
+        return REASON_PIDS_LIMIT
+    return None
+
+
+# -------------------------
+# Child side
+# -------------------------
+
+def apply_env_limits() -> Dict[str, int]:
+    """
+    Apply SUPEROS_LIMITS with setrlimit. Returns what was applied.
+    """
+    spec = os.environ.get(LIMITS_ENV)
+    if not spec:
+        return {}
+    import resource
+
+    limits = {}
+    for part in spec.split(","):
+        name, _, value = part.partition("=")
+        limits[name] = int(value)
+
+    if "memory" in limits:
+        resource.setrlimit(resource.RLIMIT_AS, (limits["memory"], limits["memory"]))
+    if "cpu" in limits:
+        resource.setrlimit(resource.RLIMIT_CPU, (limits["cpu"], limits["cpu"] + _CPU_GRACE))
+    if "pids" in limits:
+        resource.setrlimit(resource.RLIMIT_NPROC, (limits["pids"], limits["pids"]))
+    return limits
+
+
+def run_entrypoint(name: str) -> None:
+    """
+    Child entry: apply limits, then run name.main(). A MemoryError or a
+    failed fork under a configured limit exits with the matching
+    EXIT_*_LIMIT code after printing the traceback.
+    """
+    limits = apply_env_limits()
+    try:
+        importlib.import_module(name).main()
+    except MemoryError:
+        if "memory" not in limits:
+            raise
+        _limit_exit(EXIT_MEMORY_LIMIT)
+    except BlockingIOError as e:
+        if "pids" not in limits or e.errno != errno.EAGAIN:
+            raise
+        _limit_exit(EXIT_PIDS_LIMIT)
+
+
+def _limit_exit(code: int) -> None:
+    try:
+        traceback.print_exc()
+        sys.stdout.flush()
+        sys.stderr.flush()
+    finally:
+        os._exit(code)
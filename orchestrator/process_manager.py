@@ -4,17 +4,63 @@
 #
 # User-space authority responsible for managing process lifecycles.
 # This component enforces policy; the kernel enforces mechanism.
-# No direct execution occurs here.
+#
+# Every entrypoint runs in its own interpreter (asyncio subprocess), so
+# services do not share the orchestrator's GIL or memory and CPU-bound
+# ones scale across cores. Output is read in chunks as it arrives and
+# published line by line on "process.stdout" / "process.stderr"; exit
+# codes are collected by a waiter task, never by blocking the loop.
+#
+# With a WarmPool (orchestrator.process_pool) attached, spawns are handed
+# to an interpreter that has already booted and imported the common
+# dependencies; a cold start is only the fallback when none is ready.
+#
+# Lifecycle channels:
+#   process.started     {pid, name, entrypoint, os_pid, state}
+#   process.exited      the process ended on its own
+#   process.terminated  killed by a signal, stopped via terminate(), or
+#                       ended by a resource limit
+# Both end events carry {pid, name, state, returncode, signal, reason,
+# runtime_s}; reason tells a limit hit (memory_limit, cpu_limit,
+# pids_limit) from a crash or a requested stop.
+#
+# Per-spawn memory / CPU / pid limits (orchestrator.process_limits) are
+# applied with setrlimit in the child, or through a cgroup v2 leaf when a
+# HostScheduler has the controllers. The child enters that cgroup before
+# any service code runs: a cold start between fork and exec, a warm
+# worker before it is handed its entrypoint.
+#
+# Services spawned with metadata "auto_restart" are supervised: when one
+# ends on its own it is started again, as a new pid, after a jittered
+# exponential backoff, and a crash loop trips a circuit breaker
+# (orchestrator.process_supervisor). Supervision channels:
+#   process.restarting  {service_id, name, pid, attempt, delay_s, breaker}
+#   process.crash_loop  {service_id, name, pid, restarts, window_s,
+#                        cooldown_s}, the breaker opened
+#   process.restarted   {service_id, name, pid, previous_pid, restarts,
+#                        recover_s}
+# Restart rates and time-to-recover are in supervision_stats(). A
+# restart replaces the ended record of the previous pid, so a service
+# keeps one entry in list_processes() however often it restarts.
 
+import asyncio
 import itertools
+import os
+import signal
+import subprocess
+import sys
+import time
 from enum import Enum
-from typing import Dict
-import importlib
-import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 from loguru import logger
 
 from orchestrator.ipc_bus import IPCBus
+from orchestrator.ipc_metrics import LatencyHistogram
+from orchestrator.host_scheduler import HostScheduler
+from orchestrator.process_limits import ResourceLimits, exit_reason
+from orchestrator.process_pool import WarmPool
+from orchestrator.process_supervisor import BREAKER_OPEN, RestartPolicy, ServiceState
 
 
 class ProcessState(str, Enum):
@@ -24,31 +70,194 @@ class ProcessState(str, Enum):
     TERMINATED = "terminated"
 
 
+# Exit reasons
+REASON_EXIT = "exit"                  # returned / sys.exit
+REASON_SIGNAL = "signal"              # killed by a signal nobody requested
+REASON_TERMINATED = "terminated"      # stopped through terminate()
+REASON_SPAWN_FAILED = "spawn_failed"  # never started
+# Limit hits use orchestrator.process_limits.REASON_*_LIMIT.
+
+# Runs entrypoint.main() in the child, under its resource limits.
+_LAUNCHER = (
+    "import sys; from orchestrator.process_limits import run_entrypoint; "
+    "run_entrypoint(sys.argv[1])"
+)
+
+# Bytes read from a pipe per wakeup; every complete line in a chunk is
+# published in one publish_many().
+_READ_CHUNK = 64 << 10
+
+# Longest line kept whole; longer output is split.
+_MAX_LINE = 64 << 10
+
+# Seconds to keep reading pipes after the child has exited.
+_DRAIN_TIMEOUT = 1.0
+
+DEFAULT_TERMINATE_GRACE = 5.0
+
+
 class Process:
-    def __init__(self, pid: int, project_id: str):
+    def __init__(self, pid: int, project_id: str, entrypoint: str = "", metadata: Optional[dict] = None):
         self.pid = pid
         self.project_id = project_id
+        self.entrypoint = entrypoint
+        self.metadata = metadata or {}
+        self.capabilities: set = set()
+        self.limits: Optional[ResourceLimits] = None
+        # Supervision state when spawned with auto_restart
+        self.service: Optional[ServiceState] = None
         self.state = ProcessState.CREATED
 
+        self.os_pid: Optional[int] = None
+        self.returncode: Optional[int] = None
+        self.reason: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.ended_at: Optional[float] = None
+
+        # Latest resource sample (orchestrator.process_stats)
+        self.usage: Optional[Dict[str, Any]] = None
+
+        self._child: Optional[asyncio.subprocess.Process] = None
+        # cgroup created for its limits (HostScheduler.limit_group)
+        self._cgroup: Optional[str] = None
+        self._waiter: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    @property
+    def alive(self) -> bool:
+        return self.state in (ProcessState.CREATED, ProcessState.RUNNING)
+
 
 class ProcessManager:
-    def __init__(self, ipc: IPCBus):
+    def __init__(
+        self,
+        ipc: IPCBus,
+        python: str = sys.executable,
+        pool: Optional[WarmPool] = None,
+        host: Optional[HostScheduler] = None,
+    ):
         self.ipc = ipc
+        self.python = python
+        self.pool = pool
+        self.host = host
         self._pid_gen = itertools.count(start=1)
         self._processes: Dict[int, Process] = {}
 
+        # service_id -> supervised service; pending restarts by service_id
+        self._services: Dict[int, ServiceState] = {}
+        self._restarts: Dict[int, asyncio.Task] = {}
+        self._recover = LatencyHistogram()
+        self._closing = False
+
     async def spawn(
         self,
         name: str,
         entrypoint: str,
         capabilities: set,
         metadata: dict,
-    ):
+        limits: Optional[ResourceLimits] = None,
+    ) -> int:
+        """
+        Start entrypoint (a module with main()) in a new interpreter,
+        handed to a warm pool worker when one is ready (metadata
+        {"warm": False} forces a cold start). Returns the SuperOS pid;
+        a failed start is reported as process.exited with reason
+        "spawn_failed".
+
+        Metadata "auto_restart" (and "restart") put the service under
+        supervision; a malformed restart spec raises ValueError.
+        """
+        policy = RestartPolicy.from_metadata(metadata)
+
+        proc = self._register(name, entrypoint, capabilities, metadata, limits)
+        if policy is not None:
+            proc.service = ServiceState(proc.pid, name, policy)
+            proc.service.pid = proc.pid
+            self._services[proc.pid] = proc.service
+
+        await self._launch(proc)
+        if proc.service is not None and proc.state is ProcessState.RUNNING:
+            proc.service.on_running(proc.started_at)
+        return proc.pid
+
+    def _register(
+        self,
+        name: str,
+        entrypoint: str,
+        capabilities: set,
+        metadata: dict,
+        limits: Optional[ResourceLimits],
+    ) -> Process:
         pid = next(self._pid_gen)
-        proc = Process(pid=pid, project_id=name)
+        proc = Process(pid=pid, project_id=name, entrypoint=entrypoint, metadata=metadata)
+        proc.capabilities = capabilities
+        proc.limits = limits
         self._processes[pid] = proc
+        return proc
+
+    async def _launch(self, proc: Process) -> None:
+        pid, name, entrypoint = proc.pid, proc.project_id, proc.entrypoint
+        metadata, limits = proc.metadata, proc.limits
 
-        logger.info(f"Process spawned pid={pid} name={name}")
+        env = {
+            "PYTHONUNBUFFERED": "1",
+            "SUPEROS_PID": str(pid),
+            "SUPEROS_CAPABILITIES": ",".join(sorted(proc.capabilities)),
+        }
+        group = None
+        if limits is not None:
+            via_cgroup = frozenset()
+            if self.host is not None:
+                group, via_cgroup = self.host.limit_group(f"spawn-{pid}", limits)
+            if limits.max_pids is not None and "pids" not in via_cgroup:
+                logger.warning(
+                    f"no pids cgroup for {name}: RLIMIT_NPROC counts every "
+                    f"process of the user, not just this spawn"
+                )
+            env.update(limits.env(skip=via_cgroup))
+
+        child = None
+        if self.pool is not None and metadata.get("warm", True):
+            child = self.pool.acquire()
+            if child is not None and group is not None and not self.host.enter(group, child.pid):
+                # The worker has not run service code yet; limit it with
+                # rlimits instead
+                env.update(limits.env())
+                self.host.remove_group(group)
+                group = None
+
+        try:
+            if child is not None:
+                await self.pool.handoff(child, entrypoint, env)
+            else:
+                child = await asyncio.create_subprocess_exec(
+                    self.python, "-c", _LAUNCHER, entrypoint,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    env=dict(os.environ, **env),
+                    preexec_fn=self.host.preexec(group) if group is not None else None,
+                )
+        except (OSError, subprocess.SubprocessError) as e:
+            logger.error(f"Failed to start {entrypoint}: {e}")
+            if child is not None and child.returncode is None:
+                child.kill()
+            if group is not None:
+                self.host.remove_group(group)
+            proc.started_at = time.time()
+            await self._finish(proc, None, REASON_SPAWN_FAILED)
+            return
+
+        if group is not None:
+            self.host.adopt(child.pid, group)
+            proc._cgroup = group
+
+        proc._child = child
+        proc.os_pid = child.pid
+        proc.started_at = time.time()
+        proc.state = ProcessState.RUNNING
+
+        logger.info(f"Process spawned pid={pid} name={name} os_pid={child.pid}")
 
         await self.ipc.publish(
             "process.started",
@@ -56,37 +265,319 @@ class ProcessManager:
                 "pid": pid,
                 "name": name,
                 "entrypoint": entrypoint,
+                "os_pid": child.pid,
                 "state": proc.state,
+                "limits": limits.serialize() if limits is not None else None,
             },
         )
 
-        proc.state = ProcessState.RUNNING
+        proc._waiter = asyncio.create_task(self._supervise(proc, child))
 
-        # 🔥 ACTUALLY RUN THE MODULE
-        try:
-            module = importlib.import_module(entrypoint)
+    async def terminate(self, pid: int, grace: float = DEFAULT_TERMINATE_GRACE) -> Optional[int]:
+        """
+        SIGTERM, then SIGKILL after grace seconds. Returns the exit code
+        (None if pid is unknown or never started). Terminating the
+        current pid of a supervised service also ends its supervision,
+        including a restart that is still pending.
+        """
+        proc = self._processes.get(pid)
+        if proc is None:
+            return None
+        if proc.service is not None and proc.service.pid == pid:
+            self._unsupervise(proc.service)
+        if proc._child is None:
+            return None
 
-            if hasattr(module, "main"):
-                asyncio.create_task(
-                    asyncio.to_thread(module.main)
-                )
-            else:
-                logger.error(
-                    f"{entrypoint} has no main()"
-                )
+        if proc.alive:
+            proc._stopping = True
+            try:
+                proc._child.send_signal(signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+            try:
+                await asyncio.wait_for(asyncio.shield(proc._waiter), grace)
+            except asyncio.TimeoutError:
+                logger.warning(f"pid={pid} ignored SIGTERM, killing")
+                try:
+                    proc._child.kill()
+                except ProcessLookupError:
+                    pass
 
-        except Exception as e:
-            logger.exception(f"Failed to start {entrypoint}: {e}")
+        return await self.wait(pid)
+
+    async def wait(self, pid: int) -> Optional[int]:
+        """
+        Wait until pid has ended and been reported; returns its exit code.
+        """
+        proc = self._processes.get(pid)
+        if proc is None:
+            return None
+        if proc._waiter is not None:
+            await asyncio.shield(proc._waiter)
+        return proc.returncode
+
+    async def shutdown(self, grace: float = DEFAULT_TERMINATE_GRACE) -> None:
+        """
+        Terminate every running process and release idle pool workers.
+        Pending restarts are cancelled.
+        """
+        self._closing = True
+        for task in self._restarts.values():
+            task.cancel()
+        self._restarts.clear()
+        self._services.clear()
+        if self.pool is not None:
+            await self.pool.close()
+        await asyncio.gather(*(
+            self.terminate(pid, grace)
+            for pid, proc in list(self._processes.items())
+            if proc.alive
+        ))
+
+    # -------------------------
+    # Supervision
+    # -------------------------
+
+    async def _supervise(self, proc: Process, child: asyncio.subprocess.Process) -> None:
+        pumps = [
+            asyncio.create_task(self._pump(proc, child.stdout, "process.stdout")),
+            asyncio.create_task(self._pump(proc, child.stderr, "process.stderr")),
+        ]
+        returncode = await child.wait()
+
+        # Drain what the child wrote before exiting, so no output is
+        # published after the end event. A grandchild still holding the
+        # pipes open must not delay the report.
+        _, stuck = await asyncio.wait(pumps, timeout=_DRAIN_TIMEOUT)
+        for pump in stuck:
+            pump.cancel()
+
+        events = None
+        if self.host is not None and proc.limits is not None:
+            events = self.host.limit_events(child.pid)
+            if proc._cgroup is not None:
+                self.host.release(child.pid)
+        limit_hit = exit_reason(returncode, proc.limits, events)
+
+        if limit_hit is not None:
+            reason = limit_hit
+        elif proc._stopping:
+            reason = REASON_TERMINATED
+        elif returncode < 0:
+            reason = REASON_SIGNAL
+        else:
+            reason = REASON_EXIT
+        await self._finish(proc, returncode, reason)
+
+    async def _pump(self, proc: Process, stream: asyncio.StreamReader, channel: str) -> None:
+        pid, name = proc.pid, proc.project_id
+        async for lines in read_lines(stream):
+            await self.ipc.publish_many(
+                channel, [{"pid": pid, "name": name, "line": line} for line in lines]
+            )
+
+    async def _finish(self, proc: Process, returncode: Optional[int], reason: str) -> None:
+        proc.returncode = returncode
+        proc.reason = reason
+        proc.ended_at = time.time()
+        proc.state = (
+            ProcessState.EXITED
+            if reason in (REASON_EXIT, REASON_SPAWN_FAILED)
+            else ProcessState.TERMINATED
+        )
+
+        logger.info(
+            f"Process {proc.state.value} pid={proc.pid} name={proc.project_id} "
+            f"returncode={returncode} reason={reason}"
+        )
+
+        await self.ipc.publish(
+            "process.exited" if proc.state is ProcessState.EXITED else "process.terminated",
+            {
+                "pid": proc.pid,
+                "name": proc.project_id,
+                "state": proc.state,
+                "returncode": returncode,
+                "signal": _signal_name(returncode),
+                "reason": reason,
+                "runtime_s": proc.ended_at - proc.started_at,
+            },
+        )
+
+        if proc.service is not None:
+            await self._schedule_restart(proc)
+
+    # -------------------------
+    # Restart supervision
+    # -------------------------
+
+    async def _schedule_restart(self, proc: Process) -> None:
+        service = proc.service
+        if (
+            self._closing
+            or proc._stopping
+            or service.pid != proc.pid
+            or self._services.get(service.service_id) is not service
+        ):
+            return
+
+        failed = not (proc.reason == REASON_EXIT and proc.returncode == 0)
+        delay = service.on_end(proc.ended_at, proc.ended_at - proc.started_at, failed)
+        if delay is None:
+            del self._services[service.service_id]
+            return
+
+        if service.breaker == BREAKER_OPEN:
+            logger.warning(
+                f"{service.name} is crash-looping ({service.restarts} restarts), "
+                f"next trial in {delay:.0f}s"
+            )
+            await self.ipc.publish(
+                "process.crash_loop",
+                {
+                    "service_id": service.service_id,
+                    "name": service.name,
+                    "pid": proc.pid,
+                    "restarts": service.restarts,
+                    "window_s": service.policy.window_s,
+                    "cooldown_s": service.policy.cooldown_s,
+                },
+            )
+        else:
+            logger.info(f"Restarting {service.name} in {delay:.2f}s (attempt {service.failures})")
+
+        await self.ipc.publish(
+            "process.restarting",
+            {
+                "service_id": service.service_id,
+                "name": service.name,
+                "pid": proc.pid,
+                "attempt": service.failures,
+                "delay_s": delay,
+                "breaker": service.breaker,
+            },
+        )
+        self._restarts[service.service_id] = asyncio.create_task(self._restart(proc, delay))
+
+    async def _restart(self, previous: Process, delay: float) -> None:
+        service = previous.service
+        await asyncio.sleep(delay)
+        self._restarts.pop(service.service_id, None)
+        if self._closing:
+            return
+
+        proc = self._register(
+            previous.project_id,
+            previous.entrypoint,
+            previous.capabilities,
+            previous.metadata,
+            previous.limits,
+        )
+        proc.service = service
+        service.on_restart(time.time(), proc.pid)
+        # The ended run is superseded; its end event has been published
+        self._processes.pop(previous.pid, None)
+
+        await self._launch(proc)
+        if proc.state is not ProcessState.RUNNING:
+            # spawn_failed; _finish has scheduled the next attempt
+            return
+
+        recovered = service.on_running(proc.started_at)
+        if recovered is not None:
+            self._recover.record(recovered)
+        await self.ipc.publish(
+            "process.restarted",
+            {
+                "service_id": service.service_id,
+                "name": service.name,
+                "pid": proc.pid,
+                "previous_pid": previous.pid,
+                "restarts": service.restarts,
+                "recover_s": recovered,
+            },
+        )
+
+    def _unsupervise(self, service: ServiceState) -> None:
+        self._services.pop(service.service_id, None)
+        task = self._restarts.pop(service.service_id, None)
+        if task is not None:
+            task.cancel()
 
     # -------------------------
     # Introspection
     # -------------------------
 
+    def get(self, pid: int) -> Optional[Process]:
+        return self._processes.get(pid)
+
+    def running(self) -> List[Process]:
+        """
+        Processes with a live host process.
+        """
+        return [
+            proc for proc in self._processes.values()
+            if proc.state is ProcessState.RUNNING and proc.os_pid is not None
+        ]
+
     def list_processes(self):
         return {
             pid: {
                 "project_id": proc.project_id,
                 "state": proc.state,
+                "os_pid": proc.os_pid,
+                "returncode": proc.returncode,
+                "reason": proc.reason,
+                "usage": proc.usage,
+                "service_id": proc.service.service_id if proc.service is not None else None,
             }
             for pid, proc in self._processes.items()
         }
+
+    def supervision_stats(self) -> Dict[str, Any]:
+        """
+        Restart metrics of the supervised services, per service and in
+        total.
+        """
+        now = time.time()
+        services = [service.stats(now) for service in self._services.values()]
+        return {
+            "services": services,
+            "restart_rate_per_min": sum(s["restart_rate_per_min"] for s in services),
+            "breakers_open": sum(1 for s in services if s["breaker"] == BREAKER_OPEN),
+            "pending_restarts": len(self._restarts),
+            "time_to_recover": self._recover.snapshot(),
+        }
+
+
+async def read_lines(stream: asyncio.StreamReader) -> AsyncIterator[List[str]]:
+    """
+    Yield a child's output as it arrives: the complete, decoded lines of
+    each chunk read, then any unterminated tail at EOF.
+    """
+    pending = b""
+    while True:
+        chunk = await stream.read(_READ_CHUNK)
+        if not chunk:
+            break
+
+        data = pending + chunk
+        lines = data.split(b"\n")
+        pending = lines.pop()
+        if len(pending) > _MAX_LINE:
+            lines.append(pending)
+            pending = b""
+        if lines:
+            yield [line.rstrip(b"\r").decode("utf-8", "replace") for line in lines]
+
+    if pending:
+        yield [pending.rstrip(b"\r").decode("utf-8", "replace")]
+
+
+def _signal_name(returncode: Optional[int]) -> Optional[str]:
+    if returncode is None or returncode >= 0:
+        return None
+    try:
+        return signal.Signals(-returncode).name
+    except ValueError:
+        return f"SIG{-returncode}"
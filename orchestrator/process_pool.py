@@ -0,0 +1,172 @@
+# orchestrator/process_pool.py
+#
+# Warm Process Pool
+#
+# Keeps a few idle interpreters that have already started and imported
+# the common dependencies, so launching a service is a handoff instead of
+# a cold start (interpreter boot plus imports).
+#
+# A warm worker is an ordinary asyncio subprocess with stdout/stderr
+# pipes, started with the same interpreter and environment as a cold
+# spawn. After preloading it prints one readiness line, which the pool
+# consumes, and blocks on stdin. A handoff writes one JSON line
+# {"entrypoint", "env"} and closes stdin; the worker applies env and runs
+# entrypoint.main() under its resource limits (orchestrator.process_limits).
+# From then on ProcessManager supervises it exactly like a cold-started
+# child (output, exit codes, signals).
+#
+# Each worker serves one service and is never reused, so services stay
+# isolated. The pool refills in the background after every acquire().
+# Idle workers exit on their own when stdin closes, i.e. when the
+# orchestrator goes away.
+
+import asyncio
+import json
+import os
+import sys
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Set
+
+from loguru import logger
+
+READY = b"superos-worker-ready\n"
+
+_WORKER = (
+    "import importlib, json, os, sys\n"
+    "from orchestrator.process_limits import run_entrypoint\n"
+    "for name in sys.argv[2:]:\n"
+    "    try:\n"
+    "        importlib.import_module(name)\n"
+    "    except Exception:\n"
+    "        pass\n"
+    "sys.stdout.buffer.write(sys.argv[1].encode() + b'\\n')\n"
+    "sys.stdout.flush()\n"
+    "line = sys.stdin.buffer.readline()\n"
+    "if not line:\n"
+    "    sys.exit(0)\n"
+    "job = json.loads(line)\n"
+    "os.environ.update(job['env'])\n"
+    "fd = os.open(os.devnull, os.O_RDONLY)\n"
+    "os.dup2(fd, 0)\n"
+    "os.close(fd)\n"
+    "run_entrypoint(job['entrypoint'])\n"
+)
+
+DEFAULT_SIZE = 2
+
+# Seconds a worker may take to preload before it is discarded.
+_READY_TIMEOUT = 30.0
+
+
+class WarmPool:
+    def __init__(
+        self,
+        size: int = DEFAULT_SIZE,
+        preload: Iterable[str] = (),
+        python: str = sys.executable,
+    ):
+        if size < 0:
+            raise ValueError("warm pool size must not be negative")
+        self.size = size
+        self.preload = tuple(preload)
+        self.python = python
+
+        self._idle: Deque[asyncio.subprocess.Process] = deque()
+        self._starting: Set[asyncio.Task] = set()
+        self._closed = False
+
+        self.handoffs = 0
+        self.misses = 0
+
+    async def fill(self) -> None:
+        """
+        Start workers until size are idle or starting, and wait for every
+        start in flight.
+        """
+        for _ in range(self.size - len(self._idle) - len(self._starting)):
+            task = asyncio.create_task(self._start_worker())
+            self._starting.add(task)
+            task.add_done_callback(self._starting.discard)
+        if self._starting:
+            await asyncio.gather(*self._starting)
+
+    def acquire(self) -> Optional[asyncio.subprocess.Process]:
+        """
+        An idle warm worker, or None if none is ready (the caller should
+        cold-start). Starts a replacement in the background either way.
+        """
+        child = None
+        while self._idle:
+            candidate = self._idle.popleft()
+            if candidate.returncode is None:
+                child = candidate
+                break
+
+        if child is None:
+            self.misses += 1
+        if not self._closed:
+            asyncio.create_task(self.fill())
+        return child
+
+    async def handoff(
+        self,
+        child: asyncio.subprocess.Process,
+        entrypoint: str,
+        env: Dict[str, str],
+    ) -> None:
+        """
+        Tell an acquired worker which service to become. env holds only
+        the variables that differ from the orchestrator's.
+        """
+        job = json.dumps({"entrypoint": entrypoint, "env": env}).encode() + b"\n"
+        child.stdin.write(job)
+        await child.stdin.drain()
+        child.stdin.close()
+        self.handoffs += 1
+
+    async def close(self) -> None:
+        self._closed = True
+        # Workers finishing their start now see _closed and exit.
+        if self._starting:
+            await asyncio.gather(*self._starting)
+        while self._idle:
+            child = self._idle.popleft()
+            if child.returncode is None:
+                child.stdin.close()
+                await child.wait()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "starting": len(self._starting),
+            "handoffs": self.handoffs,
+            "misses": self.misses,
+        }
+
+    async def _start_worker(self) -> None:
+        try:
+            child = await asyncio.create_subprocess_exec(
+                self.python, "-c", _WORKER, READY.rstrip(b"\n").decode(), *self.preload,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                env=dict(os.environ, PYTHONUNBUFFERED="1"),
+            )
+        except OSError as e:
+            logger.error(f"warm worker failed to start: {e}")
+            return
+
+        try:
+            line = await asyncio.wait_for(child.stdout.readline(), _READY_TIMEOUT)
+        except asyncio.TimeoutError:
+            line = b""
+
+        if line != READY or self._closed:
+            if line != READY:
+                logger.error("warm worker did not become ready, discarding")
+            if child.returncode is None:
+                child.kill()
+            await child.wait()
+            return
+        self._idle.append(child)
@@ -0,0 +1,305 @@
+# orchestrator/process_stats.py
+#
+# Process Resource Accounting
+#
+# Periodically samples CPU time, RSS, open fds and I/O bytes for every
+# process ProcessManager supervises. Each pid keeps a fixed-size ring of
+# samples, the latest one is attached to the Process (list_processes()
+# reports it), and every tick publishes one aggregate message on
+# "process.resources". A ring is dropped when its process ends; the last
+# sample stays on the Process record.
+#
+# Sampling has to stay cheap with hundreds of processes, so on Linux it
+# reads /proc directly instead of going through psutil:
+#   - /proc/<pid>/stat and /proc/<pid>/io are opened once per process and
+#     re-read with pread(), which regenerates them without open/close;
+#   - open fds are counted (a directory listing, the costliest read) only
+#     every fd_every ticks.
+# Elsewhere psutil is used. stats() reports the sampler's own cost.
+
+import asyncio
+import os
+import sys
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from loguru import logger
+
+from orchestrator.ipc_bus import IPCBus
+from orchestrator.process_manager import ProcessManager
+
+DEFAULT_INTERVAL = 2.0
+DEFAULT_HISTORY = 300
+DEFAULT_FD_EVERY = 5
+
+# (timestamp, cpu_seconds, rss_bytes, fds, io_read, io_write, disk_read, disk_write)
+# io_* count every byte read/written (files, pipes, sockets); disk_* only
+# what reached storage.
+Sample = Tuple[float, float, int, int, int, int, int, int]
+
+
+class _ProcReader:
+    """
+    /proc reader keeping stat/io descriptors open per pid.
+    """
+
+    def __init__(self):
+        self._ticks = os.sysconf("SC_CLK_TCK")
+        self._page = os.sysconf("SC_PAGE_SIZE")
+        self._fds: Dict[int, Tuple[int, Optional[int]]] = {}
+
+    def read(self, os_pid: int, count_fds: bool, last_fds: int) -> Optional[tuple]:
+        handles = self._fds.get(os_pid)
+        if handles is None:
+            handles = self._open(os_pid)
+            if handles is None:
+                return None
+        stat_fd, io_fd = handles
+
+        try:
+            stat = os.pread(stat_fd, 1024, 0)
+            io = os.pread(io_fd, 512, 0) if io_fd is not None else b""
+            fds = len(os.listdir(f"/proc/{os_pid}/fd")) if count_fds else last_fds
+        except OSError:
+            self.forget(os_pid)
+            return None
+
+        # comm may contain spaces and parentheses; fields resume after ") "
+        fields = stat[stat.rindex(b")") + 2:].split()
+        cpu = (int(fields[11]) + int(fields[12])) / self._ticks
+        rss = int(fields[21]) * self._page
+
+        if io:
+            # rchar wchar syscr syscw read_bytes write_bytes ...
+            values = io.split()
+            counters = (int(values[1]), int(values[3]), int(values[9]), int(values[11]))
+        else:
+            counters = (0, 0, 0, 0)
+        return (cpu, rss, fds) + counters
+
+    def forget(self, os_pid: int) -> None:
+        handles = self._fds.pop(os_pid, None)
+        if handles is not None:
+            for fd in handles:
+                if fd is not None:
+                    os.close(fd)
+
+    def _open(self, os_pid: int) -> Optional[Tuple[int, Optional[int]]]:
+        try:
+            stat_fd = os.open(f"/proc/{os_pid}/stat", os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            io_fd = os.open(f"/proc/{os_pid}/io", os.O_RDONLY)
+        except OSError:
+            io_fd = None  # not permitted here; I/O is reported as 0
+        self._fds[os_pid] = handles = (stat_fd, io_fd)
+        return handles
+
+
+class _PsutilReader:
+    """
+    Portable fallback for hosts without /proc.
+    """
+
+    def __init__(self):
+        import psutil
+
+        self._psutil = psutil
+        self._procs: Dict[int, Any] = {}
+
+    def read(self, os_pid: int, count_fds: bool, last_fds: int) -> Optional[tuple]:
+        psutil = self._psutil
+        try:
+            proc = self._procs.get(os_pid)
+            if proc is None:
+                proc = self._procs[os_pid] = psutil.Process(os_pid)
+            with proc.oneshot():
+                times = proc.cpu_times()
+                rss = proc.memory_info().rss
+                fds = _count_fds(proc) if count_fds else last_fds
+                try:
+                    io = proc.io_counters()
+                    counters = (
+                        getattr(io, "read_chars", io.read_bytes),
+                        getattr(io, "write_chars", io.write_bytes),
+                        io.read_bytes,
+                        io.write_bytes,
+                    )
+                except (AttributeError, psutil.AccessDenied):
+                    counters = (0, 0, 0, 0)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            self.forget(os_pid)
+            return None
+        return (times.user + times.system, rss, fds) + counters
+
+    def forget(self, os_pid: int) -> None:
+        self._procs.pop(os_pid, None)
+
+
+def _count_fds(proc) -> int:
+    if hasattr(proc, "num_fds"):
+        return proc.num_fds()
+    return proc.num_handles()  # Windows
+
+
+def _reader():
+    if sys.platform.startswith("linux") and os.path.isdir("/proc/self"):
+        return _ProcReader()
+    return _PsutilReader()
+
+
+def _as_dict(sample: Sample, previous: Optional[Sample]) -> Dict[str, Any]:
+    ts, cpu, rss, fds, io_read, io_write, disk_read, disk_write = sample
+    cpu_percent = 0.0
+    if previous is not None and ts > previous[0]:
+        cpu_percent = (cpu - previous[1]) / (ts - previous[0]) * 100.0
+    return {
+        "ts": ts,
+        "cpu_seconds": cpu,
+        "cpu_percent": cpu_percent,
+        "rss": rss,
+        "fds": fds,
+        "io_read": io_read,
+        "io_write": io_write,
+        "disk_read": disk_read,
+        "disk_write": disk_write,
+    }
+
+
+class ResourceSampler:
+    def __init__(
+        self,
+        manager: ProcessManager,
+        ipc: IPCBus,
+        interval: float = DEFAULT_INTERVAL,
+        history: int = DEFAULT_HISTORY,
+        fd_every: int = DEFAULT_FD_EVERY,
+    ):
+        if interval <= 0 or history < 2 or fd_every < 1:
+            raise ValueError("sampler needs interval > 0, history >= 2, fd_every >= 1")
+        self.manager = manager
+        self.ipc = ipc
+        self.interval = interval
+        self.history_size = history
+        self.fd_every = fd_every
+
+        self._reader = _reader()
+        self._rings: Dict[int, Deque[Sample]] = {}
+        # Host pid each ring is sampled from. The manager may have dropped
+        # the process by the time its ring goes, e.g. on a restart.
+        self._os_pids: Dict[int, int] = {}
+        self._tick = 0
+        self._cost = 0.0
+        self._ticks_timed = 0
+        self._last_cost = 0.0
+
+    def sample(self) -> Dict[str, Any]:
+        """
+        Take one sample of every running process; returns the aggregate
+        published on process.resources.
+        """
+        started = time.perf_counter()
+        now = time.time()
+        count_fds = self._tick % self.fd_every == 0
+        self._tick += 1
+
+        reader, rings = self._reader, self._rings
+        processes = {}
+        totals = [0.0, 0, 0, 0, 0, 0]
+        seen = set()
+
+        for proc in self.manager.running():
+            pid = proc.pid
+            ring = rings.get(pid)
+            last = ring[-1] if ring else None
+
+            if last is None:
+                values = reader.read(proc.os_pid, True, 0)
+            else:
+                values = reader.read(proc.os_pid, count_fds, last[3])
+            if values is None:
+                continue
+            seen.add(pid)
+
+            sample = (now,) + values
+            if ring is None:
+                ring = rings[pid] = deque(maxlen=self.history_size)
+                self._os_pids[pid] = proc.os_pid
+            ring.append(sample)
+
+            usage = _as_dict(sample, last)
+            usage["name"] = proc.project_id
+            proc.usage = usage
+            processes[pid] = usage
+
+            totals[0] += usage["cpu_percent"]
+            totals[1] += values[1]
+            totals[2] += values[2]
+            totals[3] += values[3] + values[4]
+            totals[4] += values[5] + values[6]
+            totals[5] += 1
+
+        for pid in [pid for pid in rings if pid not in seen]:
+            del rings[pid]
+            self._forget(pid)
+
+        cost = time.perf_counter() - started
+        self._last_cost = cost
+        self._cost += cost
+        self._ticks_timed += 1
+
+        return {
+            "ts": now,
+            "processes": processes,
+            "total": {
+                "cpu_percent": totals[0],
+                "rss": totals[1],
+                "fds": totals[2],
+                "io_bytes": totals[3],
+                "disk_bytes": totals[4],
+                "count": totals[5],
+            },
+        }
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                aggregate = self.sample()
+            except Exception as e:
+                logger.exception(f"resource sampling failed: {e}")
+                continue
+            await self.ipc.publish("process.resources", aggregate)
+
+    def history(self, pid: int) -> List[Dict[str, Any]]:
+        """
+        Retained samples for pid, oldest first.
+        """
+        ring = self._rings.get(pid)
+        if not ring:
+            return []
+        samples = list(ring)
+        return [
+            _as_dict(sample, samples[i - 1] if i else None)
+            for i, sample in enumerate(samples)
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        The sampler's own cost: last and average tick time, and the
+        share of one core that works out to at this interval.
+        """
+        average = self._cost / (self._ticks_timed or 1)
+        return {
+            "processes": len(self._rings),
+            "last_tick_ms": self._last_cost * 1000.0,
+            "avg_tick_ms": average * 1000.0,
+            "core_percent": average / self.interval * 100.0,
+        }
+
+    def _forget(self, pid: int) -> None:
+        os_pid = self._os_pids.pop(pid, None)
+        if os_pid is not None:
+            self._reader.forget(os_pid)
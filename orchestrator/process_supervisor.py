@@ -0,0 +1,221 @@
+# orchestrator/process_supervisor.py
+
+"""
+Restart Supervision
+
+Restart policy and per-service supervision state for ProcessManager,
+which acts as a one-for-one supervisor: a service whose process ends
+without being asked to is started again from the same spec (entrypoint,
+capabilities, metadata, limits) as a new SuperOS pid.
+
+Spawn metadata selects the policy:
+
+    auto_restart    True / "on_failure"   restart unless it exited 0
+                    "always"              restart after any end
+                    False / "never"       (default) no supervision
+    restart         optional overrides of RestartPolicy's fields, e.g.
+                    {"backoff_max_s": 10, "max_restarts": 3}
+
+A process stopped through terminate() or shutdown() is never restarted.
+
+Backoff: the n-th consecutive failure waits
+    min(backoff_max_s, backoff_initial_s * 2^(n-1))
+minus up to jitter of that, at random, so services that failed together
+do not come back in lockstep. A run lasting stable_s resets the count.
+
+Circuit breaker: max_restarts restarts within window_s open it. The
+service then stays down for cooldown_s, after which one trial run is
+started (half-open). A trial that survives stable_s closes the breaker;
+one that fails reopens it. A flapping service therefore costs at most
+max_restarts starts per window and one per cooldown after that.
+
+Metrics per service: total restarts, restart rate over the window,
+breaker state and time to recover (from the failed process ending to
+its replacement running), in ServiceState.stats().
+"""
+
+import random
+from collections import deque
+from dataclasses import dataclass, fields
+from typing import Any, Deque, Dict, Mapping, Optional
+
+from orchestrator.ipc_metrics import LatencyHistogram
+
+RESTART_NEVER = "never"
+RESTART_ON_FAILURE = "on_failure"
+RESTART_ALWAYS = "always"
+
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
+
+
+@dataclass(frozen=True)
+class RestartPolicy:
+    mode: str = RESTART_ON_FAILURE
+    backoff_initial_s: float = 0.5
+    backoff_max_s: float = 30.0
+    # Fraction of each delay that is randomized away (0 = none).
+    jitter: float = 0.5
+    # Uptime after which a run counts as recovered.
+    stable_s: float = 10.0
+    max_restarts: int = 5
+    window_s: float = 60.0
+    cooldown_s: float = 300.0
+
+    @classmethod
+    def from_metadata(cls, metadata: Mapping[str, Any]) -> Optional["RestartPolicy"]:
+        """
+        Policy for spawn metadata; None when the service is not
+        supervised. Raises ValueError on a malformed spec.
+        """
+        auto = metadata.get("auto_restart", False)
+        if auto is False or auto is None or auto == RESTART_NEVER:
+            return None
+        if auto is True:
+            mode = RESTART_ON_FAILURE
+        elif auto in (RESTART_ON_FAILURE, RESTART_ALWAYS):
+            mode = auto
+        else:
+            raise ValueError(f"unknown auto_restart mode {auto!r}")
+
+        spec = metadata.get("restart") or {}
+        names = {field.name for field in fields(cls)} - {"mode"}
+        unknown = set(spec) - names
+        if unknown:
+            raise ValueError(f"unknown restart settings {sorted(unknown)}")
+
+        values: Dict[str, Any] = {}
+        for key, value in spec.items():
+            if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+                raise ValueError(f"restart setting '{key}' must be a non-negative number")
+            values[key] = value
+        if values.get("jitter", 0) > 1:
+            raise ValueError("restart setting 'jitter' must be at most 1")
+        if "max_restarts" in values:
+            if not isinstance(values["max_restarts"], int) or values["max_restarts"] < 1:
+                raise ValueError("restart setting 'max_restarts' must be a positive integer")
+        return cls(mode=mode, **values)
+
+    def wants_restart(self, failed: bool) -> bool:
+        return failed or self.mode == RESTART_ALWAYS
+
+    def delay(self, failures: int, rng: random.Random) -> float:
+        """
+        Backoff before restart number failures (1-based) of a streak.
+        """
+        base = min(self.backoff_max_s, self.backoff_initial_s * 2 ** (failures - 1))
+        return base * (1.0 - self.jitter * rng.random())
+
+
+class ServiceState:
+    """
+    Supervision state of one service across its restarts.
+    """
+
+    def __init__(self, service_id: int, name: str, policy: RestartPolicy):
+        self.service_id = service_id
+        self.name = name
+        self.policy = policy
+
+        # SuperOS pid of the current (or last) run
+        self.pid: Optional[int] = None
+        self.restarts = 0
+        self.failures = 0
+        self.breaker = BREAKER_CLOSED
+        self.down_since: Optional[float] = None
+        self.running_since: Optional[float] = None
+        self.next_start: Optional[float] = None
+        self.recover = LatencyHistogram()
+
+        self._recent: Deque[float] = deque()
+        self._rng = random.Random()
+
+    def on_end(self, now: float, uptime: float, failed: bool) -> Optional[float]:
+        """
+        Record the end of the current run. Returns the delay before the
+        next start, or None when the service stays down.
+        """
+        policy = self.policy
+        self.running_since = None
+        if not policy.wants_restart(failed):
+            return None
+
+        if uptime >= policy.stable_s:
+            self.failures = 0
+            self.breaker = BREAKER_CLOSED
+
+        if self.down_since is None:
+            self.down_since = now
+        self.failures += 1
+
+        if self.breaker == BREAKER_HALF_OPEN:
+            # The trial run failed before becoming stable
+            self.breaker = BREAKER_OPEN
+            delay = policy.cooldown_s
+        else:
+            self._trim(now)
+            if len(self._recent) >= policy.max_restarts:
+                self.breaker = BREAKER_OPEN
+                delay = policy.cooldown_s
+            else:
+                delay = policy.delay(self.failures, self._rng)
+
+        self.next_start = now + delay
+        return delay
+
+    def on_restart(self, now: float, pid: int) -> None:
+        self.pid = pid
+        self.restarts += 1
+        self._recent.append(now)
+        self.next_start = None
+        if self.breaker == BREAKER_OPEN:
+            self.breaker = BREAKER_HALF_OPEN
+
+    def on_running(self, now: float) -> Optional[float]:
+        """
+        The current run has started; returns the time to recover when it
+        replaces a failed one.
+        """
+        self.running_since = now
+        if self.down_since is None:
+            return None
+        recovered = now - self.down_since
+        self.down_since = None
+        self.recover.record(recovered)
+        return recovered
+
+    def restart_rate(self, now: float) -> float:
+        """
+        Restarts per minute over the breaker window.
+        """
+        self._trim(now)
+        return len(self._recent) * 60.0 / (self.policy.window_s or 1.0)
+
+    def stats(self, now: float) -> Dict[str, Any]:
+        self._settle(now)
+        return {
+            "service_id": self.service_id,
+            "name": self.name,
+            "pid": self.pid,
+            "mode": self.policy.mode,
+            "restarts": self.restarts,
+            "consecutive_failures": self.failures,
+            "restart_rate_per_min": self.restart_rate(now),
+            "breaker": self.breaker,
+            "next_start_in_s": max(0.0, self.next_start - now) if self.next_start is not None else None,
+            "time_to_recover": self.recover.snapshot(),
+        }
+
+    def _settle(self, now: float) -> None:
+        # A run that has lasted stable_s has recovered, even before it ends
+        if self.running_since is not None and now - self.running_since >= self.policy.stable_s:
+            self.failures = 0
+            if self.breaker == BREAKER_HALF_OPEN:
+                self.breaker = BREAKER_CLOSED
+
+    def _trim(self, now: float) -> None:
+        horizon = now - self.policy.window_s
+        recent = self._recent
+        while recent and recent[0] < horizon:
+            recent.popleft()
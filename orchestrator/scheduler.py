@@ -4,11 +4,21 @@
 Scheduling Policy Engine (User Space)
 
 Defines scheduling policy only.
-The kernel enforces the actual scheduling.
+The kernel enforces the actual scheduling; with a HostScheduler attached
+(orchestrator.host_scheduler), policies for processes bound to a host
+pid are applied through nice, CPU affinity and cgroup v2.
+
+Per-role defaults (config/scheduler.yaml, see orchestrator.policy_config)
+are swapped in as one table, so a lookup never sees a half-applied
+reload. Processes given their role's policy (assign_role_policy) are
+reassigned from the new table on every swap. Higher priority means more
+CPU.
 """
 
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Mapping, Optional, Tuple
+
+from orchestrator.host_scheduler import HostScheduler
 
 
 @dataclass
@@ -18,9 +28,57 @@ class SchedulingPolicy:
     foreground: bool = False
 
 
+DEFAULT_POLICY = SchedulingPolicy(priority=0, time_slice_ms=10)
+
+
 class SchedulerPolicyEngine:
-    def __init__(self):
+    def __init__(self, host: Optional[HostScheduler] = None):
+        self.host = host
         self._policies: Dict[int, SchedulingPolicy] = {}
+        self._host_pids: Dict[int, int] = {}
+        # pid -> (role, foreground override) for role-assigned processes
+        self._assigned_roles: Dict[int, Tuple[str, Optional[bool]]] = {}
+        self._roles: tuple[Dict[str, SchedulingPolicy], SchedulingPolicy] = ({}, DEFAULT_POLICY)
+
+    def replace_role_policies(
+        self,
+        policies: Mapping[str, SchedulingPolicy],
+        default: SchedulingPolicy = DEFAULT_POLICY,
+    ) -> None:
+        """
+        Swap in per-role defaults and the fallback for unlisted roles,
+        and reassign every process that runs with its role's policy.
+        """
+        self._roles = (dict(policies), default)
+        for pid, (role, foreground) in list(self._assigned_roles.items()):
+            self.assign_role_policy(pid, role, foreground)
+
+    def policy_for_role(self, role: str) -> SchedulingPolicy:
+        policies, default = self._roles
+        return policies.get(role, default)
+
+    def assign_role_policy(
+        self,
+        pid: int,
+        role: str,
+        foreground: Optional[bool] = None,
+        os_pid: Optional[int] = None,
+    ) -> SchedulingPolicy:
+        """
+        Assign the role's default policy to a process. It follows later
+        changes to the role's policy until assign_policy() or
+        remove_policy() is called for it.
+        """
+        policy = self.policy_for_role(role)
+        self.assign_policy(
+            pid,
+            priority=policy.priority,
+            time_slice_ms=policy.time_slice_ms,
+            foreground=policy.foreground if foreground is None else foreground,
+            os_pid=os_pid,
+        )
+        self._assigned_roles[pid] = (role, foreground)
+        return self._policies[pid]
 
     def assign_policy(
         self,
@@ -28,16 +86,25 @@ class SchedulerPolicyEngine:
         priority: int,
         time_slice_ms: int,
         foreground: bool = False,
+        os_pid: Optional[int] = None,
     ) -> None:
         """
-        Assign or update scheduling policy for a process.
+        Assign or update scheduling policy for a process. os_pid binds
+        it to a host process; later updates are applied there too.
         """
-        self._policies[pid] = SchedulingPolicy(
+        self._assigned_roles.pop(pid, None)
+        policy = self._policies[pid] = SchedulingPolicy(
             priority=priority,
             time_slice_ms=time_slice_ms,
             foreground=foreground,
         )
 
+        if os_pid is not None:
+            self._host_pids[pid] = os_pid
+        os_pid = self._host_pids.get(pid)
+        if self.host is not None and os_pid is not None:
+            self.host.apply(os_pid, policy)
+
         # kernel_ipc.update_scheduler(pid, policy)
         return
 
@@ -46,6 +113,10 @@ class SchedulerPolicyEngine:
         Remove scheduling policy when process exits.
         """
         self._policies.pop(pid, None)
+        self._assigned_roles.pop(pid, None)
+        os_pid = self._host_pids.pop(pid, None)
+        if self.host is not None and os_pid is not None:
+            self.host.release(os_pid)
 
     def get_policy(self, pid: int) -> SchedulingPolicy | None:
         """
@@ -0,0 +1,239 @@
+# orchestrator/shm_ring.py
+
+"""
+Shared-Memory Ring Buffer (User-Space Transport)
+
+Single-producer / single-consumer byte ring placed in a named
+multiprocessing.shared_memory region. Mirrors the kernel's copy-based pipe
+model (kernel/ipc/pipe.rs): the writer copies a frame in, the reader copies
+it out, and nothing is pickled or pushed through a socket.
+
+Layout:
+    [0:8)      write position (native u64, monotonically increasing)
+    [8:16)     data capacity in bytes
+    [64:72)    read position (native u64, separate cache line from the writer)
+    [128:...)  data area
+
+Frames are a little-endian u32 length followed by the payload; a frame may
+wrap around the end of the data area.
+
+A ring has exactly one writer and one reader. It does not authorize
+anything — capability checks happen before a channel is opened.
+"""
+
+import multiprocessing
+import os
+import struct
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional
+
+_HEADER = 128
+_WRITE_OFF = 0
+_CAP_OFF = 8
+_READ_OFF = 64
+
+# Native format on purpose: CPython copies native-size fields with a single
+# aligned load/store, so the peer never sees a torn position. The "<Q"
+# packer writes byte by byte.
+_U64 = struct.Struct("Q")
+_LEN = struct.Struct("<I")
+
+# Busy-poll iterations before falling back to short sleeps.
+_SPIN = 200
+_MAX_SLEEP = 0.001
+
+
+class RingTimeout(TimeoutError):
+    """Raised when a ring stays full (send) or empty (recv) past the deadline."""
+    pass
+
+
+class ShmRing:
+    def __init__(self, name: str, capacity: int = 1 << 20, create: bool = False):
+        """
+        Open (or create) the ring called name.
+        capacity is only used when creating.
+        """
+        if create:
+            self._shm = shared_memory.SharedMemory(
+                name=name, create=True, size=_HEADER + capacity
+            )
+            self._buf = self._shm.buf
+            _U64.pack_into(self._buf, _WRITE_OFF, 0)
+            _U64.pack_into(self._buf, _READ_OFF, 0)
+            _U64.pack_into(self._buf, _CAP_OFF, capacity)
+        else:
+            self._shm = _attach(name)
+            self._buf = self._shm.buf
+
+        self.name = name
+        self.owner = create
+        self.capacity = _U64.unpack_from(self._buf, _CAP_OFF)[0]
+        self._data = self._buf[_HEADER:_HEADER + self.capacity]
+
+        # Each side caches the position only it advances.
+        self._wpos = _U64.unpack_from(self._buf, _WRITE_OFF)[0]
+        self._rpos = _U64.unpack_from(self._buf, _READ_OFF)[0]
+
+    # -------------------------
+    # Writer side
+    # -------------------------
+
+    def send(self, payload, timeout: Optional[float] = None) -> None:
+        """
+        Copy one frame into the ring, waiting for space if needed.
+        """
+        self.send_parts((payload,), timeout)
+
+    def send_parts(self, parts, timeout: Optional[float] = None) -> None:
+        """
+        Write the concatenation of parts as one frame, copying each part
+        straight into the ring (e.g. envelope header + raw body).
+        """
+        views = [memoryview(part).cast("B") for part in parts]
+        length = sum(len(view) for view in views)
+        need = _LEN.size + length
+        if need > self.capacity:
+            raise ValueError(
+                f"frame of {length} bytes exceeds ring capacity {self.capacity}"
+            )
+
+        if not self._wait(lambda: self.capacity - (self._wpos - self._read_pos()) >= need, timeout):
+            raise RingTimeout(f"ring '{self.name}' full")
+
+        pos = self._wpos
+        self._copy_in(pos, _LEN.pack(length))
+        pos += _LEN.size
+        for view in views:
+            self._copy_in(pos, view)
+            pos += len(view)
+
+        # Publish only after the frame is fully written
+        self._wpos = pos
+        _U64.pack_into(self._buf, _WRITE_OFF, self._wpos)
+
+    def _copy_in(self, pos: int, src) -> None:
+        start = pos % self.capacity
+        first = min(len(src), self.capacity - start)
+        self._data[start:start + first] = src[:first]
+        if first < len(src):
+            self._data[:len(src) - first] = src[first:]
+
+    def _read_pos(self) -> int:
+        return _U64.unpack_from(self._buf, _READ_OFF)[0]
+
+    # -------------------------
+    # Reader side
+    # -------------------------
+
+    def recv(self, timeout: Optional[float] = 0.0) -> Optional[bytes]:
+        """
+        Copy the next frame out of the ring.
+        timeout=0 polls once and returns None when empty; None waits forever.
+        """
+        if not self._wait(self.pending, timeout):
+            if timeout == 0.0:
+                return None
+            raise RingTimeout(f"ring '{self.name}' empty")
+
+        pos = self._rpos
+        length = _LEN.unpack(self._copy_out(pos, _LEN.size))[0]
+        payload = self._copy_out(pos + _LEN.size, length)
+
+        self._rpos = pos + _LEN.size + length
+        _U64.pack_into(self._buf, _READ_OFF, self._rpos)
+        return payload
+
+    def pending(self) -> bool:
+        return _U64.unpack_from(self._buf, _WRITE_OFF)[0] > self._rpos
+
+    def wait_readable(self, timeout: Optional[float] = None) -> bool:
+        return self._wait(self.pending, timeout)
+
+    def skip(self) -> None:
+        """
+        Discard the next frame without copying it out.
+        """
+        if not self.pending():
+            return
+        length = _LEN.unpack(self._copy_out(self._rpos, _LEN.size))[0]
+        self._rpos += _LEN.size + length
+        _U64.pack_into(self._buf, _READ_OFF, self._rpos)
+
+    def next_len(self) -> Optional[int]:
+        """
+        Payload length of the next frame without consuming it.
+        """
+        if not self.pending():
+            return None
+        return _LEN.unpack(self._copy_out(self._rpos, _LEN.size))[0]
+
+    def _copy_out(self, pos: int, length: int) -> bytes:
+        start = pos % self.capacity
+        end = start + length
+        if end <= self.capacity:
+            return self._data[start:end].tobytes()
+        first = self.capacity - start
+        return self._data[start:].tobytes() + self._data[:length - first].tobytes()
+
+    # -------------------------
+    # Waiting
+    # -------------------------
+
+    @staticmethod
+    def _wait(ready, timeout: Optional[float]) -> bool:
+        if ready():
+            return True
+        if timeout == 0.0:
+            return False
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        sleep = 0.0
+        spins = 0
+
+        while not ready():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            if spins < _SPIN:
+                spins += 1
+                continue
+            sleep = min(_MAX_SLEEP, sleep * 2 or 0.00005)
+            time.sleep(sleep)
+        return True
+
+    # -------------------------
+    # Teardown
+    # -------------------------
+
+    def close(self) -> None:
+        """
+        Detach from the region; the creator also unlinks it.
+        """
+        self._data.release()
+        self._buf = None
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to an existing region without taking ownership of it.
+
+    Before Python 3.13 attaching registers the region with this process's
+    resource tracker, which unlinks it when we exit. Undo that, unless
+    this is a multiprocessing child: it shares the creator's tracker, where
+    the registration is the creator's own.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+
+    shm = shared_memory.SharedMemory(name=name)
+    if multiprocessing.parent_process() is None:
+        # The tracker keys regions by their OS-level name
+        tracked = "/" + name if os.name == "posix" and not name.startswith("/") else name
+        resource_tracker.unregister(tracked, "shared_memory")
+    return shm
@@ -0,0 +1,147 @@
+# orchestrator/topic_trie.py
+#
+# Topic Trie
+#
+# Resolves dotted channel names ("process.started") against subscription
+# patterns. A pattern segment of "*" matches exactly one segment; "#"
+# matches zero or more segments ("runtime.#" matches "runtime" and
+# "runtime.cpp.stdout").
+#
+# Resolved routes are cached per topic, so steady-state routing is a single
+# dict lookup no matter how many subscriptions exist. Any change to the
+# subscription set drops the cache. A route computed while the set was
+# changing (e.g. subscribe() from another thread) is used but not cached.
+
+from typing import Any, Dict, List, Tuple
+
+WILDCARD_ONE = "*"
+WILDCARD_MANY = "#"
+
+# Distinct topics remembered before the route cache is reset.
+_CACHE_LIMIT = 4096
+
+
+class _Node:
+    __slots__ = ("children", "entries")
+
+    def __init__(self):
+        self.children: Dict[str, "_Node"] = {}
+        self.entries: List[Tuple[int, Any]] = []
+
+
+class TopicTrie:
+    def __init__(self):
+        self._root = _Node()
+        self._seq = 0
+        self._size = 0
+        self._generation = 0
+        self._cache: Dict[str, Tuple[Any, ...]] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    # -------------------------
+    # Mutation
+    # -------------------------
+
+    def add(self, pattern: str, value: Any) -> None:
+        node = self._root
+        for part in pattern.split("."):
+            child = node.children.get(part)
+            if child is None:
+                child = node.children[part] = _Node()
+            node = child
+
+        self._seq += 1
+        node.entries.append((self._seq, value))
+        self._size += 1
+        self._invalidate()
+
+    def remove(self, pattern: str, value: Any) -> bool:
+        """
+        Remove one registration of value under pattern.
+        Returns False if it was not registered.
+        """
+        path = [self._root]
+        for part in pattern.split("."):
+            child = path[-1].children.get(part)
+            if child is None:
+                return False
+            path.append(child)
+
+        entries = path[-1].entries
+        for i, (_, registered) in enumerate(entries):
+            if registered is value or registered == value:
+                del entries[i]
+                break
+        else:
+            return False
+
+        # Prune now-empty branches so lookups stay shallow
+        parts = pattern.split(".")
+        for depth in range(len(parts), 0, -1):
+            node = path[depth]
+            if node.entries or node.children:
+                break
+            del path[depth - 1].children[parts[depth - 1]]
+
+        self._size -= 1
+        self._invalidate()
+        return True
+
+    # -------------------------
+    # Lookup
+    # -------------------------
+
+    def registered(self, pattern: str) -> List[Any]:
+        """
+        Values registered under exactly this pattern (no wildcard matching).
+        """
+        node = self._root
+        for part in pattern.split("."):
+            node = node.children.get(part)
+            if node is None:
+                return []
+        return [value for _, value in node.entries]
+
+    def match(self, topic: str) -> Tuple[Any, ...]:
+        """
+        All values whose pattern matches topic, in registration order.
+        """
+        route = self._cache.get(topic)
+        if route is None:
+            generation = self._generation
+            found: Dict[int, Any] = {}
+            _walk(self._root, topic.split("."), 0, found)
+            route = tuple(found[seq] for seq in sorted(found))
+
+            if generation == self._generation:
+                if len(self._cache) >= _CACHE_LIMIT:
+                    self._cache.clear()
+                self._cache[topic] = route
+        return route
+
+    def _invalidate(self) -> None:
+        self._generation += 1
+        self._cache.clear()
+
+
+def _walk(node: _Node, parts: List[str], i: int, found: Dict[int, Any]) -> None:
+    many = node.children.get(WILDCARD_MANY)
+    if many is not None:
+        # "#" absorbs parts[i:j] for every j, including the empty run
+        for j in range(i, len(parts) + 1):
+            _walk(many, parts, j, found)
+
+    if i == len(parts):
+        for seq, value in node.entries:
+            found[seq] = value
+        return
+
+    child = node.children.get(parts[i])
+    if child is not None:
+        _walk(child, parts, i + 1, found)
+
+    one = node.children.get(WILDCARD_ONE)
+    if one is not None:
+        _walk(one, parts, i + 1, found)
@@ -4,7 +4,7 @@ from adapters.ollama import OllamaAdapter
 from model_registry import ModelRegistry
 from context_provider import ContextProvider
 from action_planner import ActionPlanner
-from policy import Policy
+from policy import PolicyFile, RequestWindow
 from runtimes.local import LocalRuntime
 
 
@@ -15,8 +15,9 @@ class MLService:
     """
 
     def __init__(self):
-        # Security / authority
-        self.policy = Policy({"read", "explain"})
+        # Security / authority: config/ml_policy.yaml
+        self.policy_file = PolicyFile()
+        self.requests = RequestWindow()
 
         # Prompt + planning
         self.context_provider = ContextProvider()
@@ -32,16 +33,34 @@ class MLService:
         # Runtime
         self.runtime = LocalRuntime()
 
+    @property
+    def policy(self):
+        return self.policy_file.current()
+
     def handle(self, user_input: str, system_state: dict) -> dict:
-        allowed_actions = list(self.policy.capabilities)
+        policy = self.policy
+        if not self.requests.admit(policy.max_requests_per_minute):
+            raise PermissionError("ML request rate limit reached")
+
+        allowed_actions = sorted(policy.capabilities)
 
         prompt = self.context_provider.build(
             user_input=user_input,
             system_state=system_state,
             allowed_actions=allowed_actions
         )
+        if not policy.fits_context(prompt):
+            raise PermissionError(
+                f"ML context exceeds {policy.max_context_bytes} bytes"
+            )
 
         model = self.model_registry.get("local-default")
         raw_output = self.runtime.run(model, prompt)
 
-        return self.action_planner.plan(raw_output)
+        plan = self.action_planner.plan(raw_output)
+        action = plan.get("action") if isinstance(plan, dict) else None
+        if not policy.allow(action):
+            raise PermissionError(
+                f"model proposed an action outside the ML policy: {action!r}"
+            )
+        return plan
@@ -1,16 +1,101 @@
 # ml/policy.py
 
+import os
+import time
+from collections import deque
+from typing import Optional
+
+from loguru import logger
+
+from orchestrator.policy_config import (
+    ML_POLICY_FILE,
+    MLPolicy,
+    PolicyConfigError,
+    load_ml_policy,
+)
+
+
 class Policy:
     """
     Defines what actions the ML system is allowed to propose.
     This enforces authority boundaries between the model and the OS.
     """
 
-    def __init__(self, capabilities: set[str]):
+    def __init__(
+        self,
+        capabilities: set[str],
+        max_requests_per_minute: int = 0,
+        max_context_bytes: int = 0,
+    ):
         self.capabilities = set(capabilities)
+        # 0 means unlimited
+        self.max_requests_per_minute = max_requests_per_minute
+        self.max_context_bytes = max_context_bytes
+
+    @classmethod
+    def from_config(cls, policy: MLPolicy) -> "Policy":
+        return cls(
+            policy.allowed_actions,
+            max_requests_per_minute=policy.max_requests_per_minute,
+            max_context_bytes=policy.max_context_bytes,
+        )
 
     def allow(self, action: str) -> bool:
         return action in self.capabilities
 
     def filter_actions(self, actions: list[str]) -> list[str]:
         return [a for a in actions if self.allow(a)]
+
+    def fits_context(self, prompt: str) -> bool:
+        return not self.max_context_bytes or len(prompt.encode("utf-8")) <= self.max_context_bytes
+
+
+class PolicyFile:
+    """
+    The ML policy in config/ml_policy.yaml, validated by
+    orchestrator.policy_config and re-read when the file changes. An
+    invalid edit is logged and the previous policy stays in force.
+    """
+
+    def __init__(self, config_dir: str = "config"):
+        self.path = os.path.join(config_dir, ML_POLICY_FILE)
+        self._signature = self._stat()
+        # Raises PolicyConfigError, so a bad file stops the service
+        self._policy = Policy.from_config(load_ml_policy(self.path))
+
+    def current(self) -> Policy:
+        signature = self._stat()
+        if signature != self._signature:
+            self._signature = signature
+            try:
+                self._policy = Policy.from_config(load_ml_policy(self.path))
+                logger.info(f"policy reloaded: {self.path}")
+            except (OSError, PolicyConfigError) as e:
+                logger.error(f"policy reload rejected, keeping previous: {e}")
+        return self._policy
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_size, st.st_mtime_ns)
+
+
+class RequestWindow:
+    """
+    Requests admitted over the last minute, for max_requests_per_minute.
+    """
+
+    def __init__(self):
+        self._times = deque()
+
+    def admit(self, limit: int, now: Optional[float] = None) -> bool:
+        now = time.monotonic() if now is None else now
+        times = self._times
+        while times and times[0] <= now - 60.0:
+            times.popleft()
+        if limit and len(times) >= limit:
+            return False
+        times.append(now)
+        return True
@@ -5,17 +5,20 @@
 # Compiles and runs C++ projects inside a controlled process sandbox.
 # This service has NO authority to grant permissions or escape isolation.
 
-import subprocess
 import tempfile
 import os
 from pathlib import Path
 
+from orchestrator.job_scheduler import BUILD_ROLE, JobScheduler
+
 
 class CppRuntimeService:
-    def __init__(self, compiler: str = "g++"):
+    def __init__(self, jobs: JobScheduler, project: str, compiler: str = "g++"):
+        self.jobs = jobs
+        self.project = project
         self.compiler = compiler
 
-    def build(self, source_dir: Path, output_dir: Path) -> Path:
+    async def build(self, source_dir: Path, output_dir: Path) -> Path:
         output_dir.mkdir(parents=True, exist_ok=True)
         binary_path = output_dir / "app"
 
@@ -32,23 +35,17 @@ class CppRuntimeService:
             str(binary_path),
         ]
 
-        subprocess.run(
-            compile_cmd,
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
+        await self.jobs.run_command(self.project, BUILD_ROLE, compile_cmd, check=True)
 
         return binary_path
 
-    def run(self, binary_path: Path, args: list[str] | None = None):
+    async def run(self, binary_path: Path, args: list[str] | None = None) -> dict:
+        """
+        Run the program as a runtime job, its output streamed to
+        "job.stdout" / "job.stderr"; returns its returncode once it exits.
+        """
         args = args or []
 
-        process = subprocess.Popen(
-            [str(binary_path), *args],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+        return await self.jobs.run_program(
+            self.project, [str(binary_path), *args]
         )
-
-        return process
@@ -5,15 +5,18 @@
 # Builds and runs C# projects using the .NET SDK.
 # This service executes only within kernel-approved sandboxes.
 
-import subprocess
 from pathlib import Path
 
+from orchestrator.job_scheduler import BUILD_ROLE, JobScheduler
+
 
 class CSharpRuntimeService:
-    def __init__(self, dotnet_cmd: str = "dotnet"):
+    def __init__(self, jobs: JobScheduler, project: str, dotnet_cmd: str = "dotnet"):
+        self.jobs = jobs
+        self.project = project
         self.dotnet_cmd = dotnet_cmd
 
-    def build(self, project_dir: Path, output_dir: Path) -> Path:
+    async def build(self, project_dir: Path, output_dir: Path) -> Path:
         output_dir.mkdir(parents=True, exist_ok=True)
 
         build_cmd = [
@@ -26,12 +29,7 @@ class CSharpRuntimeService:
             str(output_dir),
         ]
 
-        subprocess.run(
-            build_cmd,
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
+        await self.jobs.run_command(self.project, BUILD_ROLE, build_cmd, check=True)
 
         # Convention: first dll in output dir is entry
         dlls = list(output_dir.glob("*.dll"))
@@ -40,14 +38,13 @@ class CSharpRuntimeService:
 
         return dlls[0]
 
-    def run(self, dll_path: Path, args: list[str] | None = None):
+    async def run(self, dll_path: Path, args: list[str] | None = None) -> dict:
+        """
+        Run the program as a runtime job, its output streamed to
+        "job.stdout" / "job.stderr"; returns its returncode once it exits.
+        """
         args = args or []
 
-        process = subprocess.Popen(
-            [self.dotnet_cmd, str(dll_path), *args],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+        return await self.jobs.run_program(
+            self.project, [self.dotnet_cmd, str(dll_path), *args]
         )
-
-        return process
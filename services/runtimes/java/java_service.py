@@ -2,39 +2,41 @@
 #
 # Java Runtime Service (User-Space)
 
-import subprocess
 from pathlib import Path
 
+from orchestrator.job_scheduler import BUILD_ROLE, JobScheduler
+
 
 class JavaRuntimeService:
-    def __init__(self, javac: str = "javac", java: str = "java"):
+    def __init__(self, jobs: JobScheduler, project: str, javac: str = "javac", java: str = "java"):
+        self.jobs = jobs
+        self.project = project
         self.javac = javac
         self.java = java
 
-    def build(self, source_dir: Path, output_dir: Path) -> Path:
+    async def build(self, source_dir: Path, output_dir: Path) -> Path:
         output_dir.mkdir(parents=True, exist_ok=True)
 
         sources = list(source_dir.glob("**/*.java"))
         if not sources:
             raise RuntimeError("No Java source files found")
 
-        subprocess.run(
+        await self.jobs.run_command(
+            self.project,
+            BUILD_ROLE,
             [self.javac, "-d", str(output_dir), *map(str, sources)],
             check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
         )
 
         return output_dir
 
-    def run(self, class_dir: Path, main_class: str, args: list[str] | None = None):
+    async def run(self, class_dir: Path, main_class: str, args: list[str] | None = None) -> dict:
+        """
+        Run the program as a runtime job, its output streamed to
+        "job.stdout" / "job.stderr"; returns its returncode once it exits.
+        """
         args = args or []
 
-        process = subprocess.Popen(
-            [self.java, "-cp", str(class_dir), main_class, *args],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+        return await self.jobs.run_program(
+            self.project, [self.java, "-cp", str(class_dir), main_class, *args]
         )
-
-        return process
@@ -2,25 +2,27 @@
 #
 # JavaScript Runtime Service (User-Space)
 
-import subprocess
 from pathlib import Path
 
+from orchestrator.job_scheduler import JobScheduler
+
 
 class JsRuntimeService:
-    def __init__(self, node_cmd: str = "node"):
+    def __init__(self, jobs: JobScheduler, project: str, node_cmd: str = "node"):
+        self.jobs = jobs
+        self.project = project
         self.node_cmd = node_cmd
 
-    def run(self, entry_file: Path, args: list[str] | None = None):
+    async def run(self, entry_file: Path, args: list[str] | None = None) -> dict:
+        """
+        Run the program as a runtime job, its output streamed to
+        "job.stdout" / "job.stderr"; returns its returncode once it exits.
+        """
         if not entry_file.exists():
             raise RuntimeError("Entry JS file does not exist")
 
         args = args or []
 
-        process = subprocess.Popen(
-            [self.node_cmd, str(entry_file), *args],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+        return await self.jobs.run_program(
+            self.project, [self.node_cmd, str(entry_file), *args]
         )
-
-        return process
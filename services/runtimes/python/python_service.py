@@ -2,25 +2,27 @@
 #
 # Python Runtime Service (User-Space)
 
-import subprocess
 from pathlib import Path
 
+from orchestrator.job_scheduler import JobScheduler
+
 
 class PythonRuntimeService:
-    def __init__(self, python_cmd: str = "python3"):
+    def __init__(self, jobs: JobScheduler, project: str, python_cmd: str = "python3"):
+        self.jobs = jobs
+        self.project = project
         self.python_cmd = python_cmd
 
-    def run(self, entry_file: Path, args: list[str] | None = None):
+    async def run(self, entry_file: Path, args: list[str] | None = None) -> dict:
+        """
+        Run the program as a runtime job, its output streamed to
+        "job.stdout" / "job.stderr"; returns its returncode once it exits.
+        """
         if not entry_file.exists():
             raise RuntimeError("Entry Python file does not exist")
 
         args = args or []
 
-        process = subprocess.Popen(
-            [self.python_cmd, str(entry_file), *args],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+        return await self.jobs.run_program(
+            self.project, [self.python_cmd, str(entry_file), *args]
         )
-
-        return process
@@ -2,25 +2,27 @@
 #
 # R Runtime Service (User-Space)
 
-import subprocess
 from pathlib import Path
 
+from orchestrator.job_scheduler import JobScheduler
+
 
 class RRuntimeService:
-    def __init__(self, rscript_cmd: str = "Rscript"):
+    def __init__(self, jobs: JobScheduler, project: str, rscript_cmd: str = "Rscript"):
+        self.jobs = jobs
+        self.project = project
         self.rscript_cmd = rscript_cmd
 
-    def run(self, script_file: Path, args: list[str] | None = None):
+    async def run(self, script_file: Path, args: list[str] | None = None) -> dict:
+        """
+        Run the program as a runtime job, its output streamed to
+        "job.stdout" / "job.stderr"; returns its returncode once it exits.
+        """
         if not script_file.exists():
             raise RuntimeError("R script does not exist")
 
         args = args or []
 
-        process = subprocess.Popen(
-            [self.rscript_cmd, str(script_file), *args],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+        return await self.jobs.run_program(
+            self.project, [self.rscript_cmd, str(script_file), *args]
         )
-
-        return process
@@ -2,21 +2,24 @@
 #
 # Rust Runtime Service (User-Space)
 
-import subprocess
 from pathlib import Path
 
+from orchestrator.job_scheduler import BUILD_ROLE, JobScheduler
+
 
 class RustRuntimeService:
-    def __init__(self, cargo_cmd: str = "cargo"):
+    def __init__(self, jobs: JobScheduler, project: str, cargo_cmd: str = "cargo"):
+        self.jobs = jobs
+        self.project = project
         self.cargo_cmd = cargo_cmd
 
-    def build(self, project_dir: Path) -> Path:
-        subprocess.run(
+    async def build(self, project_dir: Path) -> Path:
+        await self.jobs.run_command(
+            self.project,
+            BUILD_ROLE,
             [self.cargo_cmd, "build", "--release"],
-            cwd=project_dir,
+            cwd=str(project_dir),
             check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
         )
 
         target_dir = project_dir / "target" / "release"
@@ -27,14 +30,13 @@ class RustRuntimeService:
 
         return binaries[0]
 
-    def run(self, binary_path: Path, args: list[str] | None = None):
+    async def run(self, binary_path: Path, args: list[str] | None = None) -> dict:
+        """
+        Run the program as a runtime job, its output streamed to
+        "job.stdout" / "job.stderr"; returns its returncode once it exits.
+        """
         args = args or []
 
-        process = subprocess.Popen(
-            [str(binary_path), *args],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+        return await self.jobs.run_program(
+            self.project, [str(binary_path), *args]
         )
-
-        return process
@@ -8,22 +8,27 @@ No venv.
 """
 
 import os
-import subprocess
 import tempfile
 
+from orchestrator.job_scheduler import RUNTIME_ROLE, JobScheduler
+
 
 class SqlRuntimeService:
-    def __init__(self):
+    def __init__(self, jobs: JobScheduler, project: str):
+        self.jobs = jobs
+        self.project = project
         self.db_url = os.environ.get("SUPABASE_DB_URL")
         if not self.db_url:
             raise RuntimeError("SUPABASE_DB_URL not set")
 
-    def execute(self, sql: str) -> str:
+    async def execute(self, sql: str) -> str:
         with tempfile.NamedTemporaryFile(mode="w+", suffix=".sql") as f:
             f.write(sql)
             f.flush()
 
-            proc = subprocess.run(
+            proc = await self.jobs.run_command(
+                self.project,
+                RUNTIME_ROLE,
                 [
                     "psql",
                     self.db_url,
@@ -32,12 +37,9 @@ class SqlRuntimeService:
                     "-A",      # unaligned
                     "-F", ",", # CSV
                 ],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
             )
 
-        if proc.returncode != 0:
-            raise RuntimeError(proc.stderr)
+        if proc["returncode"] != 0:
+            raise RuntimeError(proc["stderr"])
 
-        return proc.stdout
+        return proc["stdout"]
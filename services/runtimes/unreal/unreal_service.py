@@ -6,19 +6,22 @@
 # This service assumes Unreal Engine is installed on the host.
 # It has NO authority to escape kernel-enforced sandboxing.
 
-import subprocess
 from pathlib import Path
 
+from orchestrator.job_scheduler import BUILD_ROLE, JobScheduler
+
 
 class UnrealRuntimeService:
-    def __init__(self, unreal_root: Path):
+    def __init__(self, jobs: JobScheduler, project: str, unreal_root: Path):
+        self.jobs = jobs
+        self.project = project
         self.unreal_root = unreal_root
         self.uat = unreal_root / "Engine" / "Build" / "BatchFiles" / "RunUAT.sh"
 
         if not self.uat.exists():
             raise RuntimeError("Unreal Automation Tool (UAT) not found")
 
-    def build(self, project_file: Path, output_dir: Path, platform: str = "Linux"):
+    async def build(self, project_file: Path, output_dir: Path, platform: str = "Linux"):
         output_dir.mkdir(parents=True, exist_ok=True)
 
         cmd = [
@@ -35,26 +38,20 @@ class UnrealRuntimeService:
             f"-platform={platform}",
         ]
 
-        subprocess.run(
-            cmd,
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
+        await self.jobs.run_command(self.project, BUILD_ROLE, cmd, check=True)
 
         return output_dir
 
-    def run(self, executable: Path, args: list[str] | None = None):
+    async def run(self, executable: Path, args: list[str] | None = None) -> dict:
+        """
+        Run the program as a runtime job, its output streamed to
+        "job.stdout" / "job.stderr"; returns its returncode once it exits.
+        """
         if not executable.exists():
             raise RuntimeError("Unreal executable not found")
 
         args = args or []
 
-        process = subprocess.Popen(
-            [str(executable), *args],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+        return await self.jobs.run_program(
+            self.project, [str(executable), *args]
         )
-
-        return process
@@ -0,0 +1,91 @@
+import sys
+import threading
+
+from orchestrator.capability_audit import AuditLogSink, CapabilityAudit
+from orchestrator.capability_enforcer import CapabilityEnforcer
+
+
+def audited_enforcer(audit):
+    enforcer = CapabilityEnforcer(audit=audit)
+    enforcer.register_policy("ui", {"IPC_SEND", "DISPLAY"})
+    return enforcer
+
+
+def test_filter_is_one_entry_expanded_on_read():
+    audit = CapabilityAudit()
+    enforcer = audited_enforcer(audit)
+
+    enforcer.filter("ui", {"IPC_SEND", "FS_WRITE"}, pid=7)
+
+    assert len(audit._ring) == 1
+    rows = audit.recent()
+    assert {(r["capability"], r["verdict"]) for r in rows} == {("IPC_SEND", True), ("FS_WRITE", False)}
+    assert len({r["ts"] for r in rows}) == 1 and {r["pid"] for r in rows} == {7}
+    assert audit.recent(verdict=False, limit=1)[0]["capability"] == "FS_WRITE"
+    assert audit.counters() == {"ui": {"allowed": 1, "denied": 1}}
+
+
+def test_collect_counts_each_decision_once_and_reports_overflow():
+    audit = CapabilityAudit(capacity=4)
+    enforcer = audited_enforcer(audit)
+
+    enforcer.allows("ui", "DISPLAY")
+    assert audit.collect() == 1
+    assert audit.collect() == 0
+
+    for _ in range(6):
+        enforcer.allows("ui", "FS_WRITE")
+    assert audit.collect() == 4
+    assert audit.dropped == 2
+    assert audit.counters() == {"ui": {"allowed": 1, "denied": 4}}
+
+
+def test_concurrent_decisions_are_each_collected_once():
+    # Switch threads as often as possible so appends interleave with each
+    # other and with collect().
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    audit = CapabilityAudit(capacity=1_000_000)
+    enforcer = audited_enforcer(audit)
+    stop = threading.Event()
+    collected = []
+
+    def decide():
+        for _ in range(20_000):
+            enforcer.allows("ui", "DISPLAY")
+
+    def collect():
+        while not stop.is_set():
+            collected.append(audit.collect())
+
+    try:
+        collector = threading.Thread(target=collect)
+        collector.start()
+        workers = [threading.Thread(target=decide) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        stop.set()
+        collector.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    collected.append(audit.collect())
+    assert sum(collected) == 80_000
+    assert audit.dropped == 0
+    assert audit.counters() == {"ui": {"allowed": 80_000, "denied": 0}}
+
+
+def test_sink_writes_collected_decisions(tmp_path):
+    sink = AuditLogSink(str(tmp_path / "audit.binlog"), flush_interval=3600)
+    audit = CapabilityAudit(sink=sink)
+    enforcer = audited_enforcer(audit)
+
+    enforcer.allows("ui", "IPC_SEND")
+    enforcer.filter("ui", {"DISPLAY", "FS_WRITE"})
+    audit.close()
+
+    assert sink.written == 3
+    persisted = list(audit.search(role="ui", verdict=False))
+    assert [r["capability"] for r in persisted] == ["FS_WRITE"]
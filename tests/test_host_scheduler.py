@@ -0,0 +1,98 @@
+import os
+import subprocess
+
+from orchestrator import host_scheduler
+from orchestrator.host_scheduler import HostScheduler
+from orchestrator.process_limits import ResourceLimits
+
+
+def fake_cgroupfs(tmp_path, controllers="cpu memory pids"):
+    base = tmp_path / "service.scope"
+    base.mkdir()
+    (base / "cgroup.controllers").write_text(controllers)
+    (base / "cgroup.subtree_control").write_text("")
+    # cgroupfs creates these in every new group; a plain directory does not
+    for child in (host_scheduler.CGROUP_DIR, host_scheduler.ORCHESTRATOR_DIR):
+        (base / child).mkdir()
+        (base / child / "cgroup.subtree_control").write_text("")
+    return base
+
+
+def record_writes(monkeypatch):
+    writes = []
+    original = host_scheduler._write
+
+    def write(path, value):
+        writes.append((path, value))
+        original(path, value)
+
+    monkeypatch.setattr(host_scheduler, "_write", write)
+    return writes
+
+
+def test_orchestrator_leaves_its_cgroup_before_enabling_controllers(tmp_path, monkeypatch):
+    base = fake_cgroupfs(tmp_path)
+    monkeypatch.setattr(host_scheduler, "_own_cgroup", lambda: str(base))
+    writes = record_writes(monkeypatch)
+
+    host = HostScheduler()
+
+    assert host.cgroups
+    assert host.limit_controllers == {"memory", "pids"}
+    paths = [path for path, _ in writes]
+    move = paths.index(str(base / "orchestrator" / "cgroup.procs"))
+    enable_parent = paths.index(str(base / "cgroup.subtree_control"))
+    enable_root = paths.index(str(base / "superos" / "cgroup.subtree_control"))
+    assert move < enable_parent < enable_root
+    assert writes[move][1] == str(os.getpid())
+    assert writes[enable_parent][1] == "+cpu +memory +pids"
+
+
+def test_explicit_root_outside_own_cgroup_does_not_move(tmp_path, monkeypatch):
+    base = fake_cgroupfs(tmp_path, controllers="cpu")
+    monkeypatch.setattr(host_scheduler, "_own_cgroup", lambda: None)
+    writes = record_writes(monkeypatch)
+
+    host = HostScheduler(cgroup_root=str(base / "superos"))
+
+    assert host.cgroups
+    assert host.limit_controllers == frozenset()
+    assert all(not path.endswith("orchestrator/cgroup.procs") for path, _ in writes)
+
+
+def test_no_controllers_falls_back(tmp_path, monkeypatch):
+    base = fake_cgroupfs(tmp_path, controllers="io")
+    monkeypatch.setattr(host_scheduler, "_own_cgroup", lambda: str(base))
+
+    assert not HostScheduler().cgroups
+
+
+def test_child_enters_limit_group_before_exec(tmp_path, monkeypatch):
+    base = fake_cgroupfs(tmp_path)
+    monkeypatch.setattr(host_scheduler, "_own_cgroup", lambda: str(base))
+    host = HostScheduler()
+
+    limits = ResourceLimits(memory_bytes=64 << 20, max_pids=8)
+    group, applied = host.limit_group("spawn-1", limits)
+
+    assert applied == {"memory", "pids"}
+    assert open(os.path.join(group, "memory.max")).read() == str(64 << 20)
+    assert open(os.path.join(group, "pids.max")).read() == "8"
+
+    # A plain file stands in for cgroup.procs: the child writes "0"
+    # (itself) between fork and exec, and exec'ing reads it back.
+    procs = os.path.join(group, "cgroup.procs")
+    open(procs, "w").close()
+    out = subprocess.run(
+        ["cat", procs], preexec_fn=host.preexec(group),
+        capture_output=True, text=True, check=True,
+    )
+    assert out.stdout == "0"
+
+
+def test_limit_group_without_controllers(tmp_path, monkeypatch):
+    base = fake_cgroupfs(tmp_path, controllers="cpu")
+    monkeypatch.setattr(host_scheduler, "_own_cgroup", lambda: str(base))
+    host = HostScheduler()
+
+    assert host.limit_group("spawn-1", ResourceLimits(max_pids=8)) == (None, frozenset())
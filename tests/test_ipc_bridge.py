@@ -0,0 +1,61 @@
+import threading
+
+import pytest
+
+from ui.ipc_bridge import IPCBridge
+
+
+@pytest.fixture
+def bridge():
+    bridge = IPCBridge()
+    yield bridge
+    bridge.close()
+
+
+def test_handler_can_block_on_a_nested_request():
+    # Topics take lanes round-robin: "outer" gets lane 0 and "inner" lane 1.
+    # The reply must resolve directly rather than queue behind the outer
+    # handler that is blocked waiting for it.
+    bridge = IPCBridge(workers=2)
+    done = threading.Event()
+    results = []
+
+    def inner(message):
+        bridge.reply(message, "inner")
+
+    def outer(message):
+        results.append(bridge.request("inner", {}, timeout=2.0).result())
+        done.set()
+
+    bridge.subscribe("inner", inner)
+    bridge.subscribe("outer", outer)
+    try:
+        bridge.send("outer", {})
+        assert done.wait(3.0)
+    finally:
+        bridge.close()
+    assert results == ["inner"]
+
+
+def test_request_times_out_while_the_event_thread_is_blocked(bridge):
+    release = threading.Event()
+    errors = []
+
+    def blocker(message):
+        release.wait(5.0)
+
+    bridge.subscribe("blocker", blocker)
+    bridge.send("blocker", {})
+
+    # Nothing answers "nobody"; the deadline has to fire from the timer
+    # while the handler thread is still parked in blocker().
+    future = bridge.request("nobody", {}, timeout=0.1)
+    try:
+        future.result(timeout=2.0)
+    except TimeoutError as e:
+        errors.append(e)
+    finally:
+        release.set()
+
+    assert len(errors) == 1
+    assert "timed out" in str(errors[0])
@@ -0,0 +1,228 @@
+import asyncio
+import json
+import zlib
+
+import pytest
+
+from orchestrator.ipc_bus import (
+    POLICY_BLOCK,
+    POLICY_COALESCE,
+    POLICY_DROP_NEWEST,
+    POLICY_DROP_OLDEST,
+    IPCBus,
+)
+from orchestrator.ipc_envelope import BODY_JSON, HEADER, VERSION, EnvelopeError, decode
+from orchestrator.ipc_metrics import HANDLER_SAMPLE_EVERY
+from orchestrator.ipc_rpc import IPCRequestError
+
+
+def run_bus(scenario, shards=1):
+    async def main():
+        bus = IPCBus(shards=shards)
+        runner = asyncio.create_task(bus.run())
+        await asyncio.sleep(0)
+        try:
+            return await scenario(bus)
+        finally:
+            bus.stop()
+            await runner
+
+    return asyncio.run(main())
+
+
+def test_request_reply():
+    async def scenario(bus):
+        async def echo(message):
+            await bus.reply(message, message["value"] * 2)
+
+        bus.subscribe("echo", echo)
+        return await bus.request("echo", {"value": 21}, timeout=1.0)
+
+    assert run_bus(scenario) == 42
+
+
+def test_nested_request_from_handler():
+    # Mailboxes take shards round-robin: "outer" and the reply channel
+    # share shard 0 and "inner" gets shard 1. The inner reply must not
+    # queue behind the outer handler that is waiting for it.
+    async def scenario(bus):
+        async def inner(message):
+            await bus.reply(message, "inner")
+
+        async def outer(message):
+            result = await bus.request("inner", {}, timeout=1.0)
+            await bus.reply(message, f"outer+{result}")
+
+        bus.subscribe("inner", inner)
+        bus.subscribe("outer", outer)
+        return await bus.request("outer", {}, timeout=2.0)
+
+    assert run_bus(scenario, shards=2) == "outer+inner"
+
+
+def test_request_to_own_shard_from_handler_is_rejected():
+    # With one shard every channel is delivered by the worker running the
+    # handler, so the inner request could never be answered.
+    async def scenario(bus):
+        async def inner(message):
+            await bus.reply(message, "inner")
+
+        async def outer(message):
+            try:
+                await bus.request("inner", {}, timeout=5.0)
+            except IPCRequestError as e:
+                await bus.reply(message, error=str(e))
+
+        bus.subscribe("inner", inner)
+        bus.subscribe("outer", outer)
+        return await bus.request("outer", {}, timeout=2.0)
+
+    with pytest.raises(IPCRequestError, match="own shard"):
+        run_bus(scenario, shards=1)
+
+
+def test_handler_latency_is_sampled():
+    async def scenario(bus):
+        seen = []
+        done = asyncio.Event()
+
+        async def on_tick(message):
+            seen.append(message)
+            if len(seen) == 2 * HANDLER_SAMPLE_EVERY + 1:
+                done.set()
+
+        bus.subscribe("tick", on_tick)
+        for i in range(2 * HANDLER_SAMPLE_EVERY + 1):
+            await bus.publish("tick", i)
+        await asyncio.wait_for(done.wait(), 1.0)
+        return bus.snapshot()["channels"]["tick"]
+
+    channel = run_bus(scenario)
+    assert channel["messages"] == 2 * HANDLER_SAMPLE_EVERY + 1
+    # The first call, then one in every HANDLER_SAMPLE_EVERY
+    assert channel["handler"]["count"] == 3
+
+
+def remote_frame(name, body, with_name):
+    # A frame from a process that interned a channel this one has not
+    payload = json.dumps(body).encode()
+    raw_name = name.encode() if with_name else b""
+    header = HEADER.pack(VERSION, BODY_JSON, len(raw_name), zlib.crc32(name.encode()), 1, 0.0, len(payload))
+    return header + raw_name + payload
+
+
+def test_publish_frame_routes_named_channels_and_rejects_unknown_ids():
+    async def scenario(bus):
+        received = asyncio.Queue()
+
+        async def on_remote(message):
+            await received.put(message)
+
+        bus.subscribe("remote.*", on_remote)
+
+        with pytest.raises(EnvelopeError):
+            await bus.publish_frame(remote_frame("remote.first", {"n": 0}, with_name=False))
+        assert "remote.first" not in bus.channel_stats()
+
+        await bus.publish_frame(remote_frame("remote.first", {"n": 1}, with_name=True))
+        # Later frames on the channel may leave the name out
+        await bus.publish_frame(remote_frame("remote.first", {"n": 2}, with_name=False))
+        return [await asyncio.wait_for(received.get(), 1.0) for _ in range(2)]
+
+    assert run_bus(scenario) == [{"n": 1}, {"n": 2}]
+
+
+def test_named_frame_must_match_its_id():
+    frame = bytearray(remote_frame("remote.mismatch", {}, with_name=True))
+    frame[28] ^= 0xFF
+    with pytest.raises(EnvelopeError):
+        decode(frame)
+
+
+def park_channel(bus, channel, received):
+    """
+    Subscribe a handler that records payloads and holds the worker on
+    "first" until the returned event is set.
+    """
+    gate = asyncio.Event()
+
+    async def handler(message):
+        received.append(message)
+        if message == "first":
+            await gate.wait()
+
+    bus.subscribe(channel, handler)
+    return gate
+
+
+async def settle():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+def test_blocked_publishers_are_admitted_in_order(tmp_path):
+    async def scenario(bus):
+        received = []
+        gate = park_channel(bus, "jobs", received)
+        bus.set_channel_limit("jobs", 2, POLICY_BLOCK)
+        journal = bus.set_channel_journal("jobs", str(tmp_path))
+
+        await bus.publish("jobs", "first")
+        await settle()
+        await bus.publish("jobs", "f1")
+        await bus.publish("jobs", "f2")
+
+        # Full: A waits. B is published from the f1 handler after the
+        # drain has made room but before A has run, and must not pass it.
+        async def publish_b(message):
+            if message == "f1":
+                await bus.publish("jobs", "B")
+
+        bus.subscribe("jobs", publish_b)
+        blocked = asyncio.create_task(bus.publish("jobs", "A"))
+        await settle()
+        assert not blocked.done()
+
+        gate.set()
+        await blocked
+        while len(received) < 5:
+            await asyncio.sleep(0.01)
+
+        journal.flush()
+        journaled = [env.body for env in journal.read(1, bus.last_seq("jobs"))]
+        return received, journaled
+
+    received, journaled = run_bus(scenario)
+    assert received == ["first", "f1", "f2", "A", "B"]
+    assert journaled == received
+
+
+@pytest.mark.parametrize(
+    "policy, expected, counter",
+    [
+        (POLICY_DROP_OLDEST, ["first", "b", "c"], "dropped"),
+        (POLICY_DROP_NEWEST, ["first", "a", "b"], "dropped"),
+        (POLICY_COALESCE, ["first", "a", "c"], "coalesced"),
+    ],
+)
+def test_overflow_policies(policy, expected, counter):
+    async def scenario(bus):
+        received = []
+        gate = park_channel(bus, "ticks", received)
+        bus.set_channel_limit("ticks", 2, policy)
+
+        await bus.publish("ticks", "first")
+        await settle()
+        for payload in ("a", "b", "c"):
+            await bus.publish("ticks", payload)
+        stats = bus.channel_stats()["ticks"]
+
+        gate.set()
+        while len(received) < len(expected):
+            await asyncio.sleep(0.01)
+        await settle()
+        return received, stats
+
+    received, stats = run_bus(scenario)
+    assert received == expected
+    assert stats[counter] == 1
@@ -0,0 +1,46 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from orchestrator.ipc_client import IPCClient
+
+CHANNEL = 7
+
+
+@pytest.fixture
+def client():
+    client = IPCClient(namespace=f"test{os.getpid()}")
+    client.create_channel(CHANNEL, capacity=1 << 16)
+    yield client
+    client.close()
+
+
+def test_oversized_message_is_skipped(client):
+    client.send(CHANNEL, b"x" * 100)
+    client.send(CHANNEL, b"next")
+
+    with pytest.raises(ValueError, match="EMSGSIZE"):
+        client.recv(CHANNEL, max_len=10)
+    assert client.recv(CHANNEL, max_len=10) == b"next"
+    assert client.recv(CHANNEL) == b""
+
+
+def test_attaching_process_does_not_unlink_the_region(client):
+    name = client._region_name(CHANNEL)
+    attach = (
+        "from orchestrator.shm_ring import ShmRing\n"
+        f"ring = ShmRing({name!r})\n"
+        "ring.send(b'hi')\n"
+        "ring.close()\n"
+    )
+    env = dict(os.environ, PYTHONPATH=os.getcwd())
+    subprocess.run([sys.executable, "-c", attach], env=env, check=True)
+
+    # A tracker left registered unlinks the region just after the
+    # attaching process exits
+    time.sleep(0.3)
+    assert os.path.exists(f"/dev/shm/{name}")
+    assert client.recv(CHANNEL) == b"hi"
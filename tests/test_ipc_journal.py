@@ -0,0 +1,119 @@
+import asyncio
+import os
+
+from orchestrator.ipc_bus import IPCBus
+from orchestrator.ipc_envelope import Envelope, channel_id, encode
+from orchestrator.ipc_journal import ChannelJournal
+
+CHANNEL = "journal.test"
+
+
+def envelope(seq, body=None):
+    return Envelope(channel_id(CHANNEL), seq, float(seq), {"n": seq} if body is None else body)
+
+
+def bodies(journal, from_seq=0):
+    return [env.body["n"] for env in journal.read(from_seq)]
+
+
+def segment_files(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".seg"))
+
+
+def test_torn_tail_is_cut_off_on_open(tmp_path):
+    journal = ChannelJournal(str(tmp_path))
+    for seq in range(1, 4):
+        journal.append(envelope(seq))
+    journal.close()
+
+    # A crash halfway through writing frame 4
+    path = os.path.join(tmp_path, segment_files(tmp_path)[-1])
+    intact = os.path.getsize(path)
+    with open(path, "ab") as f:
+        f.write(encode(envelope(4))[:-3])
+
+    journal = ChannelJournal(str(tmp_path))
+    assert journal.last_seq == 3
+    assert os.path.getsize(path) == intact
+    journal.append(envelope(4))
+    assert bodies(journal) == [1, 2, 3, 4]
+    journal.close()
+
+
+def test_segments_rotate_and_old_ones_are_retired(tmp_path):
+    frame = len(encode(envelope(10)))  # the largest frame written
+    journal = ChannelJournal(str(tmp_path), segment_bytes=2 * frame, retain_segments=2)
+    for seq in range(1, 11):
+        journal.append(envelope(seq))
+
+    assert len(segment_files(tmp_path)) == 2
+    assert journal.first_seq == 7
+    assert bodies(journal) == [7, 8, 9, 10]
+    assert bodies(journal, from_seq=9) == [9, 10]
+    journal.close()
+
+    # Reopening continues after the newest segment
+    journal = ChannelJournal(str(tmp_path), segment_bytes=2 * frame, retain_segments=2)
+    assert (journal.first_seq, journal.last_seq) == (7, 10)
+    journal.close()
+
+
+def run_bus(scenario):
+    async def main():
+        bus = IPCBus()
+        runner = asyncio.create_task(bus.run())
+        await asyncio.sleep(0)
+        try:
+            return await scenario(bus)
+        finally:
+            bus.stop()
+            await runner
+
+    return asyncio.run(main())
+
+
+def test_resume_replays_from_seq_across_restarts(tmp_path):
+    async def first_run(bus):
+        bus.set_channel_journal(CHANNEL, str(tmp_path))
+        for n in range(1, 6):
+            await bus.publish(CHANNEL, {"n": n})
+        return bus.last_seq(CHANNEL)
+
+    assert run_bus(first_run) == 5
+
+    async def second_run(bus):
+        bus.set_channel_journal(CHANNEL, str(tmp_path))
+        seen = []
+        live = asyncio.Event()
+
+        async def handler(message):
+            seen.append(message["n"])
+            if message["n"] == 6:
+                live.set()
+
+        replayed = await bus.resume(CHANNEL, handler, from_seq=3)
+        await bus.publish(CHANNEL, {"n": 6})
+        await asyncio.wait_for(live.wait(), 1.0)
+        return replayed, seen
+
+    assert run_bus(second_run) == (5, [3, 4, 5, 6])
+
+
+def test_unencodable_payload_is_delivered_but_not_journaled(tmp_path):
+    async def scenario(bus):
+        journal = bus.set_channel_journal(CHANNEL, str(tmp_path))
+        received = asyncio.Queue()
+
+        async def handler(message):
+            await received.put(message)
+
+        bus.subscribe(CHANNEL, handler)
+        await bus.publish(CHANNEL, {"n": 1})
+        await bus.publish(CHANNEL, {"not", "json"})
+        await bus.publish(CHANNEL, {"n": 3})
+        delivered = [await asyncio.wait_for(received.get(), 1.0) for _ in range(3)]
+        return delivered, [(env.seq, env.body) for env in journal.read()]
+
+    delivered, journaled = run_bus(scenario)
+    assert delivered == [{"n": 1}, {"not", "json"}, {"n": 3}]
+    assert journaled == [(1, {"n": 1}), (3, {"n": 3})]
@@ -0,0 +1,84 @@
+import asyncio
+import sys
+
+from orchestrator.ipc_bus import IPCBus
+from orchestrator.job_scheduler import BUILD_ROLE, JobScheduler
+from orchestrator.scheduler import SchedulerPolicyEngine
+
+# Prints a line, then waits for a line on stdin or for stdin to close
+PROGRAM = "print('ready', flush=True); import sys; sys.stdin.readline()"
+
+
+def run_jobs(scenario):
+    async def main():
+        bus = IPCBus()
+        runner = asyncio.create_task(bus.run())
+        await asyncio.sleep(0)
+        jobs = JobScheduler(SchedulerPolicyEngine(), max_jobs=1, ipc=bus)
+        try:
+            return await scenario(bus, jobs)
+        finally:
+            bus.stop()
+            await runner
+
+    return asyncio.run(main())
+
+
+def test_programs_stream_output_and_do_not_hold_build_slots():
+    async def scenario(bus, jobs):
+        lines = asyncio.Queue()
+
+        async def on_stdout(message):
+            await lines.put(message)
+
+        bus.subscribe("job.stdout", on_stdout)
+        program = asyncio.create_task(
+            jobs.run_program("game", [sys.executable, "-c", PROGRAM], name="game")
+        )
+
+        # Output arrives while the program is still running
+        line = await asyncio.wait_for(lines.get(), 5.0)
+        assert not program.done()
+
+        # The program is outside the global cap of one job
+        build = await asyncio.wait_for(
+            jobs.run_command("app", BUILD_ROLE, [sys.executable, "-c", "print('built')"]),
+            5.0,
+        )
+
+        program.cancel()
+        try:
+            await program
+        except asyncio.CancelledError:
+            pass
+        return line, build
+
+    line, build = run_jobs(scenario)
+    assert line["project"] == "game"
+    assert line["name"] == "game"
+    assert line["line"] == "ready"
+    assert build["returncode"] == 0
+    assert build["stdout"] == "built\n"
+
+
+def test_global_cap_still_queues_builds():
+    async def scenario(bus, jobs):
+        gate = asyncio.Event()
+        order = []
+
+        async def work(label):
+            order.append(label)
+            await gate.wait()
+
+        first = jobs.submit("a", BUILD_ROLE, lambda: work("first"))
+        second = jobs.submit("b", BUILD_ROLE, lambda: work("second"))
+        await asyncio.sleep(0.01)
+        queued = list(order)
+
+        gate.set()
+        await asyncio.gather(first, second)
+        return queued, order
+
+    queued, order = run_jobs(scenario)
+    assert queued == ["first"]
+    assert order == ["first", "second"]
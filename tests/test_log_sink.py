@@ -0,0 +1,46 @@
+import os
+
+from orchestrator.binlog import MAGIC, BinaryLogReader, BinaryLogSink
+from orchestrator.logger import LogRecord
+
+
+class Unencodable(LogRecord):
+    __slots__ = ()
+
+    @property
+    def meta(self):
+        raise RuntimeError("broken record")
+
+    @meta.setter
+    def meta(self, value):
+        pass
+
+
+def test_header_is_on_disk_before_any_record(tmp_path):
+    path = str(tmp_path / "system.binlog")
+    sink = BinaryLogSink(path, flush_interval=3600)
+    try:
+        with open(path, "rb") as f:
+            assert f.read() == MAGIC
+        BinaryLogReader(path).close()
+    finally:
+        sink.close()
+
+
+def test_writer_survives_oversized_and_unencodable_records(tmp_path):
+    path = str(tmp_path / "system.binlog")
+    sink = BinaryLogSink(path, flush_interval=3600)
+    sink.emit(LogRecord("é" * 40_000, "INFO", "long source"))
+    sink.emit(Unencodable("svc", "INFO", "dropped"))
+    sink.emit(LogRecord("svc", "INFO", "after"))
+    sink._drain()
+
+    sink.emit(LogRecord("svc", "WARN", "still writing"))
+    sink.close()
+
+    assert sink.dropped == 1
+    with BinaryLogReader(path) as reader:
+        records = list(reader.search())
+    assert [r["message"] for r in records] == ["long source", "after", "still writing"]
+    assert len(records[0]["source"].encode("utf-8")) <= 0xFFFF
+    assert os.path.getsize(path) > len(MAGIC)
@@ -0,0 +1,86 @@
+import sys
+import threading
+import time
+
+from orchestrator.log_limits import LogLimiter
+from orchestrator.logger import Logger
+
+THREADS = 8
+PER_THREAD = 5_000
+
+
+def test_concurrent_writers_keep_sequence_and_indexes():
+    log = Logger(capacity=THREADS * PER_THREAD)
+    start = threading.Barrier(THREADS)
+
+    def write(n):
+        start.wait()
+        for i in range(PER_THREAD):
+            log.info(f"writer-{n}", f"message {i}")
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+
+    records = log.dump()
+    assert [r["seq"] for r in records] == list(range(THREADS * PER_THREAD))
+    assert [r["ts"] for r in records] == sorted(r["ts"] for r in records)
+
+    for n in range(THREADS):
+        mine = log.query(source=f"writer-{n}", limit=None)
+        assert [r["message"] for r in mine] == [f"message {i}" for i in range(PER_THREAD)]
+    assert len(log.query(level="INFO", limit=None)) == THREADS * PER_THREAD
+
+
+def suppressed_total(log):
+    return sum(r["meta"]["suppressed"] for r in log.query(level="WARN", limit=None))
+
+
+def test_limited_writers_lose_no_counts():
+    limiter = LogLimiter(summary_interval=0.001)
+    limiter.limit_templates(every=3)
+    log = Logger(capacity=2 * THREADS * PER_THREAD, limiter=limiter)
+    start = threading.Barrier(THREADS)
+
+    def write(n):
+        start.wait()
+        for i in range(PER_THREAD):
+            log.info("storm", f"event {n}")
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        threads = [threading.Thread(target=write, args=(n,)) for n in range(THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    log.close()
+
+    kept = len(log.query(level="INFO", limit=None))
+    assert kept + suppressed_total(log) == THREADS * PER_THREAD
+
+
+def test_summary_is_written_when_the_source_goes_quiet():
+    limiter = LogLimiter(summary_interval=0.05)
+    limiter.limit_source("chatty", rate=1, burst=1)
+    log = Logger(limiter=limiter)
+    try:
+        for i in range(10):
+            log.info("chatty", f"tick {i}")
+
+        deadline = time.monotonic() + 2.0
+        while not log.query(level="WARN") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert suppressed_total(log) == 9
+    finally:
+        log.close()
@@ -0,0 +1,49 @@
+import os
+
+from orchestrator.capability_enforcer import CapabilityEnforcer
+from orchestrator.policy_config import PolicyWatcher
+from orchestrator.scheduler import SchedulerPolicyEngine
+from services.ml.policy import PolicyFile
+
+
+def write(path, text):
+    path.write_text(text)
+    # Make the stat signature change even within one mtime tick
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_scheduler_reload_reassigns_running_processes(tmp_path):
+    scheduler = SchedulerPolicyEngine()
+    watcher = PolicyWatcher(CapabilityEnforcer(), scheduler, config_dir=str(tmp_path))
+    write(tmp_path / "scheduler.yaml", "roles:\n  ui: {priority: 5, time_slice_ms: 20}\n")
+    watcher.load_all()
+
+    scheduler.assign_role_policy(1, "ui")
+    scheduler.assign_role_policy(2, "ui", foreground=True)
+    scheduler.assign_policy(3, priority=-5, time_slice_ms=5)
+    assert scheduler.get_policy(1).priority == 5
+
+    write(tmp_path / "scheduler.yaml", "roles:\n  ui: {priority: 10, time_slice_ms: 40}\n")
+    assert watcher.reload_changed() == ["scheduler.yaml"]
+
+    assert (scheduler.get_policy(1).priority, scheduler.get_policy(1).time_slice_ms) == (10, 40)
+    assert scheduler.get_policy(2).foreground is True
+    # Explicit policies are not role defaults
+    assert scheduler.get_policy(3).priority == -5
+
+
+def test_ml_policy_file_reloads_and_keeps_previous_on_error(tmp_path):
+    path = tmp_path / "ml_policy.yaml"
+    write(path, "allowed_actions: [analyze_logs]\nmax_context_bytes: 10\n")
+    policies = PolicyFile(str(tmp_path))
+
+    policy = policies.current()
+    assert policy.allow("analyze_logs") and not policy.allow("suggest_fix")
+    assert not policy.fits_context("x" * 11)
+
+    write(path, "allowed_actions: [analyze_logs, suggest_fix]\n")
+    assert policies.current().allow("suggest_fix")
+
+    write(path, "allowed_actions: [spawn]\n")
+    assert policies.current().allow("suggest_fix")
@@ -0,0 +1,85 @@
+import asyncio
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+from orchestrator.ipc_bus import IPCBus
+from orchestrator.process_manager import ProcessManager
+from orchestrator.process_stats import ResourceSampler
+
+FLAPPING = {
+    "auto_restart": True,
+    "restart": {"backoff_initial_s": 0.01, "jitter": 0, "max_restarts": 3, "cooldown_s": 60},
+}
+
+
+def test_restarts_do_not_accumulate_records(tmp_path, monkeypatch):
+    (tmp_path / "svc_exit.py").write_text("import sys\n\ndef main():\n    sys.exit(1)\n")
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join([str(tmp_path), os.getcwd()]))
+
+    async def main():
+        bus = IPCBus(shards=2)
+        runner = asyncio.create_task(bus.run())
+        tripped = asyncio.Event()
+
+        async def on_crash_loop(message):
+            tripped.set()
+
+        bus.subscribe("process.crash_loop", on_crash_loop)
+        pm = ProcessManager(bus)
+        try:
+            one_shots = [
+                await pm.spawn(f"once-{i}", "svc_exit", set(), {"warm": False})
+                for i in range(4)
+            ]
+            service_id = await pm.spawn("flapping", "svc_exit", set(), FLAPPING)
+            await asyncio.wait_for(tripped.wait(), 20)
+            for pid in one_shots:
+                await pm.wait(pid)
+            return pm.list_processes(), pm.supervision_stats()
+        finally:
+            await pm.shutdown()
+            bus.stop()
+            await runner
+
+    processes, stats = asyncio.run(main())
+
+    [service] = stats["services"]
+    assert service["restarts"] == 3
+    assert len(processes) == 5
+    assert [pid for pid, p in processes.items() if p["service_id"] is not None] == [service["pid"]]
+
+
+def test_sampler_closes_proc_handles_of_dropped_processes():
+    # After a restart the manager no longer knows the old pid, so the
+    # sampler must remember which host pid each history came from.
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    proc = SimpleNamespace(pid=1, os_pid=child.pid, project_id="svc", usage=None)
+
+    class Manager:
+        procs = [proc]
+
+        def running(self):
+            return self.procs
+
+        def get(self, pid):
+            return None
+
+    def open_fds():
+        return len(os.listdir("/proc/self/fd"))
+
+    manager = Manager()
+    sampler = ResourceSampler(manager, IPCBus())
+    try:
+        before = open_fds()
+        sampler.sample()
+        assert sampler.stats()["processes"] == 1
+
+        manager.procs = []
+        sampler.sample()
+        assert sampler.stats()["processes"] == 0
+        assert open_fds() == before
+    finally:
+        child.kill()
+        child.wait()
@@ -2,18 +2,26 @@
 
 import tkinter as tk
 from ui.gui import DesktopOS
+from ui.ipc_bridge import IPCBridge
 
 
-def main(ipc):
+def main(ipc=None):
     """
     SuperOS UI entrypoint.
-    Called by orchestrator with IPCBus injected.
+    Called by orchestrator with IPCBus injected, or started as its own
+    process (see orchestrator.process_manager) with a fresh IPCBridge.
     """
+    if ipc is None:
+        ipc = IPCBridge()
 
     root = tk.Tk()
     root.title("SuperOS")
     root.attributes("-fullscreen", True)
 
+    # Deliver ui=True bridge handlers on this main loop
+    if isinstance(ipc, IPCBridge):
+        ipc.attach_tk(root)
+
     DesktopOS(
         master=root,
         ipc=ipc,
@@ -5,31 +5,151 @@
 # UI-facing IPC client.
 # Sends requests and subscribes to events.
 # Does NOT execute or authorize actions.
+#
+# The event thread sleeps until a message arrives; there is no polling.
+# Handlers run inline on that thread, or on a small pool of per-topic
+# lanes (workers > 1) so one slow handler does not stall other topics
+# while each topic keeps its order. Handlers subscribed with ui=True are
+# marshalled onto the Tk main loop in batches once a root is attached with
+# attach_tk().
+#
+# Replies and request deadlines never go through the event thread: a
+# reply resolves its future as it is sent or delivered, and a separate
+# timer thread fails requests past their deadline. A handler may
+# therefore block on request(...).result().
 
+import heapq
+import itertools
 import queue
 import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 
+from orchestrator.ipc_envelope import (
+    Envelope,
+    EnvelopeError,
+    channel_id,
+    channel_name,
+    decode,
+    known_channel,
+)
+from orchestrator.ipc_rpc import (
+    CORRELATION_ID,
+    REPLY_CHANNEL,
+    IPCRequestError,
+    make_reply,
+    make_request,
+)
+from orchestrator.topic_trie import TopicTrie
+
+# Event-queue sentinel
+_STOP = object()
+
+
+class _UIHandler:
+    """
+    Marks a handler that must run on the Tk main thread.
+    Compares equal to the wrapped callable so unsubscribe() finds it.
+    """
+
+    __slots__ = ("fn",)
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def __eq__(self, other):
+        if isinstance(other, _UIHandler):
+            other = other.fn
+        return self.fn == other
+
+    def __hash__(self):
+        return hash(self.fn)
+
+
+class _Latency:
+    """
+    Send-to-handled latency for one delivery path.
+    """
+
+    __slots__ = ("count", "total", "max")
 
-class IPCBridge:
     def __init__(self):
-        self._subscriptions: dict[str, list] = {}
-        self._event_queue = queue.Queue()
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, sent: float) -> None:
+        elapsed = time.time() - sent
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+    def stats(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_ms": self.total / (self.count or 1) * 1000.0,
+            "max_ms": self.max * 1000.0,
+        }
+
+
+class IPCBridge:
+    def __init__(self, workers: int = 1, ui_batch: int = 256):
+        self._subscriptions = TopicTrie()
+        self._event_queue: queue.Queue = queue.Queue()
+        self._seq = itertools.count(1)
         self._running = True
 
+        # Per-topic handler lanes; empty means run inline on the event thread
+        self._lanes = [
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"ipc-bridge-{i}")
+            for i in range(workers)
+        ] if workers > 1 else []
+        self._lane_of: dict[str, ThreadPoolExecutor] = {}
+
+        # Tk marshalling
+        self._tk_root = None
+        self._ui_batch = ui_batch
+        self._ui_pending: deque = deque()
+        self._ui_scheduled = False
+        self._ui_lock = threading.Lock()
+
+        self._wakeups = 0
+        self._latency = {"handler": _Latency(), "ui": _Latency()}
+
+        # In-flight request() calls and their deadlines
+        self._pending: dict[str, Future] = {}
+        self._deadlines: list[tuple[float, str]] = []
+        self._pending_lock = threading.Lock()
+        # Signalled when the earliest deadline changes or on close()
+        self._deadline_changed = threading.Condition(self._pending_lock)
+
         self._thread = threading.Thread(
             target=self._event_loop,
             daemon=True,
         )
         self._thread.start()
+        self._timer = threading.Thread(
+            target=self._deadline_loop,
+            name="ipc-bridge-deadlines",
+            daemon=True,
+        )
+        self._timer.start()
 
     # -------------------------
     # Subscription API
     # -------------------------
 
-    def subscribe(self, topic: str, handler):
-        if topic not in self._subscriptions:
-            self._subscriptions[topic] = []
-        self._subscriptions[topic].append(handler)
+    def subscribe(self, topic: str, handler, ui: bool = False):
+        """
+        Subscribe to a topic or pattern ("process.*", "runtime.#").
+        ui=True runs the handler on the Tk main loop (see attach_tk).
+        """
+        self._subscriptions.add(topic, _UIHandler(handler) if ui else handler)
+
+    def unsubscribe(self, topic: str, handler) -> bool:
+        return self._subscriptions.remove(topic, handler)
 
     # -------------------------
     # Sending Requests
@@ -40,7 +160,98 @@ class IPCBridge:
         Send a request to user-space services or orchestrator.
         This is a stub; real transport is injected later.
         """
-        self._event_queue.put((topic, payload))
+        if topic == REPLY_CHANNEL:
+            # Never queued: the handler awaiting this reply may be the one
+            # occupying the thread that would deliver it.
+            self._resolve_reply(payload)
+            return
+        self._event_queue.put(
+            Envelope(channel_id(topic), next(self._seq), time.time(), payload)
+        )
+
+    def deliver_frame(self, frame):
+        """
+        Inject an encoded envelope received from a transport. Raises
+        EnvelopeError for a channel id that no frame has named yet.
+        """
+        env = decode(frame)
+        topic = known_channel(env.channel_id)
+        if topic is None:
+            raise EnvelopeError(f"unknown IPC channel id {env.channel_id}")
+        if topic == REPLY_CHANNEL:
+            self._resolve_reply(env.body)
+            return
+        self._event_queue.put(env)
+
+    def request(self, topic: str, payload: dict, timeout: float | None = 5.0) -> Future:
+        """
+        Send a request and return a Future for its reply.
+
+        Block with future.result(), or await asyncio.wrap_future(future)
+        from async code. The future fails with TimeoutError past the
+        deadline and IPCRequestError on an error reply; cancelling it
+        abandons the call.
+        """
+        correlation_id, message = make_request(payload, timeout)
+        future: Future = Future()
+
+        with self._pending_lock:
+            self._pending[correlation_id] = future
+            if timeout is not None:
+                heapq.heappush(
+                    self._deadlines, (time.monotonic() + timeout, correlation_id)
+                )
+                # The timer sleeps until the earliest deadline; re-arm it
+                if self._deadlines[0][1] == correlation_id:
+                    self._deadline_changed.notify()
+        future.add_done_callback(lambda _: self._forget(correlation_id))
+
+        self.send(topic, message)
+        return future
+
+    def reply(self, request: dict, result=None, error: str | None = None):
+        """
+        Answer a request received by a handler. No-op for plain messages.
+        """
+        routed = make_reply(request, result, error)
+        if routed is not None:
+            self.send(*routed)
+
+    def _resolve_reply(self, reply: dict):
+        with self._pending_lock:
+            future = self._pending.get(reply.get(CORRELATION_ID))
+        if future is None or not future.set_running_or_notify_cancel():
+            return
+
+        if "error" in reply:
+            future.set_exception(IPCRequestError(reply["error"]))
+        else:
+            future.set_result(reply.get("result"))
+
+    def _forget(self, correlation_id: str):
+        with self._pending_lock:
+            self._pending.pop(correlation_id, None)
+
+    def _expire_requests(self):
+        now = time.monotonic()
+        expired = []
+
+        with self._pending_lock:
+            while self._deadlines and self._deadlines[0][0] <= now:
+                _, correlation_id = heapq.heappop(self._deadlines)
+                future = self._pending.get(correlation_id)
+                if future is not None:
+                    expired.append(future)
+
+        for future in expired:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(TimeoutError("IPC request timed out"))
+
+    def _deadline_loop(self):
+        while self._running:
+            with self._deadline_changed:
+                self._deadline_changed.wait(self._next_deadline())
+            self._expire_requests()
 
     # -------------------------
     # Internal Event Loop
@@ -48,19 +259,98 @@ class IPCBridge:
 
     def _event_loop(self):
         while self._running:
-            try:
-                topic, payload = self._event_queue.get(timeout=0.1)
-            except queue.Empty:
-                continue
-
-            handlers = self._subscriptions.get(topic, [])
-            for handler in handlers:
-                try:
-                    handler(payload)
-                except Exception as e:
-                    err_handlers = self._subscriptions.get("errors", [])
-                    for err in err_handlers:
-                        err(str(e))
+            env = self._event_queue.get()
+            self._wakeups += 1
+            if env is _STOP:
+                break
+
+            topic = channel_name(env.channel_id)
+            for handler in self._subscriptions.match(topic):
+                if isinstance(handler, _UIHandler):
+                    if self._tk_root is not None:
+                        self._post_ui(topic, handler.fn, env)
+                        continue
+                    handler = handler.fn
+
+                if self._lanes:
+                    self._lane(topic).submit(self._run, topic, handler, env, "handler")
+                else:
+                    self._run(topic, handler, env, "handler")
+
+    def _lane(self, topic: str) -> ThreadPoolExecutor:
+        # Topics take lanes round-robin as they first appear, so the first
+        # len(lanes) topics never share one.
+        lane = self._lane_of.get(topic)
+        if lane is None:
+            lane = self._lanes[len(self._lane_of) % len(self._lanes)]
+            self._lane_of[topic] = lane
+        return lane
+
+    def _run(self, topic: str, handler, env: Envelope, path: str):
+        try:
+            handler(env.body)
+        except Exception as e:
+            for err in self._subscriptions.match("errors"):
+                if isinstance(err, _UIHandler):
+                    err = err.fn
+                err(str(e))
+        self._latency[path].record(env.timestamp)
+
+    def _next_deadline(self) -> float | None:
+        """
+        How long the timer may sleep: until the next request deadline, or
+        indefinitely. Called with _pending_lock held.
+        """
+        if not self._deadlines:
+            return None
+        return max(0.0, self._deadlines[0][0] - time.monotonic())
+
+    # -------------------------
+    # Tk Main Loop Marshalling
+    # -------------------------
+
+    def attach_tk(self, root):
+        """
+        Run ui=True handlers on root's main loop. Must be called from the
+        Tk thread; the bridge then schedules at most one drain at a time.
+        """
+        self._tk_root = root
+
+    def _post_ui(self, topic: str, handler, env: Envelope):
+        with self._ui_lock:
+            self._ui_pending.append((topic, handler, env))
+            if self._ui_scheduled:
+                return
+            self._ui_scheduled = True
+
+        # Tkinter forwards calls from other threads to the Tk thread
+        self._tk_root.after(0, self._drain_ui)
+
+    def _drain_ui(self):
+        with self._ui_lock:
+            count = min(len(self._ui_pending), self._ui_batch)
+            batch = [self._ui_pending.popleft() for _ in range(count)]
+
+        for topic, handler, env in batch:
+            self._run(topic, handler, env, "ui")
+
+        with self._ui_lock:
+            if not self._ui_pending:
+                self._ui_scheduled = False
+                return
+        self._tk_root.after(0, self._drain_ui)
+
+    # -------------------------
+    # Introspection
+    # -------------------------
+
+    def latency_stats(self) -> dict:
+        """
+        Send-to-handled latency per delivery path, and event-thread wakeups.
+        """
+        stats = {path: lat.stats() for path, lat in self._latency.items()}
+        stats["wakeups"] = self._wakeups
+        return stats
 
     # -------------------------
     # Shutdown
@@ -68,3 +358,8 @@ class IPCBridge:
 
     def close(self):
         self._running = False
+        self._event_queue.put(_STOP)
+        with self._deadline_changed:
+            self._deadline_changed.notify()
+        for lane in self._lanes:
+            lane.shutdown(wait=False)